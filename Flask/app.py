@@ -1,98 +1,86 @@
 from datetime import date
-import json
+import os
+import sys
 from flask import Flask, render_template,jsonify
-from functools import lru_cache
-import subprocess, requests, re, time
-
-
-@lru_cache()
-def fetch_fanduel(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="fanduel")
-
-@lru_cache()
-def fetch_draftkings(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="draftkings")
-
-@lru_cache()
-def fetch_betmgm(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="betmgm")
-
-@lru_cache()
-def fetch_nfl_fanduel(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="fanduel", sport="nfl")
-
-@lru_cache()
-def fetch_nfl_draftkings(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="draftkings", sport="nfl")
-
-@lru_cache()
-def fetch_nfl_betmgm(ttl_hash=None):
-    del ttl_hash
-    return fetch_game_data(sportsbook="betmgm", sport="nfl")
-
-def fetch_game_data(sportsbook="fanduel", sport="nba"):
-    if sport == "nfl":
-        cmd = ["python", "main.py", "-nfl", "-xgb", f"-odds={sportsbook}"]
-    else:
-        cmd = ["python", "main.py", "-xgb", f"-odds={sportsbook}"]
-    stdout = subprocess.check_output(cmd, cwd="../").decode()
-    data_re = re.compile(r'\n(?P<home_team>[\w ]+)(\((?P<home_confidence>[\d+\.]+)%\))? vs (?P<away_team>[\w ]+)(\((?P<away_confidence>[\d+\.]+)%\))?: (?P<ou_pick>OVER|UNDER) (?P<ou_value>[\d+\.]+) (\((?P<ou_confidence>[\d+\.]+)%\))?', re.MULTILINE)
-    ev_re = re.compile(r'(?P<team>[\w ]+) EV: (?P<ev>[-\d+\.]+)', re.MULTILINE)
-    odds_re = re.compile(r'(?P<away_team>[\w ]+) \((?P<away_team_odds>-?\d+)\) @ (?P<home_team>[\w ]+) \((?P<home_team_odds>-?\d+)\)', re.MULTILINE)
+import requests
+
+# The prediction pipeline resolves Models/ and Data/ from the project root, whatever the working directory
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(1, project_root)
+from src.Predict.Prediction_Engine import engine
+from src.Utils.Snapshot_Refresher import SnapshotRefresher
+
+
+sportsbooks = ['fanduel', 'draftkings', 'betmgm']
+
+
+def fetch_sportsbooks(sport="nba"):
+    return fetch_game_data(sportsbooks, sport=sport)
+
+
+def fetch_game_data(books, sport="nba"):
+    records_by_book = engine.predict_sportsbooks(books, sport=sport.upper())
+    return {sportsbook: _to_template_games(records) for sportsbook, records in records_by_book.items()}
+
+
+def _to_template_games(records):
     games = {}
-    for match in data_re.finditer(stdout):
-        game_dict = {'away_team': match.group('away_team').strip(),
-                     'home_team': match.group('home_team').strip(),
-                     'away_confidence': match.group('away_confidence'),
-                     'home_confidence': match.group('home_confidence'),
-                     'ou_pick': match.group('ou_pick'),
-                     'ou_value': match.group('ou_value'),
-                     'ou_confidence': match.group('ou_confidence')}
-        for ev_match in ev_re.finditer(stdout):
-            if ev_match.group('team') == game_dict['away_team']:
-                game_dict['away_team_ev'] = ev_match.group('ev')
-            if ev_match.group('team') == game_dict['home_team']:
-                game_dict['home_team_ev'] = ev_match.group('ev')
-        for odds_match in odds_re.finditer(stdout):
-            if odds_match.group('away_team') == game_dict['away_team']:
-                game_dict['away_team_odds'] = odds_match.group('away_team_odds')
-            if odds_match.group('home_team') == game_dict['home_team']:
-                game_dict['home_team_odds'] = odds_match.group('home_team_odds')
-
-        print(json.dumps(game_dict, sort_keys=True, indent=4))
+    for record in records:
+        home_won = record['winner'] == record['home_team']
+        game_dict = {'away_team': record['away_team'],
+                     'home_team': record['home_team'],
+                     'away_confidence': None if home_won else _percent(record['away_prob']),
+                     'home_confidence': _percent(record['home_prob']) if home_won else None,
+                     'ou_pick': record['ou_pick'],
+                     'ou_value': None if record['ou_line'] is None else str(record['ou_line']),
+                     'ou_confidence': _percent(record['ou_prob']),
+                     'away_team_ev': str(record['away_ev']),
+                     'home_team_ev': str(record['home_ev']),
+                     'away_team_odds': _odds_text(record['away_odds']),
+                     'home_team_odds': _odds_text(record['home_odds'])}
         games[f"{game_dict['away_team']}:{game_dict['home_team']}"] = game_dict
     return games
 
 
-def get_ttl_hash(seconds=600):
-    """Return the same value withing `seconds` time period"""
-    return round(time.time() / seconds)
+def _percent(probability):
+    return str(round(probability * 100, 1))
+
+
+def _odds_text(value):
+    if value is None:
+        return None
+    return str(int(value)) if float(value).is_integer() else str(value)
+
+
+# Predictions for every book are reloaded in the background ahead of their 10 minute expiry,
+# so a page always renders the last good slate without waiting on a reload. Both sports load concurrently;
+# a cold page waits at most 30 seconds for its sport, then renders without it.
+# The background thread starts with the first request, so importing this module (tests, the reloader's
+# watcher process, WSGI preloading) never starts scraping.
+refresher = SnapshotRefresher({sport: (lambda sport=sport: fetch_sportsbooks(sport)) for sport in ("nba", "nfl")},
+                              interval=600, timeout=30)
 
 
 app = Flask(__name__)
 app.jinja_env.add_extension('jinja2.ext.loopcontrols')
 
 
+@app.before_request
+def start_refresher():
+    refresher.start()
+
+
 @app.route("/")
 def index():
-    fanduel = fetch_fanduel(ttl_hash=get_ttl_hash())
-    draftkings = fetch_draftkings(ttl_hash=get_ttl_hash())
-    betmgm = fetch_betmgm(ttl_hash=get_ttl_hash())
+    data = refresher.get("nba", default={})
 
-    return render_template('index.html', today=date.today(), data={"fanduel": fanduel, "draftkings": draftkings, "betmgm": betmgm}, sport="nba")
+    return render_template('index.html', today=date.today(), data=data, sport="nba")
 
 @app.route("/nfl")
 def nfl_index():
-    nfl_fanduel = fetch_nfl_fanduel(ttl_hash=get_ttl_hash())
-    nfl_draftkings = fetch_nfl_draftkings(ttl_hash=get_ttl_hash())
-    nfl_betmgm = fetch_nfl_betmgm(ttl_hash=get_ttl_hash())
+    data = refresher.get("nfl", default={})
 
-    return render_template('index.html', today=date.today(), data={"fanduel": nfl_fanduel, "draftkings": nfl_draftkings, "betmgm": nfl_betmgm}, sport="nfl")
+    return render_template('index.html', today=date.today(), data=data, sport="nfl")
 
 
 
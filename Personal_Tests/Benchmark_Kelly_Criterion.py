@@ -0,0 +1,30 @@
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(1, os.path.join(sys.path[0], '..'))
+from src.Utils import Expected_Value
+from src.Utils import Kelly_Criterion as kc
+
+# Kelly + EV over a large batch of bets, vectorized against the scalar API (timed on a sample and extrapolated).
+# Run by hand: python Personal_Tests/Benchmark_Kelly_Criterion.py [rows]
+rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+rng = np.random.default_rng(0)
+odds = rng.choice(np.r_[np.arange(-1500, -100), np.arange(100, 1500)], rows)
+probs = rng.random(rows)
+
+started = time.perf_counter()
+kc.kelly_criterion_array(odds, probs)
+Expected_Value.expected_value_array(probs, odds)
+vectorized = time.perf_counter() - started
+
+sample = min(rows, 20_000)
+started = time.perf_counter()
+for american_odds, prob in zip(odds[:sample].tolist(), probs[:sample].tolist()):
+    kc.calculate_kelly_criterion(american_odds, prob)
+    Expected_Value.expected_value(prob, american_odds)
+scalar = (time.perf_counter() - started) * rows / sample
+
+print(f"{rows} rows of Kelly + EV: {vectorized:.3f}s vectorized, ~{scalar:.1f}s scalar ({scalar / vectorized:.0f}x)")
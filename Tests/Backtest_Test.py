@@ -0,0 +1,133 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Backtest, Calibration, Training_Data
+from src.Utils.Backtest import place_bets, run_backtest, simulate_bankroll
+
+
+class ConstantModel:
+    """Predicts the same home win probability for every game"""
+
+    def __init__(self, home_prob):
+        self.home_prob = home_prob
+
+    def inplace_predict(self, features):
+        return np.tile([1 - self.home_prob, self.home_prob], (len(features), 1)).astype(np.float32)
+
+
+class TestBacktest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        dates = ['2023-11-01', '2023-11-01', '2023-11-02', '2024-11-01']
+        games = pd.DataFrame({'TEAM_NAME': ['A', 'B', 'A', 'C'], 'TEAM_NAME.1': ['C', 'D', 'B', 'A'], 'Date': dates,
+                              'PTS': [110.0, 100.0, 105.0, 98.0], 'Home-Team-Win': [1, 0, 1, 1],
+                              'OU': [220.0] * 4, 'OU-Cover': [1, 0, 2, 1]})
+        con = sqlite3.connect(root / "dataset.sqlite")
+        games.to_sql("games", con)
+        con.close()
+        con = sqlite3.connect(root / "odds.sqlite")
+        for season, rows in [('2023-24', games.iloc[:3]), ('2024-25', games.iloc[3:])]:
+            pd.DataFrame({'Date': rows['Date'], 'Home': rows['TEAM_NAME'], 'Away': rows['TEAM_NAME.1'],
+                          'OU': 220.0, 'ML_Home': [100, -200, 150][:len(rows)], 'ML_Away': [-120, 170, -180][:len(rows)]}
+                         ).to_sql(f"odds_{season}_new", con)
+        con.close()
+        spec = {'database': 'dataset.sqlite', 'table': 'games', 'index_col': 'index', 'label': 'Home-Team-Win',
+                'num_class': 2, 'season_date': 'Date',
+                'drop': ['TEAM_NAME', 'TEAM_NAME.1', 'Date', 'Home-Team-Win', 'OU-Cover', 'OU']}
+        source = dict(Backtest.odds_sources['NBA'], database='odds.sqlite')
+        self.patches = [mock.patch.object(Training_Data, 'project_root', root),
+                        mock.patch.object(Backtest, 'project_root', root),
+                        mock.patch.dict(Training_Data.training_sets, {('NBA', 'ML'): spec}),
+                        mock.patch.dict(Backtest.odds_sources, {'NBA': source}),
+                        mock.patch.object(Backtest, 'load_model',
+                                          return_value=(ConstantModel(0.6), {'id': 'test', 'framework': 'xgboost',
+                                                                             'path': 'model.json', 'num_features': 1,
+                                                                             'attributes': {'holdout': ['2024-25']}})),
+                        mock.patch.object(Calibration, 'project_root', root),
+                        mock.patch.dict(Calibration._calibrators, clear=True)]
+        for patch in self.patches:
+            patch.start()
+        self.results_db = root / "backtests.sqlite"
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.directory.cleanup()
+
+    def test_missing_odds_database(self):
+        with mock.patch.dict(Backtest.odds_sources, {'NBA': dict(Backtest.odds_sources['NBA'], database='missing.sqlite')}):
+            with self.assertRaises(FileNotFoundError):
+                Backtest.load_odds('NBA')
+        self.assertFalse((Backtest.project_root / 'missing.sqlite').exists())
+
+    def test_place_bets_picks_best_ev_side(self):
+        frame = pd.DataFrame({'ML_Home': [100, -200, np.nan], 'ML_Away': [-120, 170, 200], 'Home-Team-Win': [1, 0, 1]})
+        bets = place_bets(frame, np.array([[0.4, 0.6]] * 3), 'ML')
+        # Home +100 at 60% is +20 EV, away +170 at 40% is +8 EV, the third game has no home line
+        self.assertEqual(bets['row'].tolist(), [0, 1, 2])
+        self.assertEqual(bets['side'].tolist(), ['home', 'away', 'away'])
+        np.testing.assert_allclose(bets['profit'], [1.0, 1.7, -1.0])
+
+    def test_simulate_bankroll(self):
+        stakes, after = simulate_bankroll([0, 0, 1], [10, 10, 50], [1.0, -1.0, 0.5], bankroll=100.0)
+        np.testing.assert_allclose(stakes, [10, 10, 50])
+        np.testing.assert_allclose(after, [100, 100, 125])
+        stakes, after = simulate_bankroll([0, 1], [10, 10], [-1.0, -1.0], bankroll=100.0, compound=False)
+        np.testing.assert_allclose(stakes, [10, 10])
+        np.testing.assert_allclose(after, [90, 80])
+        # A slate never stakes more than the bankroll
+        stakes, _ = simulate_bankroll([0, 0], [80, 80], [-1.0, -1.0], bankroll=100.0)
+        np.testing.assert_allclose(stakes, [50, 50])
+
+    def test_run_backtest(self):
+        results = run_backtest('NBA', 'ML', results_db=self.results_db, in_sample=True)
+        self.assertEqual(set(results['evaluated_on']), {'in-sample'})
+        flat = results[results['strategy'] == 'flat'].set_index('season')
+        self.assertEqual(flat.index.tolist(), ['2023-24', '2024-25', 'All'])
+        self.assertEqual(flat.loc['All', 'bets'], 4)
+        self.assertEqual(flat.loc['All', 'games'], 4)
+        # Home +100, away +170, home +150 and home +100 all win, at 1 unit each
+        self.assertAlmostEqual(flat.loc['All', 'profit'], 1 + 1.7 + 1.5 + 1)
+        self.assertEqual(set(results['strategy']), {'flat', 'kelly', 'fractional-kelly'})
+        con = sqlite3.connect(self.results_db)
+        self.assertEqual(con.execute("select count(*) from backtest_results").fetchone()[0], len(results.index))
+        con.close()
+
+        held_out = run_backtest('NBA', 'ML', seasons=['2024-25'], results_db=None)
+        self.assertEqual(set(held_out['season']), {'2024-25', 'All'})
+        self.assertEqual(set(held_out['evaluated_on']), {'holdout'})
+
+    def test_backtest_defaults_to_holdout_seasons(self):
+        results = run_backtest('NBA', 'ML', results_db=None)
+        self.assertEqual(set(results['season']), {'2024-25', 'All'})
+        self.assertEqual(set(results['evaluated_on']), {'holdout'})
+        # Seasons the model was trained on are only bet on request, and labelled in-sample
+        trained = run_backtest('NBA', 'ML', seasons=['2023-24'], results_db=None)
+        self.assertEqual(set(trained['evaluated_on']), {'in-sample'})
+
+        Backtest.load_model.return_value[1]['attributes'] = {}
+        with self.assertRaises(ValueError):
+            run_backtest('NBA', 'ML', results_db=None)
+        self.assertEqual(len(run_backtest('NBA', 'ML', results_db=None, in_sample=True).index), 3 * 3)
+
+    def test_results_store_gains_new_columns(self):
+        con = sqlite3.connect(self.results_db)
+        con.execute("create table backtest_results (run_id text, season text)")
+        con.close()
+        results = run_backtest('NBA', 'ML', results_db=self.results_db)
+        con = sqlite3.connect(self.results_db)
+        stored = pd.read_sql_query("select * from backtest_results", con)
+        con.close()
+        self.assertEqual(stored['evaluated_on'].tolist(), results['evaluated_on'].tolist())
+
+
+if __name__ == '__main__':
+    unittest.main()
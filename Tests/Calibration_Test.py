@@ -0,0 +1,59 @@
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from src.Utils import Calibration
+from src.Utils.Calibration import Calibrator, calibrate, calibration_path
+
+
+class TestCalibration(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(4)
+        # An overconfident model: its home probability is pushed away from the true one
+        true_prob = rng.uniform(0.2, 0.8, 20000)
+        raw = np.clip(0.5 + (true_prob - 0.5) * 1.6, 0.01, 0.99)
+        self.probabilities = np.column_stack([1 - raw, raw])
+        self.labels = (rng.random(20000) < true_prob).astype(int)
+        self.true_prob = true_prob
+
+    def test_methods_reduce_calibration_error(self):
+        raw_error = np.abs(self.probabilities[:, 1] - self.true_prob).mean()
+        for method in Calibration.methods:
+            calibrated = Calibrator.fit(self.probabilities, self.labels, method)(self.probabilities)
+            np.testing.assert_allclose(calibrated.sum(axis=1), 1, rtol=1e-5)
+            self.assertLess(np.abs(calibrated[:, 1] - self.true_prob).mean(), raw_error / 2, method)
+
+    def test_saved_next_to_model_and_loaded_once(self):
+        self.assertEqual(calibration_path("Models/XGBoost_Models/XGBoost_68.7%_ML-4.json"),
+                         "Models/XGBoost_Models/XGBoost_68.7%_ML-4.calibration.json")
+        self.assertEqual(calibration_path("Models/NN_Models/Trained-Model-ML-1699315388.285516"),
+                         "Models/NN_Models/Trained-Model-ML-1699315388.285516.calibration.json")
+        with tempfile.TemporaryDirectory() as directory, \
+                mock.patch.object(Calibration, 'project_root', Path(directory)), \
+                mock.patch.dict(Calibration._calibrators, clear=True):
+            self.assertIs(calibrate(self.probabilities, {'id': 'model-c', 'path': 'XGBoost_61.0%_UO.json'}),
+                          self.probabilities)
+
+            calibrator = Calibrator.fit(self.probabilities, self.labels, 'platt', model_id='model-a')
+            calibrator.save(Path(directory) / calibration_path('XGBoost_60.0%_ML.json'))
+            entry = {'id': 'model-b', 'path': 'XGBoost_60.0%_ML.json'}
+            # Fitted for the model previously saved at that path
+            self.assertIsNone(Calibration.load_calibrator(entry))
+
+            entry = {'id': 'model-a', 'path': 'XGBoost_60.0%_ML.json'}
+            np.testing.assert_allclose(calibrate(self.probabilities, entry), calibrator(self.probabilities), rtol=1e-6)
+            with mock.patch.object(Calibrator, 'load', side_effect=AssertionError("loaded twice")):
+                slate = self.probabilities[:15]
+                started = time.perf_counter()
+                for _ in range(100):
+                    calibrate(slate, entry)
+                self.assertLess((time.perf_counter() - started) / 100, 0.001)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+import sqlite3
+import unittest
+
+import pandas as pd
+
+from src.Utils.Dataset_Progress import append_since_high_water, get_high_water
+
+
+class TestDatasetProgress(unittest.TestCase):
+
+    def setUp(self):
+        self.con = sqlite3.connect(":memory:")
+        self.games = pd.DataFrame({'Date': ['2023-10-24', '2023-10-24', '2023-10-25', '2023-10-26'],
+                                   'PTS': [110.0, 98.0, 120.0, 101.0]})
+
+    def tearDown(self):
+        self.con.close()
+
+    def read(self):
+        return pd.read_sql_query("select * from games", self.con, index_col="index")
+
+    def test_appends_only_past_high_water(self):
+        self.assertEqual(append_since_high_water(self.con, "games", "2023-24", self.games[:2], 'Date',
+                                                 index_label="index"), 2)
+        self.assertEqual(get_high_water(self.con, "games", "2023-24"), '2023-10-24')
+        self.assertEqual(append_since_high_water(self.con, "games", "2023-24", self.games, 'Date',
+                                                 index_label="index"), 2)
+        self.assertEqual(append_since_high_water(self.con, "games", "2023-24", self.games, 'Date',
+                                                 index_label="index"), 0)
+        frame = self.read()
+        self.assertEqual(list(frame.index), [0, 1, 2, 3])
+        self.assertEqual(frame['Date'].tolist(), self.games['Date'].tolist())
+        self.assertEqual(get_high_water(self.con, "games", "2023-24"), '2023-10-26')
+
+    def test_rerun_after_interrupted_append_is_idempotent(self):
+        append_since_high_water(self.con, "games", "2023-24", self.games[:2], 'Date', index_label="index")
+        # Rows written by a run that died before advancing the mark
+        self.games[2:].set_axis([2, 3]).to_sql("games", self.con, if_exists="append", index_label="index")
+        append_since_high_water(self.con, "games", "2023-24", self.games, 'Date', index_label="index")
+        self.assertEqual(self.read()['Date'].tolist(), self.games['Date'].tolist())
+
+    def test_weeks_are_tracked_per_season(self):
+        weeks = pd.DataFrame({'Season': ['2023', '2023', '2024'], 'Week': [1, 2, 1], 'PTS': [20, 24, 17]})
+        append_since_high_water(self.con, "nfl", "2023", weeks[weeks['Season'] == '2023'], 'Week', season_column='Season')
+        append_since_high_water(self.con, "nfl", "2024", weeks[weeks['Season'] == '2024'], 'Week', season_column='Season')
+        self.assertEqual(get_high_water(self.con, "nfl", "2023"), 2)
+        self.assertEqual(get_high_water(self.con, "nfl", "2024"), 1)
+        week_two = pd.DataFrame({'Season': ['2024', '2024'], 'Week': [1, 2], 'PTS': [17, 30]})
+        self.assertEqual(append_since_high_water(self.con, "nfl", "2024", week_two, 'Week', season_column='Season'), 1)
+        self.assertEqual(len(pd.read_sql_query("select * from nfl", self.con).index), 4)
@@ -0,0 +1,92 @@
+import os
+import re
+import tempfile
+import unittest
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Schedule_Index
+from src.Utils.Days_Rest import season_dates, team_days_rest
+from src.Utils.Schedule_Index import load_schedule_index, schedule_days_rest
+
+
+def get_date(date_string):
+    year1, month, day = re.search(r'(\d+)-\d+-(\d\d)(\d\d)', date_string).groups()
+    year = year1 if int(month) > 8 else int(year1) + 1
+    return datetime.strptime(f"{year}-{month}-{day}", '%Y-%m-%d')
+
+
+def legacy_days_rest(data):
+    """The per-row loop Add_Days_Rest.py used before team_days_rest"""
+    teams_last_played = {}
+    home_rest, away_rest = [], []
+    for index, row in data.iterrows():
+        rested = []
+        for team in (row['Home'], row['Away']):
+            current_date = get_date(row['Date'])
+            if team not in teams_last_played:
+                rested.append(10)
+            else:
+                days = (current_date - teams_last_played[team]).days
+                rested.append(days if 0 < days < 9 else 9)
+            teams_last_played[team] = current_date
+        home_rest.append(rested[0])
+        away_rest.append(rested[1])
+    return home_rest, away_rest
+
+
+class TestDaysRest(unittest.TestCase):
+
+    def test_matches_legacy_loop(self):
+        rng = np.random.default_rng(3)
+        teams = [f"Team {i}" for i in range(10)]
+        rows = []
+        for date in pd.date_range('2022-10-18', '2023-04-09', freq='D'):
+            for _ in range(rng.integers(0, 4)):
+                home, away = rng.choice(10, size=2, replace=False)
+                rows.append([f"2022-23-{date.month:02d}{date.day:02d}", teams[home], teams[away]])
+        data = pd.DataFrame(rows, columns=['Date', 'Home', 'Away'])
+        expected_home, expected_away = legacy_days_rest(data)
+        home_rest, away_rest = team_days_rest(season_dates(data['Date']), data['Home'], data['Away'])
+        self.assertEqual(home_rest.tolist(), expected_home)
+        self.assertEqual(away_rest.tolist(), expected_away)
+
+    def test_uncapped_rest_for_nfl(self):
+        dates = ['2023-09-07', '2023-09-10', '2023-09-14', '2023-09-24']
+        home_rest, away_rest = team_days_rest(dates, ['KC', 'BUF', 'KC', 'DET'], ['DET', 'NYJ', 'BUF', 'NYJ'],
+                                              first_game=7, max_rest=None)
+        self.assertEqual(home_rest.tolist(), [7, 7, 7, 17])
+        self.assertEqual(away_rest.tolist(), [7, 7, 4, 14])
+
+    def test_live_rest_matches_training_rest(self):
+        rng = np.random.default_rng(5)
+        teams = [f"Team {i}" for i in range(10)]
+        rows = []
+        for date in pd.date_range('2024-10-22', '2025-01-31', freq='D'):
+            # A team plays at most once a day
+            playing = rng.permutation(10)[:2 * rng.integers(0, 4)]
+            for home, away in playing.reshape(-1, 2):
+                # Evening tip-offs, Eastern time, most of which are the next day in UTC
+                tip_off = date + pd.Timedelta(hours=int(rng.integers(19, 23)), minutes=30)
+                rows.append([date, tip_off, teams[home], teams[away]])
+        games = pd.DataFrame(rows, columns=['Date', 'Tip_Off', 'Home', 'Away'])
+        utc = games['Tip_Off'].dt.tz_localize('America/New_York').dt.tz_convert('UTC')
+
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, "nba-2024-UTC.csv")
+            pd.DataFrame({'Date': utc.dt.strftime('%d/%m/%Y %H:%M'), 'Home Team': games['Home'],
+                          'Away Team': games['Away']}).to_csv(csv_path, index=False)
+            Schedule_Index._indexes.clear()
+            try:
+                index = load_schedule_index(csv_path)
+            finally:
+                Schedule_Index._indexes.clear()
+
+        # Training rest (dataset dates, uncapped) against live rest on each game's morning
+        home_rest, away_rest = team_days_rest(games['Date'], games['Home'], games['Away'], first_game=7, max_rest=None)
+        for position, game in games.iterrows():
+            live_home, live_away = schedule_days_rest(index, [game['Home']], [game['Away']],
+                                                      pd.Timestamp(game['Date']).tz_localize('America/New_York'))
+            self.assertEqual((live_home[0], live_away[0]), (home_rest[position], away_rest[position]), game.to_dict())
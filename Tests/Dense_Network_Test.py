@@ -0,0 +1,69 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.Utils.Dense_Network import DenseNetwork, export_keras_model, load_network
+
+
+class Dense:
+    """The parts of a Keras Dense layer the exporter reads"""
+
+    def __init__(self, kernel, bias, activation):
+        self.name = 'dense'
+        self.weights = [kernel, bias]
+        self.activation = activation
+
+    def get_weights(self):
+        return self.weights
+
+
+class Flatten:
+    name = 'flatten'
+
+
+def relu6(x):
+    return x
+
+
+def softmax_v2(x):
+    return x
+
+
+class TestDenseNetwork(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(11)
+        self.hidden = rng.normal(size=(6, 4)), rng.normal(size=4)
+        self.output = rng.normal(size=(4, 3)), rng.normal(size=3)
+        self.model = type('Sequential', (), {'layers': [Flatten(), Dense(*self.hidden, relu6),
+                                                        Dense(*self.output, softmax_v2)]})()
+        self.x = rng.normal(size=(5, 6)) * 5
+
+    def expected(self):
+        hidden = np.clip(self.x @ self.hidden[0] + self.hidden[1], 0, 6)
+        logits = hidden @ self.output[0] + self.output[1]
+        return np.exp(logits) / np.exp(logits).sum(axis=1, keepdims=True)
+
+    def test_export_round_trip(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = str(Path(directory) / "Trained-Model-ML-1699315388.285516.npz")
+            network = export_keras_model(self.model, path)
+            self.assertEqual(network.num_features, 6)
+            loaded = load_network(path)
+            self.assertIsInstance(loaded, DenseNetwork)
+            self.assertEqual([activation for _, _, activation in loaded.layers], ['relu6', 'softmax'])
+            probabilities = loaded(self.x)
+        self.assertEqual(probabilities.dtype, np.float32)
+        np.testing.assert_allclose(probabilities, self.expected(), rtol=1e-4, atol=1e-6)
+        np.testing.assert_allclose(probabilities.sum(axis=1), 1, rtol=1e-5)
+
+    def test_unsupported_layers_raise(self):
+        self.model.layers.append(type('LSTM', (), {'name': 'lstm'})())
+        with self.assertRaises(ValueError):
+            DenseNetwork.from_keras(self.model)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,7 @@
 import unittest
+
+import numpy as np
+
 from src.Utils import Expected_Value
 
 
@@ -35,3 +38,9 @@ class TestExpectedValue(unittest.TestCase):
     def test_expected_value_8(self):
         result = Expected_Value.expected_value(.638, 275)
         self.assertEqual(result, 139.25)
+
+    def test_expected_value_array(self):
+        probs = np.array([.76, .3, .6, .8137, .5298])
+        odds = np.array([-200, -500, 250, -200, 1000])
+        np.testing.assert_array_equal(Expected_Value.expected_value_array(probs, odds), [14, -64, 110, 22.05, 482.78])
+        np.testing.assert_array_equal(Expected_Value.payout_array(odds), [50, 20, 250, 50, 1000])
@@ -0,0 +1,49 @@
+import importlib.util
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from pathlib import Path
+from unittest import mock
+
+app_path = Path(__file__).resolve().parents[1] / "Flask" / "app.py"
+
+
+def refresher_running():
+    return any(thread.name == "snapshot-refresher" for thread in threading.enumerate())
+
+
+class TestFlaskApp(unittest.TestCase):
+
+    def setUp(self):
+        # Imported from an unrelated working directory, as a WSGI server or test runner may
+        cwd = os.getcwd()
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        os.chdir(directory.name)
+        self.addCleanup(os.chdir, cwd)
+        spec = importlib.util.spec_from_file_location("dashboard_app", app_path)
+        self.dashboard = importlib.util.module_from_spec(spec)
+        # Registered like a regular import, which Flask finds the templates through
+        sys.modules[spec.name] = self.dashboard
+        self.addCleanup(sys.modules.pop, spec.name, None)
+        spec.loader.exec_module(self.dashboard)
+        self.addCleanup(self.dashboard.refresher.stop, 5)
+        self.cwd = directory.name
+
+    def test_import_has_no_side_effects(self):
+        self.assertEqual(os.getcwd(), self.cwd)
+        self.assertFalse(refresher_running())
+
+    def test_first_request_starts_refresher(self):
+        slate = {'fanduel': {}}
+        with mock.patch.dict(self.dashboard.refresher.loaders, {'nba': lambda: slate, 'nfl': lambda: slate}):
+            response = self.dashboard.app.test_client().get("/nfl")
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(refresher_running())
+            self.assertEqual(self.dashboard.refresher.get('nba'), slate)
+
+
+if __name__ == '__main__':
+    unittest.main()
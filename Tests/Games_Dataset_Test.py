@@ -0,0 +1,98 @@
+import sqlite3
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from src.Utils.Games_Dataset import build_season_games, finalize_games, season_team_index
+from src.Utils.Team_Data_Store import load_season, migrate_per_date_tables
+
+
+def legacy_create_games(teams_con, odds_by_season):
+    """The per-row builder Create_Games.py used before the vectorized join"""
+    scores, win_margin, OU, OU_Cover, games, days_rest_home, days_rest_away = [], [], [], [], [], [], []
+    for season, odds_df in odds_by_season.items():
+        team_index = season_team_index(season)
+        for row in odds_df.itertuples():
+            home_team = row[2]
+            away_team = row[3]
+            date = row[1]
+            team_df = pd.read_sql_query(f"select * from \"{date}\"", teams_con, index_col="index")
+            if len(team_df.index) == 30:
+                scores.append(row[8])
+                OU.append(row[4])
+                days_rest_home.append(row[10])
+                days_rest_away.append(row[11])
+                win_margin.append(1 if row[9] > 0 else 0)
+                if row[8] < row[4]:
+                    OU_Cover.append(0)
+                elif row[8] > row[4]:
+                    OU_Cover.append(1)
+                elif row[8] == row[4]:
+                    OU_Cover.append(2)
+                home_team_series = team_df.iloc[team_index.get(home_team)]
+                away_team_series = team_df.iloc[team_index.get(away_team)]
+                games.append(pd.concat([home_team_series, away_team_series.rename(
+                    index={col: f"{col}.1" for col in team_df.columns.values})]))
+    season = pd.concat(games, ignore_index=True, axis=1).T
+    frame = season.drop(columns=['TEAM_ID', 'TEAM_ID.1'])
+    frame['Score'] = np.asarray(scores)
+    frame['Home-Team-Win'] = np.asarray(win_margin)
+    frame['OU'] = np.asarray(OU)
+    frame['OU-Cover'] = np.asarray(OU_Cover)
+    frame['Days-Rest-Home'] = np.asarray(days_rest_home)
+    frame['Days-Rest-Away'] = np.asarray(days_rest_away)
+    for field in frame.columns.values:
+        if 'TEAM_' in field or 'Date' in field:
+            continue
+        frame[field] = frame[field].astype(float)
+    return frame
+
+
+class TestGamesDataset(unittest.TestCase):
+
+    def setUp(self):
+        rng = np.random.default_rng(7)
+        self.teams_con = sqlite3.connect(":memory:")
+        self.odds_by_season = {}
+        for season, dates in [('2012-13', ['2012-11-01', '2012-11-02', '2013-01-15']),
+                              ('2015-16', ['2015-11-03', '2016-02-10'])]:
+            names = list(season_team_index(season))
+            rows = []
+            for date in dates:
+                team_count = 29 if date == '2012-11-02' else 30
+                pd.DataFrame({
+                    'TEAM_ID': np.arange(team_count) + 1610612737,
+                    'TEAM_NAME': names[:team_count],
+                    'W_PCT': rng.random(team_count),
+                    'PTS': rng.normal(105, 5, team_count),
+                    'Date': date,
+                }).to_sql(date, self.teams_con)
+                for game in range(4):
+                    home, away = rng.choice(30, size=2, replace=False)
+                    points = float(rng.integers(180, 240))
+                    total = points if game == 0 else points + rng.choice([-7.5, 6.5])
+                    rows.append([date, names[home], names[away], total, -3.5, -150, 130, points,
+                                 float(rng.integers(-20, 20)), float(rng.integers(1, 10)), float(rng.integers(1, 10))])
+            self.odds_by_season[season] = pd.DataFrame(rows, columns=[
+                'Date', 'Home', 'Away', 'OU', 'Spread', 'ML_Home', 'ML_Away', 'Points', 'Win_Margin',
+                'Days_Rest_Home', 'Days_Rest_Away'])
+        migrate_per_date_tables(self.teams_con, show_progress=False)
+
+    def tearDown(self):
+        self.teams_con.close()
+
+    def test_matches_legacy_builder(self):
+        expected = legacy_create_games(self.teams_con, self.odds_by_season)
+        result = finalize_games(pd.concat(
+            [build_season_games(odds_df, load_season(self.teams_con, season), season)
+             for season, odds_df in self.odds_by_season.items()], ignore_index=True))
+        self.assertEqual(list(result.columns), list(expected.columns))
+        self.assertEqual(len(result.index), 16)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
+
+    def test_unknown_team_raises(self):
+        odds_df = self.odds_by_season['2015-16'].copy()
+        odds_df.loc[0, 'Home'] = 'Seattle SuperSonics'
+        with self.assertRaises(KeyError):
+            build_season_games(odds_df, load_season(self.teams_con, '2015-16'), '2015-16')
@@ -0,0 +1,60 @@
+import json
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+from src.Utils.Http_Cache import CachedFetcher, ttl_for
+
+
+class StatsHandler(BaseHTTPRequestHandler):
+    requests_seen = []
+    body = json.dumps({'resultSets': [{'rowSet': [[1, 'Boston Celtics']]}]}).encode()
+
+    def do_GET(self):
+        StatsHandler.requests_seen.append(dict(self.headers))
+        if self.headers.get('If-None-Match') == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header('ETag', '"v1"')
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(StatsHandler.body)))
+        self.end_headers()
+        self.wfile.write(StatsHandler.body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        StatsHandler.requests_seen = []
+        self.server = HTTPServer(('127.0.0.1', 0), StatsHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_port}/stats"
+        self.cache_dir = tempfile.TemporaryDirectory()
+        self.fetcher = CachedFetcher(cache_dir=self.cache_dir.name, retries=0)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.cache_dir.cleanup()
+
+    def test_fresh_entries_skip_the_network(self):
+        first = self.fetcher.get_json(self.url, ttl=60)
+        second = CachedFetcher(cache_dir=self.cache_dir.name).get_json(self.url, ttl=60)
+        self.assertEqual(first, second)
+        self.assertEqual(len(StatsHandler.requests_seen), 1)
+
+    def test_stale_entries_are_revalidated_with_etag(self):
+        self.fetcher.get_json(self.url, ttl=0)
+        self.assertEqual(self.fetcher.get_json(self.url, ttl=0)['resultSets'][0]['rowSet'][0][1], 'Boston Celtics')
+        self.assertEqual(len(StatsHandler.requests_seen), 2)
+        self.assertEqual(StatsHandler.requests_seen[1].get('If-None-Match'), '"v1"')
+
+    def test_endpoint_ttls(self):
+        self.assertEqual(ttl_for('https://stats.nba.com/stats/leaguedashteamstats?Season=2024-25'), 6 * 60 * 60)
+        self.assertEqual(ttl_for('https://example.com/other'), 0)
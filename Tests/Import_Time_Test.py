@@ -0,0 +1,48 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.Utils.Normalize import normalize
+
+project_root = Path(__file__).parent.parent
+
+# Runs main() as `main.py -xgb` with the network and the models stubbed out, then reports which
+# prediction runners and heavy modules were imported: sys.modules tells, whether or not TensorFlow is installed
+xgb_run = """
+import argparse, sys
+from unittest import mock
+import main
+main.args = argparse.Namespace(nfl=False, odds=None, nn=False, xgb=True, A=False, kc=False, format='text')
+with mock.patch.object(main, 'get_todays_games_json', return_value={'games': []}), \\
+        mock.patch.object(main, 'create_todays_games', return_value=[('Home', 'Away')]), \\
+        mock.patch.object(main, 'get_json_data', return_value={}), \\
+        mock.patch.object(main, 'to_data_frame', return_value=None), \\
+        mock.patch.object(main, 'createTodaysGames', return_value=(None, [], None, [], [])), \\
+        mock.patch.object(main, 'slate_games', return_value=[]), \\
+        mock.patch.object(main, 'run_model') as run_model:
+    main.main()
+assert run_model.call_count == 1
+print(' '.join(sorted(name for name in sys.modules
+                      if name.split('.')[0] in ('tensorflow', 'keras') or name.startswith('src.Predict.'))))
+"""
+
+
+class TestImportTime(unittest.TestCase):
+
+    def test_xgb_run_skips_nn_runners_and_tensorflow(self):
+        output = subprocess.run([sys.executable, '-c', xgb_run], cwd=project_root, capture_output=True,
+                                text=True, check=True).stdout.splitlines()
+        self.assertEqual(output[-1].split(), ['src.Predict.Slate', 'src.Predict.XGBoost_Runner'])
+
+    def test_normalize_matches_keras(self):
+        data = np.array([[3.0, 4.0], [0.0, 0.0], [1.0, -1.0]])
+        expected = np.array([[0.6, 0.8], [0.0, 0.0], [2 ** -0.5, -2 ** -0.5]])
+        np.testing.assert_allclose(normalize(data, axis=1), expected)
+        np.testing.assert_allclose(normalize(data, axis=0), data / np.linalg.norm(data, axis=0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,4 +1,8 @@
 import unittest
+
+import numpy as np
+
+from src.Utils import Expected_Value
 from src.Utils import Kelly_Criterion as kc
 
 
@@ -23,3 +27,22 @@ class TestKellyCriterion(unittest.TestCase):
     def test_calculate_kelly_criterion_5(self):
         result = kc.calculate_kelly_criterion(100, .99)
         self.assertEqual(result, 98)
+
+    def test_kelly_criterion_array(self):
+        odds = np.array([-110, -110, 400, -500, 100])
+        probs = np.array([.6, .4, .35, .85, .99])
+        np.testing.assert_array_equal(kc.kelly_criterion_array(odds, probs), [16.04, 0, 18.75, 10, 98])
+        np.testing.assert_array_equal(kc.kelly_criterion_array(odds, probs, fraction=0.5, cap=10),
+                                      [8.02, 0, 9.37, 5, 10])
+        self.assertEqual(kc.calculate_kelly_criterion(-110, .6, fraction=0.25), 4.01)
+
+    def test_array_matches_scalar(self):
+        rng = np.random.default_rng(0)
+        rows = 5_000
+        odds = rng.choice(np.r_[np.arange(-1500, -100), np.arange(100, 1500)], rows)
+        probs = rng.random(rows)
+        kelly = kc.kelly_criterion_array(odds, probs)
+        ev = Expected_Value.expected_value_array(probs, odds)
+        pairs = list(zip(odds.tolist(), probs.tolist()))
+        np.testing.assert_array_equal(kelly, [kc.calculate_kelly_criterion(o, p) for o, p in pairs])
+        np.testing.assert_array_equal(ev, [Expected_Value.expected_value(p, o) for o, p in pairs])
@@ -0,0 +1,71 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import xgboost as xgb
+
+from src.Utils import Model_Registry
+from src.Utils.Model_Registry import active_entry, check_features, load_model, read_manifest, register_model
+
+
+class TestModelRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        self.manifest = self.root / "manifest.json"
+        rng = np.random.default_rng(3)
+        features, labels = rng.random((40, 3)), rng.integers(0, 2, 40)
+        booster = xgb.train({'objective': 'multi:softprob', 'num_class': 2}, xgb.DMatrix(features, label=labels), 2)
+        self.model_path = self.root / "XGBoost_61.0%_ML.json"
+        booster.save_model(str(self.model_path))
+        self.patches = [mock.patch.object(Model_Registry, 'project_root', self.root),
+                        mock.patch.dict(Model_Registry._loaded, clear=True)]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.directory.cleanup()
+
+    def test_register_activates_latest(self):
+        first = register_model('xgboost', 'nba', 'ml', self.model_path, num_features=3, manifest=self.manifest)
+        second = register_model('xgboost', 'NBA', 'ML', self.model_path, features=['a', 'b', 'c'],
+                                metrics={'accuracy': 61.0}, manifest=self.manifest)
+        self.assertEqual(second['path'], "XGBoost_61.0%_ML.json")
+        self.assertEqual(second['num_features'], 3)
+        self.assertEqual(active_entry('xgboost', 'NBA', 'ML', self.manifest)['id'], second['id'])
+        models = read_manifest(self.manifest)['models']
+        self.assertEqual([model['active'] for model in models], [False, True])
+        self.assertEqual(models[0]['id'], first['id'])
+        self.assertEqual(json.loads(self.manifest.read_text()), {'models': models})
+
+    def test_missing_model_raises_lookup_error(self):
+        register_model('xgboost', 'NBA', 'ML', self.model_path, manifest=self.manifest)
+        with self.assertRaises(LookupError):
+            active_entry('xgboost', 'NBA', 'UO', self.manifest)
+        with self.assertRaises(LookupError):
+            load_model('keras', 'NBA', 'ML', self.manifest)
+
+    def test_load_model_once(self):
+        register_model('xgboost', 'NBA', 'ML', self.model_path, num_features=3, manifest=self.manifest)
+        booster, entry = load_model('xgboost', 'NBA', 'ML', self.manifest)
+        self.assertEqual(booster.num_features(), 3)
+        with mock.patch.object(Model_Registry, '_load', side_effect=AssertionError("loaded twice")):
+            self.assertIs(load_model('xgboost', 'NBA', 'ML', self.manifest)[0], booster)
+        check_features(entry, np.zeros((5, 3)))
+        with self.assertRaises(ValueError):
+            check_features(entry, np.zeros((5, 4)))
+
+    def test_feature_count_mismatch_raises(self):
+        register_model('xgboost', 'NBA', 'ML', self.model_path, num_features=4, manifest=self.manifest)
+        with self.assertRaises(ValueError):
+            load_model('xgboost', 'NBA', 'ML', self.manifest)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import importlib.util
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+from src.Utils.Dataset_Progress import get_high_water
+
+module_path = Path(__file__).resolve().parents[1] / "src" / "Process-Data" / "Create_NFL_Games.py"
+spec = importlib.util.spec_from_file_location("Create_NFL_Games", module_path)
+Create_NFL_Games = importlib.util.module_from_spec(spec)
+spec.loader.exec_module(Create_NFL_Games)
+
+table = "nfl_dataset_2023-2023"
+
+
+class TestNFLGamesDataset(unittest.TestCase):
+
+    def setUp(self):
+        # The builder resolves config and databases relative to src/Process-Data
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        root = Path(directory.name)
+        (root / "src" / "Process-Data").mkdir(parents=True)
+        (root / "Data").mkdir()
+        (root / "config.toml").write_text('[create-nfl-games.2023]\nstart_week = 1\nend_week = 3\n')
+        self.dataset = root / "Data" / "NFLDataset.sqlite"
+        cwd = os.getcwd()
+        os.chdir(root / "src" / "Process-Data")
+        self.addCleanup(os.chdir, cwd)
+        self.played = {1, 3}
+
+    def team_stats(self, season, week):
+        # Four teams, two games a week, for the weeks that have been played
+        return Create_NFL_Games.create_sample_nfl_data(season, week)[:4] if week in self.played else None
+
+    def build(self, incremental=False):
+        with mock.patch.object(Create_NFL_Games, 'aggregate_team_stats_from_games', self.team_stats), \
+                mock.patch('builtins.print'):
+            return Create_NFL_Games.create_nfl_games_dataset(incremental=incremental)
+
+    def read(self):
+        con = sqlite3.connect(self.dataset)
+        try:
+            return (pd.read_sql_query(f'select Week from "{table}"', con)['Week'].value_counts().sort_index().to_dict(),
+                    get_high_water(con, table, '2023'))
+        finally:
+            con.close()
+
+    def test_incremental_run_replaces_sample_weeks_of_a_rebuild(self):
+        self.build()
+        # Week 2 is sample data (16 games): the mark stops before it, even though week 3 is real
+        self.assertEqual(self.read(), ({1: 2, 2: 16, 3: 2}, 1))
+
+        self.played.add(2)
+        appended = self.build(incremental=True)
+        self.assertEqual(appended['Week'].tolist(), [2, 2, 3, 3])
+        self.assertEqual(self.read(), ({1: 2, 2: 2, 3: 2}, 3))
+
+    def test_rebuild_resets_marks(self):
+        self.played = {1, 2, 3}
+        self.build()
+        self.assertEqual(self.read()[1], 3)
+        self.played = set()
+        self.build()
+        self.assertEqual(self.read(), ({1: 16, 2: 16, 3: 16}, None))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+
+from src.Utils.Prediction_Cache import MemoryPredictionCache, SqlitePredictionCache
+
+
+class CountingModel:
+
+    def __init__(self):
+        self.rows_scored = 0
+
+    def __call__(self, rows):
+        self.rows_scored += len(rows)
+        home = 1 / (1 + np.exp(-np.asarray(rows, dtype=float).sum(axis=1) / 100))
+        return np.column_stack([1 - home, home]).astype(np.float32)
+
+
+class TestPredictionCache(unittest.TestCase):
+
+    def setUp(self):
+        # Two games: stats, days rest and (last column) the total line
+        self.slate = np.array([[110.5, 104.2, 2, 1, 221.5],
+                               [98.1, 112.7, 1, 3, 215.0]])
+
+    def check_cache(self, cache):
+        model = CountingModel()
+        first = cache.probabilities('model-a', self.slate, model)
+        self.assertEqual(model.rows_scored, 2)
+
+        # Same stats, rest and totals: pricing can be redone without inference
+        np.testing.assert_allclose(cache.probabilities('model-a', self.slate, model), first)
+        self.assertEqual(model.rows_scored, 2)
+
+        # A moved total rescored only that game
+        moved = self.slate.copy()
+        moved[1, -1] = 216.5
+        probabilities = cache.probabilities('model-a', moved, model)
+        self.assertEqual(model.rows_scored, 3)
+        np.testing.assert_allclose(probabilities[0], first[0])
+        np.testing.assert_allclose(probabilities, model(moved), rtol=1e-6)
+
+        # Another model version shares nothing
+        cache.probabilities('model-b', self.slate, model)
+        self.assertEqual(model.rows_scored, 3 + 2 + 2)
+
+    def test_memory_cache(self):
+        self.check_cache(MemoryPredictionCache())
+
+    def test_memory_cache_is_bounded(self):
+        cache = MemoryPredictionCache(max_entries=3)
+        model = CountingModel()
+        cache.probabilities('model-a', np.arange(10, dtype=float)[:, None], model)
+        self.assertEqual(len(cache._entries), 3)
+        cache.probabilities('model-a', np.array([[9.0]]), model)
+        self.assertEqual(model.rows_scored, 10)
+
+    def test_sqlite_cache_shared_between_runs(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'PredictionCache.sqlite'
+            self.check_cache(SqlitePredictionCache(path))
+            model = CountingModel()
+            SqlitePredictionCache(path).probabilities('model-a', self.slate, model)
+            self.assertEqual(model.rows_scored, 0)
+            # Expired rows are dropped when the store is opened
+            SqlitePredictionCache(path, max_age_days=-1).probabilities('model-a', self.slate, model)
+            self.assertEqual(model.rows_scored, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.Predict.Prediction_Engine import PredictionEngine
+from src.Predict.Slate import predict_books
+from src.Utils import tools
+from src.Utils.Dictionaries import team_index_current
+
+
+def team_stats():
+    """Stats table in team_index_current order, each team's PTS being its index"""
+    teams = sorted(team_index_current, key=team_index_current.get)
+    return pd.DataFrame({'TEAM_ID': range(len(teams)), 'TEAM_NAME': teams,
+                         'PTS': [float(team_index_current[team]) for team in teams]})
+
+
+def predict_ml(data):
+    # data columns: home PTS, away PTS, home rest, away rest; home wins when its PTS is higher
+    home = (data[:, 0] > data[:, 1]).astype(np.float32)
+    return np.column_stack([1 - home, home])
+
+
+def predict_ou(data):
+    over = (data[:, -1] > 45).astype(np.float32)
+    return np.column_stack([1 - over, over])
+
+
+class TestPredictionEngine(unittest.TestCase):
+
+    def setUp(self):
+        self.engine = PredictionEngine()
+        self.engine._predict_books['NBA'] = lambda data, frame_ml, games, book_lines: predict_books(
+            predict_ml, predict_ou, data, frame_ml, games, book_lines)
+        patcher = mock.patch.object(tools, 'load_schedule_index', side_effect=FileNotFoundError)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_lines_stay_with_their_games_when_one_is_dropped(self):
+        teams = sorted(team_index_current, key=team_index_current.get)
+        games = [[teams[5], teams[1]], ['Unknown Team', teams[2]], [teams[0], teams[9]]]
+
+        def odds(home_ml, totals):
+            return {f"{home}:{away}": {'under_over_odds': total, home: {'money_line_odds': ml},
+                                       away: {'money_line_odds': 110}}
+                    for (home, away), ml, total in zip(games, home_ml, totals)}
+
+        odds_by_book = {'fanduel': odds([-150, -120, 130], [44.5, 47.5, 48.5]),
+                        'draftkings': odds([-160, -125, 135], [43.5, 46.5, 49.5])}
+        records = self.engine.predict_books(games, odds_by_book, team_df=team_stats())
+
+        for book, book_records in records.items():
+            self.assertEqual([(record['home_team'], record['away_team']) for record in book_records],
+                             [(teams[5], teams[1]), (teams[0], teams[9])])
+            self.assertEqual([record['home_odds'] for record in book_records],
+                             [odds_by_book[book][f"{home}:{away}"][home]['money_line_odds']
+                              for home, away in (games[0], games[2])])
+            self.assertEqual([record['winner'] for record in book_records], [teams[5], teams[9]])
+            self.assertEqual([record['ou_pick'] for record in book_records], ['UNDER', 'OVER'])
+
+    def test_lines_must_cover_every_game(self):
+        teams = sorted(team_index_current, key=team_index_current.get)
+        data = np.array([[5.0, 1.0, 2, 2], [0.0, 9.0, 2, 2]])
+        frame_ml = pd.DataFrame(data)
+        with self.assertRaises(ValueError):
+            predict_books(predict_ml, predict_ou, data, frame_ml, [(teams[5], teams[1]), (teams[0], teams[9])],
+                          {'fanduel': ([44.5], [-150], [110])})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import sqlite3
+import threading
+import time
+import unittest
+from datetime import date, timedelta
+
+import pandas as pd
+
+from src.DataProviders.SbrOddsScraper import RateLimiter, SbrOddsScraper
+
+schedule = {
+    date(2023, 9, 7): [('Kansas City Chiefs', 'Detroit Lions', 20, 21)],
+    date(2023, 9, 10): [('Buffalo Bills', 'New York Jets', 16, 22), ('Dallas Cowboys', 'Unknown Team', 40, 0)],
+    date(2023, 9, 14): [('Kansas City Chiefs', 'Buffalo Bills', 17, 20)],
+    date(2023, 9, 17): [('Detroit Lions', 'New York Jets', 24, 10)],
+}
+
+
+class StubScoreboard:
+    """Local stand-in for sbrscrape.Scoreboard(date=..., sport=...)"""
+    calls = []
+    failing_days = set()
+    lock = threading.Lock()
+
+    def __init__(self, date, sport):
+        with StubScoreboard.lock:
+            StubScoreboard.calls.append(date)
+        if date in StubScoreboard.failing_days:
+            raise ConnectionError("stub outage")
+        self.games = []
+        for home, away, home_score, away_score in schedule.get(date, []):
+            game = {'home_team': home, 'away_team': away, 'home_score': home_score, 'away_score': away_score,
+                    'total': {'fanduel': 45.5}, 'away_spread': {'fanduel': 3.5},
+                    'home_ml': {'fanduel': -150}, 'away_ml': {'fanduel': 130}}
+            if home == 'Buffalo Bills' and away == 'New York Jets':
+                game['home_ml'] = {'draftkings': -200}
+            self.games.append(game)
+
+
+class TestSbrOddsScraper(unittest.TestCase):
+
+    def setUp(self):
+        StubScoreboard.calls = []
+        StubScoreboard.failing_days = set()
+        self.con = sqlite3.connect(":memory:")
+        self.days = [(date(2023, 9, 7) + timedelta(days=offset), '2023', offset // 7 + 1) for offset in range(14)]
+
+    def tearDown(self):
+        self.con.close()
+
+    def scraper(self):
+        return SbrOddsScraper(self.con, max_workers=4, requests_per_second=1000, host='stub', scoreboard=StubScoreboard)
+
+    def test_writes_season_with_days_rest(self):
+        self.assertEqual(self.scraper().scrape(self.days), [])
+        season = pd.read_sql_query("select * from \"2023\"", self.con, index_col="index")
+        self.assertEqual(season['Home'].tolist(), ['Kansas City Chiefs', 'Kansas City Chiefs', 'Detroit Lions'])
+        self.assertEqual(season['Days_Rest_Home'].tolist(), [7, 7, 10])
+        # The Jets' game without FanDuel moneylines is dropped but still counts as their previous game
+        self.assertEqual(season['Days_Rest_Away'].tolist(), [7, 4, 7])
+        self.assertEqual(season['Win_Margin'].tolist(), [-1, -3, 14])
+
+    def test_resumes_from_checkpoint(self):
+        StubScoreboard.failing_days = {date(2023, 9, 14)}
+        failures = self.scraper().scrape(self.days)
+        self.assertEqual([day for day, _ in failures], [date(2023, 9, 14)])
+        self.assertEqual(self.con.execute("select count(*) from sqlite_master where name = '2023'").fetchone()[0], 0)
+
+        StubScoreboard.calls = []
+        StubScoreboard.failing_days = set()
+        self.assertEqual(self.scraper().scrape(self.days), [])
+        self.assertEqual(StubScoreboard.calls, [date(2023, 9, 14)])
+        self.assertEqual(len(pd.read_sql_query("select * from \"2023\"", self.con).index), 3)
+
+    def test_days_not_yet_played_are_fetched_again(self):
+        # Mid-season: days from 14/09 on have not been played, empty or not
+        self.scraper().scrape(self.days, today=date(2023, 9, 14))
+        self.assertEqual(len(self.scraper().completed_days()), 7)
+
+        StubScoreboard.calls = []
+        self.scraper().scrape(self.days, today=date(2023, 9, 21))
+        self.assertEqual(sorted(StubScoreboard.calls), [day for day, _, _ in self.days[7:]])
+        self.assertEqual(len(self.scraper().completed_days()), 14)
+        self.assertEqual(len(pd.read_sql_query("select * from \"2023\"", self.con).index), 3)
+
+    def test_rate_limiter_spaces_calls(self):
+        limiter = RateLimiter(requests_per_second=50)
+        start = time.monotonic()
+        threads = [threading.Thread(target=limiter.wait) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertGreaterEqual(time.monotonic() - start, 0.09)
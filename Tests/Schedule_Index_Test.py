@@ -0,0 +1,59 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+import pandas as pd
+
+from src.Utils import Schedule_Index
+from src.Utils.Schedule_Index import load_schedule_index, schedule_days_rest
+
+schedule_csv = """Match Number,Round Number,Date,Location,Home Team,Away Team,Result
+1,1,10/01/2025 00:30,TD Garden,Boston Celtics,New York Knicks,
+2,1,12/01/2025 01:00,Ball Arena,Denver Nuggets,Boston Celtics,
+3,1,15/01/2025 00:00,TD Garden,Boston Celtics,Denver Nuggets,
+"""
+
+
+class TestScheduleIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.csv_path = os.path.join(self.directory.name, "nba-2024-UTC.csv")
+        with open(self.csv_path, "w") as csv_file:
+            csv_file.write(schedule_csv)
+        Schedule_Index._indexes.clear()
+
+    def tearDown(self):
+        Schedule_Index._indexes.clear()
+        self.directory.cleanup()
+
+    def test_days_rest_from_last_game_before_today(self):
+        index = load_schedule_index(self.csv_path)
+        # The 15/01 00:00 UTC game was played on the evening of 14/01 in the US: one day of rest
+        home_rest, away_rest = schedule_days_rest(index, ['Boston Celtics', 'Utah Jazz'],
+                                                  ['Denver Nuggets', 'New York Knicks'], datetime(2025, 1, 15, 19))
+        self.assertEqual(home_rest, [1, 7])
+        self.assertEqual(away_rest, [1, 6])
+
+    def test_timezone_aware_as_of_uses_us_date(self):
+        index = load_schedule_index(self.csv_path)
+        # 03:00 UTC on 15/01 is still 14/01 in the US, the day of the Celtics' game against Denver
+        home_rest, _ = schedule_days_rest(index, ['Boston Celtics'], ['Denver Nuggets'],
+                                          pd.Timestamp('2025-01-15 03:00', tz='UTC'))
+        self.assertEqual(home_rest, [3])
+
+    def test_disk_cache_is_keyed_by_mtime(self):
+        index = load_schedule_index(self.csv_path)
+        self.assertTrue(os.path.exists(Schedule_Index._cache_path(self.csv_path)))
+        Schedule_Index._indexes.clear()
+        cached = load_schedule_index(self.csv_path)
+        self.assertEqual(cached, index)
+
+        with open(self.csv_path, "a") as csv_file:
+            csv_file.write("4,1,16/01/2025 00:00,Delta Center,Utah Jazz,Boston Celtics,\n")
+        stat = os.stat(self.csv_path)
+        os.utime(self.csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        rebuilt = load_schedule_index(self.csv_path)
+        self.assertEqual(len(rebuilt['Boston Celtics']), 4)
+        self.assertIn('Utah Jazz', rebuilt)
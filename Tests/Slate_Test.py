@@ -0,0 +1,48 @@
+import io
+import json
+import unittest
+
+import numpy as np
+
+from src.Predict.Slate import build_slate, slate_records, write_records
+
+
+class TestSlate(unittest.TestCase):
+
+    def setUp(self):
+        games = [['Philadelphia 76ers', 'Boston Celtics'], ['Utah Jazz', 'Denver Nuggets']]
+        ml = np.array([[0.4, 0.6], [0.7, 0.3]], dtype=np.float32)
+        ou = np.array([[0.55, 0.45, 0.0], [0.2, 0.8, 0.0]], dtype=np.float32)
+        results = build_slate(games, ml, ou, [221.5, 230.0], [-150, None], [130, None])
+        self.records = slate_records(results, 'fanduel')
+
+    def test_records(self):
+        sixers, jazz = self.records
+        self.assertEqual(sixers['winner'], 'Philadelphia 76ers')
+        self.assertEqual(sixers['ou_pick'], 'UNDER')
+        self.assertEqual(sixers['home_ev'], round(0.6 * 100 / 150 * 100 - 0.4 * 100, 2))
+        self.assertEqual(jazz['winner'], 'Denver Nuggets')
+        self.assertIsNone(jazz['home_odds'])
+        self.assertEqual(jazz['home_ev'], 0)
+
+    def test_json_formats(self):
+        stream = io.StringIO()
+        write_records(self.records, 'json', stream)
+        self.assertEqual(json.loads(stream.getvalue()), self.records)
+
+        stream = io.StringIO()
+        write_records(self.records, 'ndjson', stream)
+        self.assertEqual([json.loads(line) for line in stream.getvalue().splitlines()], self.records)
+
+    def test_arrow_format(self):
+        try:
+            import pyarrow as pa
+        except ImportError:
+            self.skipTest("pyarrow is not installed")
+        stream = io.BytesIO()
+        write_records(self.records, 'arrow', stream)
+        self.assertEqual(pa.ipc.open_stream(stream.getvalue()).read_all().to_pylist(), self.records)
+
+
+if __name__ == '__main__':
+    unittest.main()
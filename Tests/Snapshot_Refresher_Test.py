@@ -0,0 +1,104 @@
+import threading
+import time
+import unittest
+from unittest import mock
+
+from src.Utils import Snapshot_Refresher
+from src.Utils.Snapshot_Refresher import SnapshotRefresher
+
+
+class Clock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestSnapshotRefresher(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = Clock()
+        patcher = mock.patch.object(Snapshot_Refresher.time, 'monotonic', self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.loads = 0
+
+    def load(self):
+        self.loads += 1
+        return {'slate': self.loads}
+
+    def test_serves_stale_snapshot_until_refreshed(self):
+        refresher = SnapshotRefresher({'nba': self.load}, interval=600, refresh_ahead=60)
+        self.assertEqual(refresher.get('nba'), {'slate': 1})
+
+        # Past expiry, readers still get the last snapshot without reloading
+        self.clock.now += 900
+        self.assertEqual(refresher.get('nba'), {'slate': 1})
+        self.assertEqual(self.loads, 1)
+
+        # The refresher reloads snapshots inside the refresh_ahead window only
+        self.clock.now -= 900 - 500
+        refresher.refresh('nba')
+        self.assertEqual(self.loads, 1)
+        self.clock.now += 60
+        refresher.refresh('nba')
+        self.assertEqual(refresher.get('nba'), {'slate': 2})
+
+    def test_failed_refresh_keeps_last_good_snapshot(self):
+        loader = mock.Mock(side_effect=[{'slate': 1}, RuntimeError('sportsbook down')])
+        refresher = SnapshotRefresher({'nba': loader}, interval=600, max_stale=3600)
+        refresher.get('nba')
+        self.clock.now += 600
+        self.assertTrue(refresher.refresh('nba'))
+        self.assertEqual(refresher.get('nba'), {'slate': 1})
+
+        # Too old to serve: dropped, and the next reader loads it again
+        self.clock.now += 3600
+        loader.side_effect = None
+        loader.return_value = {'slate': 3}
+        self.assertEqual(refresher.get('nba'), {'slate': 3})
+
+    def test_missing_snapshot_returns_default(self):
+        refresher = SnapshotRefresher({'nfl': mock.Mock(side_effect=RuntimeError('no games'))})
+        self.assertEqual(refresher.get('nfl', default={}), {})
+
+    def test_slow_source_does_not_block_others(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        def slow():
+            release.wait(5)
+            return 'late slate'
+
+        refresher = SnapshotRefresher({'nba': self.load, 'nfl': slow}, timeout=0.2)
+        started = time.perf_counter()
+        self.assertEqual(refresher.refresh_all(), ['nfl'])
+        self.assertLess(time.perf_counter() - started, 2)
+        self.assertEqual(refresher.get('nba'), {'slate': 1})
+
+        # A reader without a snapshot gets the default after the timeout, while the load carries on
+        self.assertEqual(refresher.get('nfl', default={}), {})
+        release.set()
+        refresher._submit('nfl').result(5)
+        self.assertEqual(refresher.get('nfl'), 'late slate')
+
+    def test_background_thread_loads_ahead_of_readers(self):
+        loaded = threading.Event()
+
+        def load():
+            loaded.set()
+            return 'slate'
+
+        refresher = SnapshotRefresher({'nba': load}).start()
+        self.addCleanup(refresher.stop, 5)
+        self.assertTrue(loaded.wait(5))
+        deadline = time.time() + 5
+        while refresher.age('nba') is None and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(refresher.get('nba'), 'slate')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import train_test_split
+
+from src.Utils import Training_Data
+from src.Utils.Training_Data import dataset_fingerprint, load_training_matrix
+from src.Utils.Training_Sweep import split_indices
+
+
+class TestTrainingData(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        root = Path(self.directory.name)
+        self.database = root / "dataset.sqlite"
+        rng = np.random.default_rng(5)
+        self.frame = pd.DataFrame({'TEAM_NAME': 'Boston Celtics', 'Date': ['2023-03-01'] * 20 + ['2023-11-01'] * 30,
+                                   'PTS': rng.normal(110, 5, 50),
+                                   'W_PCT': rng.random(50), 'OU': rng.normal(220, 5, 50),
+                                   'Home-Team-Win': rng.integers(0, 2, 50), 'OU-Cover': rng.integers(0, 3, 50)})
+        con = sqlite3.connect(self.database)
+        self.frame.to_sql("games", con)
+        con.close()
+        spec = {'database': 'dataset.sqlite', 'table': 'games', 'index_col': 'index', 'label': 'OU-Cover',
+                'num_class': 3, 'ou_feature': True, 'season_date': 'Date',
+                'drop': ['TEAM_NAME', 'Date', 'Home-Team-Win', 'OU-Cover', 'OU']}
+        self.patches = [mock.patch.object(Training_Data, 'project_root', root),
+                        mock.patch.dict(Training_Data.training_sets, {('TEST', 'UO'): spec})]
+        for patch in self.patches:
+            patch.start()
+        self.cache_dir = root / "cache"
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.directory.cleanup()
+
+    def test_cached_matrix_skips_sqlite(self):
+        features, labels, columns, seasons = load_training_matrix('TEST', 'UO', cache_dir=self.cache_dir)
+        self.assertEqual(columns, ['PTS', 'W_PCT', 'OU'])
+        self.assertEqual(seasons.tolist(), ['2022-23'] * 20 + ['2023-24'] * 30)
+        self.assertEqual(features.dtype, np.float32)
+        np.testing.assert_array_equal(labels, self.frame['OU-Cover'].to_numpy())
+        with mock.patch.object(Training_Data, 'load_training_frame', side_effect=AssertionError("read sqlite")):
+            cached, cached_labels, _, _ = load_training_matrix('TEST', 'UO', cache_dir=self.cache_dir, mmap_mode='r')
+        np.testing.assert_array_equal(cached, features)
+        np.testing.assert_array_equal(cached_labels, labels)
+
+    def test_changed_table_rebuilds(self):
+        load_training_matrix('TEST', 'UO', cache_dir=self.cache_dir)
+        con = sqlite3.connect(self.database)
+        self.frame.iloc[:5].to_sql("games", con, if_exists="append")
+        con.close()
+        features, _, _, _ = load_training_matrix('TEST', 'UO', cache_dir=self.cache_dir)
+        self.assertEqual(len(features), 55)
+
+    def test_fingerprint_follows_table_content(self):
+        fingerprint = dataset_fingerprint('TEST', 'UO')
+        con = sqlite3.connect(self.database)
+        self.frame.iloc[:3].to_sql("other", con)
+        con.commit()
+        con.close()
+        stat = self.database.stat()
+        os.utime(self.database, ns=(stat.st_atime_ns, stat.st_mtime_ns - 10 ** 12))
+        # Another table and an older mtime leave it unchanged
+        self.assertEqual(dataset_fingerprint('TEST', 'UO'), fingerprint)
+
+        for statement in ("update games set PTS = PTS + 1 where \"index\" = 7",
+                          "update games set Date = '2023-11-02' where \"index\" = 30",
+                          # Same length, first and last character: only the middle of the value changed
+                          "update games set Date = '2023-12-01' where \"index\" = 31",
+                          "update games set TEAM_NAME = 'Boston Cxltics' where \"index\" = 32"):
+            con = sqlite3.connect(self.database)
+            con.execute(statement)
+            con.commit()
+            con.close()
+            self.assertNotEqual(dataset_fingerprint('TEST', 'UO'), fingerprint, statement)
+            fingerprint = dataset_fingerprint('TEST', 'UO')
+
+    def test_split_indices_match_train_test_split(self):
+        data = np.arange(100) * 10
+        train, test = train_test_split(data, test_size=0.1, random_state=7)
+        train_index, test_index = split_indices(100, 0.1, 7)
+        np.testing.assert_array_equal(data[train_index], train)
+        np.testing.assert_array_equal(data[test_index], test)
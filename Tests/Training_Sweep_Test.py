@@ -0,0 +1,87 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Model_Registry, Training_Data, Training_Sweep
+from src.Utils.Training_Sweep import run_sweep, season_split_indices, split_cores, sweep_space, sweep_trials
+
+
+class TestTrainingSweep(unittest.TestCase):
+
+    def test_split_cores(self):
+        self.assertEqual(split_cores(300, cores=32), (8, 4))
+        self.assertEqual(split_cores(2, cores=32), (2, 4))
+        self.assertEqual(split_cores(300, cores=32, workers=16), (16, 2))
+        self.assertEqual(split_cores(300, cores=1), (1, 1))
+
+    def test_trials_cover_space_and_seeds(self):
+        trials = sweep_trials({'trials': 3, 'seed': 10, 'max_depth': [3, 6], 'eta': [0.01], 'rounds': [100, 750]})
+        self.assertEqual(len(trials), 12)
+        self.assertEqual([trial['trial'] for trial in trials], list(range(12)))
+        self.assertEqual({trial['seed'] for trial in trials}, {10, 11, 12})
+        self.assertEqual({(trial['max_depth'], trial['rounds']) for trial in trials},
+                         {(3, 100), (3, 750), (6, 100), (6, 750)})
+
+    def test_config_spaces(self):
+        for sport in ('NBA', 'NFL'):
+            for market in ('ML', 'UO'):
+                space = sweep_space(sport, market)
+                self.assertTrue(sweep_trials(space))
+                self.assertIn('model_tag', space)
+        with self.assertRaises(ValueError):
+            sweep_space('MLB', 'ML')
+
+    def test_season_split_is_chronological(self):
+        seasons = np.array(['2021-22', '2021-22', '2022-23', '2023-24', '2022-23', '2023-24'])
+        train, validation, validation_seasons = season_split_indices(seasons)
+        self.assertEqual(train.tolist(), [0, 1, 2, 4])
+        self.assertEqual(validation.tolist(), [3, 5])
+        self.assertEqual(validation_seasons, ['2023-24'])
+        train, validation, _ = season_split_indices(seasons, validation_seasons=2)
+        self.assertEqual(train.tolist(), [0, 1])
+        with self.assertRaises(ValueError):
+            season_split_indices(seasons, validation_seasons=3)
+
+    def test_contiguous_index_as_slice(self):
+        self.assertEqual(Training_Sweep._as_slice(np.array([3, 4, 5])), slice(3, 6))
+        np.testing.assert_array_equal(Training_Sweep._as_slice(np.array([0, 2, 3])), [0, 2, 3])
+
+    def test_registered_metrics_come_from_holdout_season(self):
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            rng = np.random.default_rng(2)
+            dates = np.repeat(['2021-01-10', '2022-01-10', '2023-01-10', '2024-01-10'], 60)
+            frame = pd.DataFrame({'Date': dates, 'PTS': rng.normal(110, 5, 240), 'W_PCT': rng.random(240),
+                                  'Home-Team-Win': rng.integers(0, 2, 240)})
+            con = sqlite3.connect(root / "dataset.sqlite")
+            frame.to_sql("games", con)
+            con.close()
+            spec = {'database': 'dataset.sqlite', 'table': 'games', 'index_col': 'index', 'label': 'Home-Team-Win',
+                    'num_class': 2, 'season_date': 'Date', 'drop': ['Date', 'Home-Team-Win']}
+            space = {'model_tag': 'ML-T', 'trials': 2, 'seed': 0, 'split': 'season', 'validation_seasons': 1,
+                     'holdout_seasons': 1, 'max_depth': [2], 'eta': [0.3], 'rounds': [20], 'early_stopping_rounds': 5}
+            manifest = root / "manifest.json"
+            with mock.patch.object(Training_Data, 'project_root', root), \
+                    mock.patch.object(Model_Registry, 'project_root', root), \
+                    mock.patch.dict(Training_Data.training_sets, {('TEST', 'ML'): spec}), \
+                    mock.patch.dict(Training_Sweep._worker, clear=True):
+                results = run_sweep('TEST', 'ML', space, workers=1, nthread=1, results_db=root / "sweeps.sqlite",
+                                    models_dir=root, manifest=manifest, cache_dir=root / "cache")
+                entry = Model_Registry.active_entry('xgboost', 'TEST', 'ML', manifest=manifest)
+
+            self.assertEqual({result['validation'] for result in results}, {'seasons 2022-23'})
+            self.assertEqual(entry['attributes']['holdout'], ['2023-24'])
+            self.assertEqual(entry['metrics']['evaluated_on'], 'holdout')
+            best = max(result['accuracy'] for result in results)
+            self.assertEqual(entry['metrics']['selection_accuracy'], best)
+            self.assertIn(entry['metrics']['accuracy'],
+                          [result['holdout_accuracy'] for result in results if result['accuracy'] == best])
+            con = sqlite3.connect(root / "sweeps.sqlite")
+            stored = con.execute("select holdout_accuracy from xgboost_sweep").fetchall()
+            con.close()
+            self.assertEqual(len(stored), 2)
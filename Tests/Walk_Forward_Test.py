@@ -0,0 +1,62 @@
+import sqlite3
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from src.Utils import Training_Data
+from src.Utils.Walk_Forward import run_walk_forward, walk_forward_folds
+
+
+class TestWalkForward(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.root = Path(self.directory.name)
+        rng = np.random.default_rng(9)
+        seasons = np.repeat(['2021', '2022', '2023', '2024'], 50)
+        strength = rng.normal(size=200)
+        frame = pd.DataFrame({'TEAM_NAME': 'A', 'Season': seasons, 'STRENGTH': strength,
+                              'NOISE': rng.normal(size=200), 'Home-Team-Win': (strength > 0).astype(int)})
+        con = sqlite3.connect(self.root / "dataset.sqlite")
+        frame.to_sql("games", con, index=False)
+        con.close()
+        spec = {'database': 'dataset.sqlite', 'table': 'games', 'index_col': None, 'label': 'Home-Team-Win',
+                'num_class': 2, 'season_column': 'Season', 'drop': ['TEAM_NAME', 'Season', 'Home-Team-Win']}
+        self.patches = [mock.patch.object(Training_Data, 'project_root', self.root),
+                        mock.patch.dict(Training_Data.training_sets, {('TEST', 'ML'): spec})]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.directory.cleanup()
+
+    def test_folds_train_on_earlier_seasons(self):
+        folds = walk_forward_folds(np.array(['2023', '2021', '2022', '2021']))
+        self.assertEqual(folds, [(['2021'], '2022'), (['2021', '2022'], '2023')])
+        self.assertEqual(walk_forward_folds(['2021', '2022', '2023'], min_train_seasons=2), [(['2021', '2022'], '2023')])
+
+    def test_run_walk_forward(self):
+        space = {'max_depth': [2], 'eta': [0.3], 'rounds': [20]}
+        results_db = self.root / "walk_forward.sqlite"
+        folds = run_walk_forward('TEST', 'ML', space, min_train_seasons=2, workers=1, nthread=1,
+                                 results_db=results_db, cache_dir=self.root / "cache")
+        self.assertEqual(folds['test_season'].tolist(), ['2023', '2024'])
+        self.assertEqual(folds['train_rows'].tolist(), [100, 150])
+        self.assertTrue((folds['accuracy'] > 80).all())
+
+        con = sqlite3.connect(results_db)
+        predictions = pd.read_sql_query("select * from walk_forward_predictions", con)
+        con.close()
+        self.assertEqual(len(predictions.index), 100)
+        self.assertEqual(predictions['row'].tolist(), list(range(100, 200)))
+        np.testing.assert_allclose(predictions[['prob_0', 'prob_1']].sum(axis=1), 1, rtol=1e-5)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,185 +1,35 @@
 import argparse
-from datetime import datetime, timedelta
+import sys
+from contextlib import redirect_stdout
 
-import pandas as pd
-import tensorflow as tf
 from colorama import Fore, Style
 
 from src.DataProviders.SbrOddsProvider import SbrOddsProvider
-from src.Predict import NN_Runner, XGBoost_Runner
-from src.Predict.NFL_NN_Runner import nfl_nn_runner
-from src.Predict.NFL_XGBoost_Runner import nfl_xgb_runner
-from src.Utils.Dictionaries import team_index_current, nfl_team_index_current
-from src.Utils.tools import create_todays_games_from_odds, get_json_data, to_data_frame, get_todays_games_json, create_todays_games
-from src.Utils.nfl_tools import get_nfl_json_data, to_nfl_data_frame, get_nfl_current_week
+from src.Predict.Slate import output_formats, slate_records, write_records
+from src.Utils.Normalize import normalize
+from src.Utils.Prediction_Cache import SqlitePredictionCache, set_prediction_cache
+from src.Utils.tools import create_todays_games_from_odds, get_json_data, to_data_frame, get_todays_games_json, create_todays_games, \
+    createTodaysGames, createTodaysNFLGames, todays_games_url, data_url, nfl_slate_games, slate_games
 
-def get_current_nba_season():
-    """Get current NBA season in format YYYY for API URLs and YYYY-YY for stats API"""
-    now = datetime.now()
-    if now.month >= 10:
-        current_year = now.year
-        next_year = now.year + 1
-    else:
-        current_year = now.year - 1
-        next_year = now.year
-    return str(current_year), f"{current_year}-{str(next_year)[2:]}"
-
-season_year, season_range = get_current_nba_season()
-
-todays_games_url = f'https://data.nba.com/data/10s/v2015/json/mobile_teams/nba/{season_year}/scores/00_todays_scores.json'
-data_url = f'https://stats.nba.com/stats/leaguedashteamstats?' \
-           f'Conference=&DateFrom=&DateTo=&Division=&GameScope=&' \
-           f'GameSegment=&LastNGames=0&LeagueID=00&Location=&' \
-           f'MeasureType=Base&Month=0&OpponentTeamID=0&Outcome=&' \
-           f'PORound=0&PaceAdjust=N&PerMode=PerGame&Period=0&' \
-           f'PlayerExperience=&PlayerPosition=&PlusMinus=N&Rank=N&' \
-           f'Season={season_range}&SeasonSegment=&SeasonType=Regular+Season&ShotClockRange=&' \
-           f'StarterBench=&TeamID=0&TwoWay=0&VsConference=&VsDivision='
-
-# nfl_data_url = 'https://api.sportsdata.io/v3/nfl/stats/json/TeamSeasonStats/2024'  # Deprecated
-
-
-def createTodaysGames(games, df, odds):
-    match_data = []
-    todays_games_uo = []
-    home_team_odds = []
-    away_team_odds = []
-
-    home_team_days_rest = []
-    away_team_days_rest = []
-
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        if home_team not in team_index_current or away_team not in team_index_current:
-            continue
-        if odds is not None:
-            game_odds = odds[home_team + ':' + away_team]
-            todays_games_uo.append(game_odds['under_over_odds'])
-
-            home_team_odds.append(game_odds[home_team]['money_line_odds'])
-            away_team_odds.append(game_odds[away_team]['money_line_odds'])
-
-        else:
-            todays_games_uo.append(input(home_team + ' vs ' + away_team + ': '))
-
-            home_team_odds.append(input(home_team + ' odds: '))
-            away_team_odds.append(input(away_team + ' odds: '))
-
-        # calculate days rest for both teams
-        try:
-            schedule_df = pd.read_csv(f'Data/nba-{season_year}-UTC.csv', parse_dates=['Date'], date_format='%d/%m/%Y %H:%M')
-        except FileNotFoundError:
-            print(f"Warning: Schedule file Data/nba-{season_year}-UTC.csv not found. Using default rest days.")
-            home_days_off = timedelta(days=2)
-            away_days_off = timedelta(days=2)
-            home_team_days_rest.append(home_days_off.days)
-            away_team_days_rest.append(away_days_off.days)
-            home_team_series = df.iloc[team_index_current.get(home_team)]
-            away_team_series = df.iloc[team_index_current.get(away_team)]
-            stats = pd.concat([home_team_series, away_team_series])
-            stats['Days-Rest-Home'] = home_days_off.days
-            stats['Days-Rest-Away'] = away_days_off.days
-            match_data.append(stats)
-            continue
-        home_games = schedule_df[(schedule_df['Home Team'] == home_team) | (schedule_df['Away Team'] == home_team)]
-        away_games = schedule_df[(schedule_df['Home Team'] == away_team) | (schedule_df['Away Team'] == away_team)]
-        previous_home_games = home_games.loc[schedule_df['Date'] <= datetime.today()].sort_values('Date',ascending=False).head(1)['Date']
-        previous_away_games = away_games.loc[schedule_df['Date'] <= datetime.today()].sort_values('Date',ascending=False).head(1)['Date']
-        if len(previous_home_games) > 0:
-            last_home_date = previous_home_games.iloc[0]
-            home_days_off = timedelta(days=1) + datetime.today() - last_home_date
-        else:
-            home_days_off = timedelta(days=7)
-        if len(previous_away_games) > 0:
-            last_away_date = previous_away_games.iloc[0]
-            away_days_off = timedelta(days=1) + datetime.today() - last_away_date
-        else:
-            away_days_off = timedelta(days=7)
-        # print(f"{away_team} days off: {away_days_off.days} @ {home_team} days off: {home_days_off.days}")
-
-        home_team_days_rest.append(home_days_off.days)
-        away_team_days_rest.append(away_days_off.days)
-        home_team_series = df.iloc[team_index_current.get(home_team)]
-        away_team_series = df.iloc[team_index_current.get(away_team)]
-        stats = pd.concat([home_team_series, away_team_series])
-        stats['Days-Rest-Home'] = home_days_off.days
-        stats['Days-Rest-Away'] = away_days_off.days
-        match_data.append(stats)
-
-    games_data_frame = pd.concat(match_data, ignore_index=True, axis=1)
-    games_data_frame = games_data_frame.T
+# Prediction runners are imported where their flag selects them: the NN runners load TensorFlow,
+# which an -xgb run never needs.
 
-    frame_ml = games_data_frame.drop(columns=['TEAM_ID', 'TEAM_NAME'])
-    data = frame_ml.values
-    data = data.astype(float)
 
-    return data, todays_games_uo, frame_ml, home_team_odds, away_team_odds
-
-def createTodaysNFLGames(games, df, odds):
-    if df.empty:
-        print("Error: No NFL team data available. Cannot create predictions.")
-        return None, [], None, [], []
-    
-    match_data = []
-    todays_games_uo = []
-    home_team_odds = []
-    away_team_odds = []
-
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        if home_team not in nfl_team_index_current or away_team not in nfl_team_index_current:
-            continue
-        if odds is not None:
-            game_odds = odds[home_team + ':' + away_team]
-            todays_games_uo.append(game_odds['under_over_odds'])
-
-            home_team_odds.append(game_odds[home_team]['money_line_odds'])
-            away_team_odds.append(game_odds[away_team]['money_line_odds'])
-
-        else:
-            todays_games_uo.append(input(home_team + ' vs ' + away_team + ': '))
-
-            home_team_odds.append(input(home_team + ' odds: '))
-            away_team_odds.append(input(away_team + ' odds: '))
-
-        home_team_data = df[df['TEAM_NAME'] == home_team]
-        away_team_data = df[df['TEAM_NAME'] == away_team]
-        
-        if home_team_data.empty or away_team_data.empty:
-            print(f"Warning: Missing data for {home_team} vs {away_team}")
-            print(f"Available teams in database: {sorted(df['TEAM_NAME'].unique().tolist())}")
-            continue
-            
-        home_team_series = home_team_data.iloc[0]
-        away_team_series = away_team_data.iloc[0]
-        stats = pd.concat([home_team_series, away_team_series])
-        
-        current_week = get_nfl_current_week()
-        stats['Current-Week'] = current_week
-        match_data.append(stats)
-
-    if not match_data:
-        print("Error: No valid games could be created with available team data.")
-        print("Please check that all required teams are present in the database.")
-        return None, [], None, [], []
-    
-    games_data_frame = pd.concat(match_data, ignore_index=True, axis=1)
-    games_data_frame = games_data_frame.T
-
-    columns_to_drop = ['TEAM_ID', 'TEAM_NAME', 'Season', 'Week', 'Date']
-    existing_columns = [col for col in columns_to_drop if col in games_data_frame.columns]
-    frame_ml = games_data_frame.drop(columns=existing_columns)
-    
-    data = frame_ml.values
-    data = data.astype(float)
-
-    return data, todays_games_uo, frame_ml, home_team_odds, away_team_odds
+def run_model(model, runner, predict_slate, records, data, todays_games_uo, frame_ml, games, home_team_odds,
+              away_team_odds):
+    """Prints a model's slate in text mode, otherwise adds its records to the structured output"""
+    if args.format == 'text':
+        runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+        return
+    results = predict_slate(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds)
+    sport = 'NFL' if args.nfl else 'NBA'
+    records.extend({'sport': sport, 'model': model, **record} for record in slate_records(results, args.odds))
 
 
 def main():
+    """Runs the selected models; returns their records when --format is structured"""
     odds = None
+    records = []
     
     if args.nfl:
         print("🏈 NFL Mode Activated")
@@ -206,6 +56,7 @@ def main():
         from src.Utils.nfl_tools import load_nfl_team_stats_from_sqlite
         df = load_nfl_team_stats_from_sqlite()
         data, todays_games_uo, frame_ml, home_team_odds, away_team_odds = createTodaysNFLGames(games, df, odds)
+        games = nfl_slate_games(games, df)
         
         if data is None:
             print("Failed to create NFL games data. Exiting.")
@@ -213,20 +64,28 @@ def main():
         
         if args.nn:
             print("------------NFL Neural Network Model Predictions-----------")
-            data = tf.keras.utils.normalize(data, axis=1)
-            nfl_nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            data = normalize(data, axis=1)
+            from src.Predict.NFL_NN_Runner import nfl_nn_predict_slate, nfl_nn_runner
+            run_model('nn', nfl_nn_runner, nfl_nn_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-----------------------------------------------------------")
         if args.xgb:
             print("---------------NFL XGBoost Model Predictions---------------")
-            nfl_xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            from src.Predict.NFL_XGBoost_Runner import nfl_xgb_predict_slate, nfl_xgb_runner
+            run_model('xgboost', nfl_xgb_runner, nfl_xgb_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-----------------------------------------------------------")
         if args.A:
             print("---------------NFL XGBoost Model Predictions---------------")
-            nfl_xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            from src.Predict.NFL_XGBoost_Runner import nfl_xgb_predict_slate, nfl_xgb_runner
+            run_model('xgboost', nfl_xgb_runner, nfl_xgb_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-----------------------------------------------------------")
-            data = tf.keras.utils.normalize(data, axis=1)
+            data = normalize(data, axis=1)
             print("------------NFL Neural Network Model Predictions-----------")
-            nfl_nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            from src.Predict.NFL_NN_Runner import nfl_nn_predict_slate, nfl_nn_runner
+            run_model('nn', nfl_nn_runner, nfl_nn_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-----------------------------------------------------------")
     else:
         print("🏀 NBA Mode (Default)")
@@ -258,23 +117,33 @@ def main():
         data = get_json_data(data_url)
         df = to_data_frame(data)
         data, todays_games_uo, frame_ml, home_team_odds, away_team_odds = createTodaysGames(games, df, odds)
+        games = slate_games(games)
         if args.nn:
             print("------------Neural Network Model Predictions-----------")
-            data = tf.keras.utils.normalize(data, axis=1)
-            NN_Runner.nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            data = normalize(data, axis=1)
+            from src.Predict.NN_Runner import nn_predict_slate, nn_runner
+            run_model('nn', nn_runner, nn_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-------------------------------------------------------")
         if args.xgb:
             print("---------------XGBoost Model Predictions---------------")
-            XGBoost_Runner.xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            from src.Predict.XGBoost_Runner import xgb_predict_slate, xgb_runner
+            run_model('xgboost', xgb_runner, xgb_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-------------------------------------------------------")
         if args.A:
             print("---------------XGBoost Model Predictions---------------")
-            XGBoost_Runner.xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            from src.Predict.XGBoost_Runner import xgb_predict_slate, xgb_runner
+            run_model('xgboost', xgb_runner, xgb_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-------------------------------------------------------")
-            data = tf.keras.utils.normalize(data, axis=1)
+            data = normalize(data, axis=1)
             print("------------Neural Network Model Predictions-----------")
-            NN_Runner.nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, args.kc)
+            from src.Predict.NN_Runner import nn_predict_slate, nn_runner
+            run_model('nn', nn_runner, nn_predict_slate, records, data, todays_games_uo, frame_ml, games,
+                      home_team_odds, away_team_odds)
             print("-------------------------------------------------------")
+    return records
 
 
 if __name__ == "__main__":
@@ -285,5 +154,18 @@ if __name__ == "__main__":
     parser.add_argument('-nfl', action='store_true', help='Use NFL mode instead of NBA (default)')
     parser.add_argument('-odds', help='Sportsbook to fetch from. (fanduel, draftkings, betmgm, pointsbet, caesars, wynn, bet_rivers_ny')
     parser.add_argument('-kc', action='store_true', help='Calculates percentage of bankroll to bet based on model edge')
+    parser.add_argument('--format', choices=output_formats, default='text',
+                        help='text prints colored slates; json, ndjson and arrow write records to stdout')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Score every game instead of reusing probabilities cached in Data/PredictionCache.sqlite')
     args = parser.parse_args()
-    main()
+    if not args.no_cache:
+        # Runs share model probabilities: a rerun whose stats, rest and totals are unchanged only reprices
+        set_prediction_cache(SqlitePredictionCache())
+    if args.format == 'text':
+        main()
+    else:
+        # Progress messages go to stderr so stdout carries only the serialized records
+        with redirect_stdout(sys.stderr):
+            records = main()
+        write_records(records or [], args.format, sys.stdout.buffer if args.format == 'arrow' else sys.stdout)
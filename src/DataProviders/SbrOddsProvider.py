@@ -19,6 +19,21 @@ class SbrOddsProvider:
         Returns:
             dictionary: [home_team_name + ':' + away_team_name: { home_team: money_line_odds, away_team: money_line_odds }, under_over_odds: val]
         """
+        return self._book_odds(self.sportsbook)
+
+    def get_odds_by_book(self, sportsbooks=None):
+        """Odds for several sportsbooks from the single scrape done in __init__
+
+        Args:
+            sportsbooks: books to extract, defaults to every book quoted in the payload
+        Returns:
+            dictionary: {sportsbook: get_odds() style dictionary}
+        """
+        if sportsbooks is None:
+            sportsbooks = sorted({book for game in self.games for book in game['home_ml']})
+        return {sportsbook: self._book_odds(sportsbook) for sportsbook in sportsbooks}
+
+    def _book_odds(self, sportsbook):
         dict_res = {}
         for game in self.games:
             # Get team names
@@ -28,14 +43,14 @@ class SbrOddsProvider:
             money_line_home_value = money_line_away_value = totals_value = None
 
             # Get money line bet values
-            if self.sportsbook in game['home_ml']:
-                money_line_home_value = game['home_ml'][self.sportsbook]
-            if self.sportsbook in game['away_ml']:
-                money_line_away_value = game['away_ml'][self.sportsbook]
+            if sportsbook in game['home_ml']:
+                money_line_home_value = game['home_ml'][sportsbook]
+            if sportsbook in game['away_ml']:
+                money_line_away_value = game['away_ml'][sportsbook]
 
             # Get totals bet value
-            if self.sportsbook in game['total']:
-                totals_value = game['total'][self.sportsbook]
+            if sportsbook in game['total']:
+                totals_value = game['total'][sportsbook]
 
             dict_res[home_team_name + ':' + away_team_name] = {
                 'under_over_odds': totals_value,
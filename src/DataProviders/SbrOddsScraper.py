@@ -0,0 +1,169 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime
+
+import pandas as pd
+from sbrscrape import Scoreboard
+
+from src.Utils.Days_Rest import team_days_rest
+from src.Utils.Dictionaries import nfl_team_index_current
+
+odds_columns = ['Date', 'Season', 'Week', 'Game', 'Home', 'Away', 'OU', 'Spread', 'ML_Home', 'ML_Away', 'Points',
+                'Win_Margin', 'has_odds']
+
+
+class RateLimiter:
+    """Spaces calls to one host at least 1 / requests_per_second apart, across every thread that shares it"""
+
+    def __init__(self, requests_per_second):
+        self.interval = 1.0 / requests_per_second
+        self._lock = threading.Lock()
+        self._next_call = 0.0
+
+    def wait(self):
+        with self._lock:
+            now = time.monotonic()
+            call_at = max(now, self._next_call)
+            self._next_call = call_at + self.interval
+        if call_at > now:
+            time.sleep(call_at - now)
+
+
+_rate_limiters = {}
+_rate_limiters_lock = threading.Lock()
+
+
+def rate_limiter_for(host, requests_per_second):
+    """The process-wide limiter of a host, created on first use"""
+    with _rate_limiters_lock:
+        if host not in _rate_limiters:
+            _rate_limiters[host] = RateLimiter(requests_per_second)
+        return _rate_limiters[host]
+
+
+class SbrOddsScraper:
+    """
+    Scrapes SBR odds and results for a range of days with a bounded thread pool.
+
+    Every finished day is written to the raw odds table together with its checkpoint row in one
+    transaction, so an interrupted backfill resumes with the days it has not finished. Once all
+    days of a season are checkpointed, the season table (the layout Get_Odds_Data.py always wrote,
+    with days rest) is rebuilt from the raw rows.
+
+    Args:
+        con: sqlite connection, only used from the calling thread
+        scoreboard: callable with the sbrscrape.Scoreboard(date=..., sport=...) interface
+    """
+
+    raw_table = "odds_days"
+    checkpoint_table = "scrape_checkpoint"
+
+    def __init__(self, con, sportsbook='fanduel', sport='NFL', max_workers=4, requests_per_second=1.0,
+                 host='www.sportsbookreview.com', scoreboard=Scoreboard, teams=nfl_team_index_current):
+        self.con = con
+        self.sportsbook = sportsbook
+        self.sport = sport
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter_for(host, requests_per_second)
+        self.scoreboard = scoreboard
+        self.teams = teams
+        self._create_tables()
+
+    def _create_tables(self):
+        self.con.execute(f"create table if not exists \"{self.raw_table}\" (Sport text, Date text, Season text, "
+                         f"Week integer, Game integer, Home text, Away text, OU real, Spread real, ML_Home real, "
+                         f"ML_Away real, Points real, Win_Margin real, has_odds integer)")
+        self.con.execute(f"create index if not exists \"{self.raw_table}_season\" on \"{self.raw_table}\" (Sport, Season)")
+        self.con.execute(f"create table if not exists \"{self.checkpoint_table}\" (sport text not null, date text not null, "
+                         f"season text, week integer, games integer, scraped_at text, primary key (sport, date))")
+        self.con.commit()
+
+    def completed_days(self):
+        return {date for (date,) in self.con.execute(
+            f"select date from \"{self.checkpoint_table}\" where sport = ?", [self.sport])}
+
+    def scrape_day(self, day, season, week):
+        """Rows of one day's games between known teams, run on a worker thread"""
+        self.rate_limiter.wait()
+        sb = self.scoreboard(date=day, sport=self.sport)
+        rows = []
+        for game in getattr(sb, 'games', None) or []:
+            home_team = game['home_team']
+            away_team = game['away_team']
+            if home_team not in self.teams or away_team not in self.teams:
+                continue
+            row = {'Date': day.isoformat(), 'Season': season, 'Week': week, 'Game': len(rows),
+                   'Home': home_team, 'Away': away_team}
+            try:
+                row.update({
+                    'OU': game['total'][self.sportsbook],
+                    'Spread': game['away_spread'][self.sportsbook],
+                    'ML_Home': game['home_ml'][self.sportsbook],
+                    'ML_Away': game['away_ml'][self.sportsbook],
+                    'Points': game['away_score'] + game['home_score'],
+                    'Win_Margin': game['home_score'] - game['away_score'],
+                    'has_odds': 1,
+                })
+            except KeyError:
+                row['has_odds'] = 0
+                print(f"No {self.sportsbook} odds data found for game: {game}")
+            # Games without odds still count as appearances for rest days
+            rows.append(row)
+        return rows
+
+    def _write_day(self, day, season, week, rows, checkpoint=True):
+        with self.con:
+            self.con.execute(f"delete from \"{self.raw_table}\" where Sport = ? and Date = ?", [self.sport, day.isoformat()])
+            self.con.executemany(
+                f"insert into \"{self.raw_table}\" (Sport, {', '.join(odds_columns)}) "
+                f"values ({', '.join('?' * (len(odds_columns) + 1))})",
+                [[self.sport] + [row.get(column) for column in odds_columns] for row in rows])
+            if checkpoint:
+                self.con.execute(f"insert or replace into \"{self.checkpoint_table}\" values (?, ?, ?, ?, ?, ?)",
+                                 [self.sport, day.isoformat(), season, week, len(rows),
+                                  datetime.now().isoformat(timespec='seconds')])
+
+    def scrape(self, days, today=None):
+        """
+        Scrapes every (date, season, week) not yet checkpointed, then rebuilds each season whose days are all done.
+        Days that fail are reported and left for the next run. Only days before today are checkpointed:
+        today's and future days are written as they stand but fetched again on later runs, once played.
+
+        Returns:
+            list of (date, exception) for the days that failed
+        """
+        today = date.today() if today is None else today
+        done = self.completed_days()
+        pending = [(day, season, week) for day, season, week in days if day.isoformat() not in done]
+        failures = []
+        failed_seasons = set()
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {executor.submit(self.scrape_day, *day): day for day in pending}
+            for future in as_completed(futures):
+                day, season, week = futures[future]
+                try:
+                    rows = future.result()
+                except Exception as e:
+                    print(f"Failed to get {self.sport} odds for {day}: {e}")
+                    failures.append((day, e))
+                    failed_seasons.add(season)
+                    continue
+                self._write_day(day, season, week, rows, checkpoint=day < today)
+                print(f"Got {self.sport} odds: {season} Week {week} {day} ({len(rows)} games)")
+
+        for season in sorted({season for _, season, _ in days} - failed_seasons):
+            self.write_season(season)
+        return failures
+
+    def write_season(self, season):
+        """Replaces the season table with its raw rows that have odds, with days rest since each team's previous game"""
+        df = pd.read_sql_query(f"select {', '.join(odds_columns)} from \"{self.raw_table}\" "
+                               f"where Sport = ? and Season = ? order by Date, Game", self.con,
+                               params=[self.sport, str(season)])
+        if not df.empty:
+            df['Days_Rest_Home'], df['Days_Rest_Away'] = team_days_rest(df['Date'], df['Home'], df['Away'],
+                                                                        first_game=7, max_rest=None)
+            df = df[df.pop('has_odds') == 1].drop(columns=['Game']).reset_index(drop=True)
+        df.to_sql(str(season), self.con, if_exists="replace")
+        return len(df.index)
@@ -1,100 +1,60 @@
 import copy
-import glob
 import numpy as np
-import tensorflow as tf
-from colorama import Fore, Style, init, deinit
-from keras.models import load_model
-from src.Utils import Expected_Value
-from src.Utils import Kelly_Criterion as kc
+from colorama import init, deinit
+from src.Predict.Slate import build_slate, print_slate
+from src.Utils.Normalize import normalize
+from src.Utils.Calibration import calibrate
+from src.Utils.Model_Registry import load_model
+from src.Utils.Prediction_Cache import cached_probabilities
 
 init()
 
-_nfl_model = None
-_nfl_ou_model = None
+_nfl_model_predict = None
+_nfl_ou_model_predict = None
+
+
+def _compile_predict(model):
+    """Traces a single forward pass so a whole slate is scored without Model.predict's per-call pipeline setup"""
+    import tensorflow as tf
+    forward = tf.function(lambda x: model(x, training=False), reduce_retracing=True)
+    return lambda x: forward(tf.convert_to_tensor(x, dtype=tf.float32)).numpy()
+
+def _load_predict(market):
+    """
+    The exported Dense network when one is registered (no TensorFlow needed), else the Keras model,
+    behind the prediction cache, followed by the model's calibrator
+    """
+    try:
+        predict, entry = load_model('dense', 'NFL', market)
+    except LookupError:
+        model, entry = load_model('keras', 'NFL', market)
+        predict = _compile_predict(model)
+    return lambda x: calibrate(cached_probabilities(entry['id'], x, predict), entry)
 
 def _load_nfl_models():
-    global _nfl_model, _nfl_ou_model
-    if _nfl_model is None:
-        ml_models = glob.glob('Models/NN_Models/Trained-Model-NFL-ML-*')
-        if not ml_models:
-            raise FileNotFoundError("NFL Neural Network ML model not found. Please train models first.")
-        latest_ml_model = max(ml_models, key=lambda x: float(x.split('-')[-1]))
-        _nfl_model = load_model(latest_ml_model)
-    
-    if _nfl_ou_model is None:
-        uo_models = glob.glob('Models/NN_Models/Trained-Model-NFL-UO-*')
-        if not uo_models:
-            raise FileNotFoundError("NFL Neural Network UO model not found. Please train models first.")
-        latest_uo_model = max(uo_models, key=lambda x: float(x.split('-')[-1]))
-        _nfl_ou_model = load_model(latest_uo_model)
+    global _nfl_model_predict, _nfl_ou_model_predict
+    if _nfl_model_predict is None:
+        _nfl_model_predict = _load_predict('ML')
+    if _nfl_ou_model_predict is None:
+        _nfl_ou_model_predict = _load_predict('UO')
 
-def nfl_nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion):
+def nfl_nn_predict_slate(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds):
     _load_nfl_models()
-    
-    ml_predictions_array = []
 
-    for row in data:
-        ml_predictions_array.append(_nfl_model.predict(np.array([row])))
+    ml_predictions_array = _nfl_model_predict(data)
 
     frame_uo = copy.deepcopy(frame_ml)
     frame_uo['OU'] = np.asarray(todays_games_uo)
     data = frame_uo.values
     data = data.astype(float)
-    data = tf.keras.utils.normalize(data, axis=1)
+    data = normalize(data, axis=1)
 
-    ou_predictions_array = []
+    ou_predictions_array = _nfl_ou_model_predict(data)
 
-    for row in data:
-        ou_predictions_array.append(_nfl_ou_model.predict(np.array([row])))
-
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        winner = int(np.argmax(ml_predictions_array[count]))
-        under_over = int(np.argmax(ou_predictions_array[count]))
-        winner_confidence = ml_predictions_array[count]
-        un_confidence = ou_predictions_array[count]
-        if winner == 1:
-            winner_confidence = round(winner_confidence[0][1] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                      Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                      Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        else:
-            winner_confidence = round(winner_confidence[0][0] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                      Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                      Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        count += 1
-    if kelly_criterion:
-        print("------------Expected Value & Kelly Criterion-----------")
-    else:
-        print("---------------------Expected Value--------------------")
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        ev_home = ev_away = 0
-        if home_team_odds[count] and away_team_odds[count]:
-            ev_home = float(Expected_Value.expected_value(ml_predictions_array[count][0][1], int(home_team_odds[count])))
-            ev_away = float(Expected_Value.expected_value(ml_predictions_array[count][0][0], int(away_team_odds[count])))
-        expected_value_colors = {'home_color': Fore.GREEN if ev_home > 0 else Fore.RED, 'away_color': Fore.GREEN if ev_away > 0 else Fore.RED}
-        bankroll_descriptor = ' Fraction of Bankroll: '
-        bankroll_fraction_home = bankroll_descriptor + str(kc.calculate_kelly_criterion(home_team_odds[count], ml_predictions_array[count][0][1])) + '%'
-        bankroll_fraction_away = bankroll_descriptor + str(kc.calculate_kelly_criterion(away_team_odds[count], ml_predictions_array[count][0][0])) + '%'
-
-        print(home_team + ' EV: ' + expected_value_colors['home_color'] + str(ev_home) + Style.RESET_ALL + (bankroll_fraction_home if kelly_criterion else ''))
-        print(away_team + ' EV: ' + expected_value_colors['away_color'] + str(ev_away) + Style.RESET_ALL + (bankroll_fraction_away if kelly_criterion else ''))
-        count += 1
+    return build_slate(games, ml_predictions_array, ou_predictions_array, todays_games_uo, home_team_odds, away_team_odds)
 
+def nfl_nn_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion):
+    results = nfl_nn_predict_slate(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds)
+    print_slate(results, kelly_criterion)
     deinit()
+    return results
@@ -1,110 +1,36 @@
-import copy
-import glob
-import os
-
 import numpy as np
 import pandas as pd
-import xgboost as xgb
-from colorama import Fore, Style, init, deinit
-from src.Utils import Expected_Value
-from src.Utils import Kelly_Criterion as kc
+from colorama import init, deinit
+from src.Predict.Slate import predict_books, print_slate
+from src.Utils.Calibration import calibrate
+from src.Utils.Model_Registry import check_features, load_model
+from src.Utils.Prediction_Cache import cached_probabilities
 
 init()
 
-def _load_nfl_models():
-    """Load the best NFL XGBoost models"""
-    ml_models = glob.glob('Models/XGBoost_Models/XGBoost_*%_NFL_ML.json')
-    uo_models = glob.glob('Models/XGBoost_Models/XGBoost_*%_NFL_UO.json')
-    
-    if not ml_models or not uo_models:
-        raise FileNotFoundError("NFL XGBoost models not found. Please train models first.")
-    
-    ml_model_path = max(ml_models, key=lambda x: float(os.path.basename(x).split('_')[1].replace('%', '')))
-    uo_model_path = max(uo_models, key=lambda x: float(os.path.basename(x).split('_')[1].replace('%', '')))
-    
-    xgb_ml = xgb.Booster()
-    xgb_ml.load_model(ml_model_path)
-    xgb_uo = xgb.Booster()
-    xgb_uo.load_model(uo_model_path)
-    
-    return xgb_ml, xgb_uo
-
-def nfl_xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion):
-    xgb_ml, xgb_uo = _load_nfl_models()
-    
-    ml_predictions_array = []
-
-    for row in data:
-        ml_predictions_array.append(xgb_ml.predict(xgb.DMatrix(np.array([row]))))
 
-    frame_uo = copy.deepcopy(frame_ml)
-    frame_uo['OU'] = np.asarray(todays_games_uo)
-    data = frame_uo.values
-    data = data.astype(float)
+def _predict(model, data):
+    """
+    Scores the slate's rows not already in the prediction cache in one call, without building a DMatrix,
+    then calibrates the probabilities
+    """
+    booster, entry = model
+    check_features(entry, data)
+    probabilities = cached_probabilities(
+        entry['id'], data, lambda rows: booster.inplace_predict(np.ascontiguousarray(rows, dtype=np.float32)))
+    return calibrate(probabilities, entry)
 
-    ou_predictions_array = []
+def nfl_xgb_predict_books(data, frame_ml, games, book_lines):
+    """Slates for several sportsbooks, see Slate.predict_books"""
+    xgb_ml = load_model('xgboost', 'NFL', 'ML')
+    xgb_uo = load_model('xgboost', 'NFL', 'UO')
+    return predict_books(lambda x: _predict(xgb_ml, x), lambda x: _predict(xgb_uo, x), data, frame_ml, games, book_lines)
 
-    for row in data:
-        ou_predictions_array.append(xgb_uo.predict(xgb.DMatrix(np.array([row]))))
-
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        winner = int(np.argmax(ml_predictions_array[count]))
-        under_over = int(np.argmax(ou_predictions_array[count]))
-        winner_confidence = ml_predictions_array[count]
-        un_confidence = ou_predictions_array[count]
-        if winner == 1:
-            winner_confidence = round(winner_confidence[0][1] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(
-                    Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                    Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(
-                    Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' +
-                    Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        else:
-            winner_confidence = round(winner_confidence[0][0] * 100, 1)
-            if under_over == 0:
-                un_confidence = round(ou_predictions_array[count][0][0] * 100, 1)
-                print(
-                    Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                    Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-            else:
-                un_confidence = round(ou_predictions_array[count][0][1] * 100, 1)
-                print(
-                    Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' +
-                    Fore.BLUE + 'OVER ' + Style.RESET_ALL + str(
-                        todays_games_uo[count]) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL)
-        count += 1
-
-    if kelly_criterion:
-        print("------------Expected Value & Kelly Criterion-----------")
-    else:
-        print("---------------------Expected Value--------------------")
-    count = 0
-    for game in games:
-        home_team = game[0]
-        away_team = game[1]
-        ev_home = ev_away = 0
-        if home_team_odds[count] and away_team_odds[count]:
-            ev_home = float(Expected_Value.expected_value(ml_predictions_array[count][0][1], int(home_team_odds[count])))
-            ev_away = float(Expected_Value.expected_value(ml_predictions_array[count][0][0], int(away_team_odds[count])))
-        expected_value_colors = {'home_color': Fore.GREEN if ev_home > 0 else Fore.RED,
-                        'away_color': Fore.GREEN if ev_away > 0 else Fore.RED}
-        bankroll_descriptor = ' Fraction of Bankroll: '
-        bankroll_fraction_home = bankroll_descriptor + str(kc.calculate_kelly_criterion(home_team_odds[count], ml_predictions_array[count][0][1])) + '%'
-        bankroll_fraction_away = bankroll_descriptor + str(kc.calculate_kelly_criterion(away_team_odds[count], ml_predictions_array[count][0][0])) + '%'
-
-        print(home_team + ' EV: ' + expected_value_colors['home_color'] + str(ev_home) + Style.RESET_ALL + (bankroll_fraction_home if kelly_criterion else ''))
-        print(away_team + ' EV: ' + expected_value_colors['away_color'] + str(ev_away) + Style.RESET_ALL + (bankroll_fraction_away if kelly_criterion else ''))
-        count += 1
+def nfl_xgb_predict_slate(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds):
+    return nfl_xgb_predict_books(data, frame_ml, games, {None: (todays_games_uo, home_team_odds, away_team_odds)})[None]
 
+def nfl_xgb_runner(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds, kelly_criterion):
+    results = nfl_xgb_predict_slate(data, todays_games_uo, frame_ml, games, home_team_odds, away_team_odds)
+    print_slate(results, kelly_criterion)
     deinit()
+    return results
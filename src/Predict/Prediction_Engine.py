@@ -0,0 +1,98 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.DataProviders.SbrOddsProvider import SbrOddsProvider
+from src.Predict.Slate import slate_records
+from src.Utils.tools import create_todays_games_from_odds, get_json_data, to_data_frame, createTodaysGames, \
+    createTodaysNFLGames, data_url, nfl_slate_games, slate_games
+
+
+class PredictionEngine:
+    """
+    In-process prediction API. Models are loaded on first use and kept for the lifetime of
+    the process, so callers such as the Flask dashboard pay inference cost only.
+    Only the XGBoost models are served, matching what the dashboard used to request from main.py.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._predict_books = {}
+
+    def _runner(self, sport):
+        with self._lock:
+            if sport not in self._predict_books:
+                if sport == "NFL":
+                    from src.Predict.NFL_XGBoost_Runner import nfl_xgb_predict_books
+                    self._predict_books[sport] = nfl_xgb_predict_books
+                else:
+                    from src.Predict.XGBoost_Runner import xgb_predict_books
+                    self._predict_books[sport] = xgb_predict_books
+            return self._predict_books[sport]
+
+    def team_stats(self, sport="NBA"):
+        if sport == "NFL":
+            from src.Utils.nfl_tools import load_nfl_team_stats_from_sqlite
+            return load_nfl_team_stats_from_sqlite()
+        return to_data_frame(get_json_data(data_url))
+
+    def predict(self, games, odds, sport="NBA", sportsbook=None, team_df=None):
+        """
+        Scores games ([[home_team, away_team], ...]) against odds in the SbrOddsProvider.get_odds() format.
+        Returns one dict per game, see Slate.slate_records.
+        """
+        return self.predict_books(games, {sportsbook: odds}, sport=sport, team_df=team_df)[sportsbook]
+
+    def predict_books(self, games, odds_by_book, sport="NBA", team_df=None):
+        """
+        Scores games once and prices them against every sportsbook in odds_by_book
+        ({sportsbook: get_odds() style dictionary}).
+        Returns {sportsbook: [dict per game]}.
+        """
+        if not games or not odds_by_book:
+            return {sportsbook: [] for sportsbook in odds_by_book}
+        if team_df is None:
+            team_df = self.team_stats(sport)
+        # Only the games the feature builders keep, so every book's lines line up with the rows of data
+        games = nfl_slate_games(games, team_df) if sport == "NFL" else slate_games(games)
+        if not games:
+            return {sportsbook: [] for sportsbook in odds_by_book}
+        reference_odds = next(iter(odds_by_book.values()))
+        if sport == "NFL":
+            data, _, frame_ml, _, _ = createTodaysNFLGames(games, team_df, reference_odds)
+            if data is None:
+                return {sportsbook: [] for sportsbook in odds_by_book}
+        else:
+            data, _, frame_ml, _, _ = createTodaysGames(games, team_df, reference_odds)
+        book_lines = {sportsbook: _book_lines(games, odds) for sportsbook, odds in odds_by_book.items()}
+        results = self._runner(sport)(data, frame_ml, games, book_lines)
+        return {sportsbook: slate_records(slate, sportsbook) for sportsbook, slate in results.items()}
+
+    def predict_sportsbooks(self, sportsbooks, sport="NBA"):
+        """
+        Fetches today's games and every requested book's lines with one scrape and scores them.
+        The team stats are fetched alongside the scrape rather than after it.
+        """
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            team_df = executor.submit(self.team_stats, sport)
+            odds_by_book = SbrOddsProvider(sport=sport).get_odds_by_book(sportsbooks)
+            games = create_todays_games_from_odds(next(iter(odds_by_book.values()), {}))
+            return self.predict_books(games, odds_by_book, sport=sport, team_df=team_df.result())
+
+    def predict_sportsbook(self, sportsbook, sport="NBA"):
+        """Fetches today's games and lines for one sportsbook and scores them"""
+        return self.predict_sportsbooks([sportsbook], sport=sport)[sportsbook]
+
+
+def _book_lines(games, odds):
+    todays_games_uo = []
+    home_team_odds = []
+    away_team_odds = []
+    for home_team, away_team in games:
+        game_odds = odds[home_team + ':' + away_team]
+        todays_games_uo.append(game_odds['under_over_odds'])
+        home_team_odds.append(game_odds[home_team]['money_line_odds'])
+        away_team_odds.append(game_odds[away_team]['money_line_odds'])
+    return todays_games_uo, home_team_odds, away_team_odds
+
+
+engine = PredictionEngine()
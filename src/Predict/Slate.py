@@ -0,0 +1,203 @@
+import json
+
+import numpy as np
+from colorama import Fore, Style
+
+from src.Utils.Expected_Value import expected_value_array
+from src.Utils.Kelly_Criterion import kelly_criterion_array
+
+# One row per game on the slate. Probabilities are kept in the model's float32 so the
+# rendered percentages and EV values match what the per-game predictions produced.
+slate_dtype = np.dtype([
+    ('home_team', object),
+    ('away_team', object),
+    ('home_prob', np.float32),
+    ('away_prob', np.float32),
+    ('winner', np.int8),        # 1 = home team, 0 = away team
+    ('ou_line', object),
+    ('under_prob', np.float32),
+    ('over_prob', np.float32),
+    ('ou_pick', np.int8),       # 0 = under, 1 = over
+    ('home_odds', np.float64),  # NaN when the sportsbook has no line
+    ('away_odds', np.float64),
+    ('home_ev', np.float64),
+    ('away_ev', np.float64),
+    ('home_kelly', np.float32),
+    ('away_kelly', np.float32),
+])
+
+
+def build_slate(games, ml_predictions, ou_predictions, todays_games_uo, home_team_odds, away_team_odds):
+    """
+    Combines batched model outputs with the slate's odds into a structured array.
+    ml_predictions and ou_predictions are (n_games, n_classes) probability matrices.
+    """
+    results = np.zeros(len(games), dtype=slate_dtype)
+    for count, game in enumerate(games):
+        ml = ml_predictions[count]
+        ou = ou_predictions[count]
+        row = results[count]
+        row['home_team'] = game[0]
+        row['away_team'] = game[1]
+        row['home_prob'] = ml[1]
+        row['away_prob'] = ml[0]
+        row['winner'] = int(np.argmax(ml))
+        row['ou_line'] = todays_games_uo[count]
+        row['under_prob'] = ou[0]
+        row['over_prob'] = ou[1]
+        row['ou_pick'] = 0 if int(np.argmax(ou)) == 0 else 1
+        row['home_odds'] = _to_line(home_team_odds[count])
+        row['away_odds'] = _to_line(away_team_odds[count])
+
+    # EV and Kelly for every game with both lines in one pass; games missing a line keep 0
+    priced = np.isfinite(results['home_odds']) & np.isfinite(results['away_odds']) & \
+        (results['home_odds'] != 0) & (results['away_odds'] != 0)
+    home_odds, away_odds = np.trunc(results['home_odds'][priced]), np.trunc(results['away_odds'][priced])
+    home_prob, away_prob = results['home_prob'][priced], results['away_prob'][priced]
+    results['home_ev'][priced] = expected_value_array(home_prob, home_odds)
+    results['away_ev'][priced] = expected_value_array(away_prob, away_odds)
+    results['home_kelly'][priced] = kelly_criterion_array(home_odds, home_prob)
+    results['away_kelly'][priced] = kelly_criterion_array(away_odds, away_prob)
+    return results
+
+
+def _optional(value):
+    return None if np.isnan(value) else float(value)
+
+
+def slate_records(results, sportsbook=None):
+    """Plain dict per game, for callers that consume predictions rather than console output"""
+    records = []
+    for row in results:
+        under_over = 'UNDER' if row['ou_pick'] == 0 else 'OVER'
+        records.append({
+            'home_team': row['home_team'],
+            'away_team': row['away_team'],
+            'sportsbook': sportsbook,
+            'home_prob': float(row['home_prob']),
+            'away_prob': float(row['away_prob']),
+            'winner': row['home_team'] if row['winner'] == 1 else row['away_team'],
+            'ou_line': row['ou_line'],
+            'ou_pick': under_over,
+            'ou_prob': float(row['under_prob'] if row['ou_pick'] == 0 else row['over_prob']),
+            'home_odds': _optional(row['home_odds']),
+            'away_odds': _optional(row['away_odds']),
+            'home_ev': round(float(row['home_ev']), 2),
+            'away_ev': round(float(row['away_ev']), 2),
+            'home_kelly': round(float(row['home_kelly']), 2),
+            'away_kelly': round(float(row['away_kelly']), 2),
+        })
+    return records
+
+
+def _to_line(value):
+    if value is None or value == '':
+        return np.nan
+    return float(value)
+
+
+def predict_books(predict_ml, predict_ou, data, frame_ml, games, book_lines):
+    """
+    Scores a slate for several sportsbooks at once.
+    The ML model runs once per game. The UO model runs once per distinct (game, total line),
+    since its only odds-dependent input is the line.
+
+    Args:
+        predict_ml, predict_ou: callables mapping a feature matrix to class probabilities
+        book_lines: {sportsbook: (todays_games_uo, home_team_odds, away_team_odds)}, each aligned with games
+            and the rows of data
+    Returns:
+        dictionary: {sportsbook: slate array from build_slate}
+    """
+    ml_predictions_array = predict_ml(data)
+
+    features = np.asarray(frame_ml.values, dtype=float)
+    books = list(book_lines)
+    game_count = len(features)
+    for book in books:
+        if len(games) != game_count or any(len(lines) != game_count for lines in book_lines[book]):
+            raise ValueError(f"{book} lines cover {[len(lines) for lines in book_lines[book]]} games and the slate "
+                             f"{len(games)}, but the features have {game_count} rows")
+    rows = np.concatenate([
+        np.column_stack([np.arange(game_count), np.array([_to_line(v) for v in book_lines[book][0]], dtype=float)])
+        for book in books
+    ])
+    unique_rows, inverse = np.unique(rows, axis=0, return_inverse=True)
+    ou_data = np.column_stack([features[unique_rows[:, 0].astype(int)], unique_rows[:, 1]])
+    ou_predictions_array = predict_ou(ou_data)[inverse.reshape(-1)]
+
+    results = {}
+    for position, book in enumerate(books):
+        todays_games_uo, home_team_odds, away_team_odds = book_lines[book]
+        book_ou_predictions = ou_predictions_array[position * game_count:(position + 1) * game_count]
+        results[book] = build_slate(games, ml_predictions_array, book_ou_predictions, todays_games_uo, home_team_odds, away_team_odds)
+    return results
+
+
+def _format_number(value):
+    return '0' if value == 0 else str(value)
+
+
+def _format_ev(value):
+    return '0' if value == 0 else str(float(value))
+
+
+def print_slate(results, kelly_criterion):
+    """Console renderer for a slate produced by build_slate"""
+    for row in results:
+        home_team = row['home_team']
+        away_team = row['away_team']
+        if row['ou_pick'] == 0:
+            un_confidence = round(row['under_prob'] * 100, 1)
+            ou_text = Fore.MAGENTA + 'UNDER ' + Style.RESET_ALL
+        else:
+            un_confidence = round(row['over_prob'] * 100, 1)
+            ou_text = Fore.BLUE + 'OVER ' + Style.RESET_ALL
+        ou_text += str(row['ou_line']) + Style.RESET_ALL + Fore.CYAN + f" ({un_confidence}%)" + Style.RESET_ALL
+        if row['winner'] == 1:
+            winner_confidence = round(row['home_prob'] * 100, 1)
+            print(Fore.GREEN + home_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ' vs ' + Fore.RED + away_team + Style.RESET_ALL + ': ' + ou_text)
+        else:
+            winner_confidence = round(row['away_prob'] * 100, 1)
+            print(Fore.RED + home_team + Style.RESET_ALL + ' vs ' + Fore.GREEN + away_team + Style.RESET_ALL + Fore.CYAN + f" ({winner_confidence}%)" + Style.RESET_ALL + ': ' + ou_text)
+
+    if kelly_criterion:
+        print("------------Expected Value & Kelly Criterion-----------")
+    else:
+        print("---------------------Expected Value--------------------")
+    for row in results:
+        ev_home = row['home_ev']
+        ev_away = row['away_ev']
+        expected_value_colors = {'home_color': Fore.GREEN if ev_home > 0 else Fore.RED,
+                                 'away_color': Fore.GREEN if ev_away > 0 else Fore.RED}
+        bankroll_descriptor = ' Fraction of Bankroll: '
+        bankroll_fraction_home = bankroll_descriptor + _format_number(row['home_kelly']) + '%'
+        bankroll_fraction_away = bankroll_descriptor + _format_number(row['away_kelly']) + '%'
+
+        print(row['home_team'] + ' EV: ' + expected_value_colors['home_color'] + _format_ev(ev_home) + Style.RESET_ALL + (bankroll_fraction_home if kelly_criterion else ''))
+        print(row['away_team'] + ' EV: ' + expected_value_colors['away_color'] + _format_ev(ev_away) + Style.RESET_ALL + (bankroll_fraction_away if kelly_criterion else ''))
+
+
+output_formats = ('text', 'json', 'ndjson', 'arrow')
+
+
+def write_records(records, output_format, stream):
+    """
+    Serializes slate records (see slate_records) in one pass: a JSON array, one JSON object per line,
+    or an Arrow IPC stream, which needs pyarrow. stream is binary for arrow, text otherwise.
+    """
+    if output_format == 'json':
+        json.dump(records, stream)
+        stream.write('\n')
+    elif output_format == 'ndjson':
+        stream.writelines(json.dumps(record) + '\n' for record in records)
+    elif output_format == 'arrow':
+        try:
+            import pyarrow as pa
+        except ImportError:
+            raise RuntimeError("--format arrow needs pyarrow, pip install pyarrow") from None
+        table = pa.Table.from_pylist(records)
+        with pa.ipc.new_stream(stream, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unknown output format {output_format}, expected one of {output_formats[1:]}")
@@ -0,0 +1,12 @@
+import os
+import sqlite3
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Team_Data_Store import migrate_per_date_tables, team_stats_table
+
+# One-off migration of TeamData.sqlite from one table per date to the consolidated team_stats table
+con = sqlite3.connect("../../Data/TeamData.sqlite")
+rows = migrate_per_date_tables(con)
+con.close()
+print(f"Wrote {rows} rows to {team_stats_table}")
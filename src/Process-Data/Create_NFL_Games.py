@@ -1,3 +1,4 @@
+import argparse
 import sqlite3
 import pandas as pd
 import numpy as np
@@ -6,6 +7,7 @@ import sys
 import os
 
 sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Dataset_Progress import append_since_high_water, clear_high_water, get_high_water, set_high_water
 from src.Utils.Dictionaries import nfl_team_index_current
 from src.Utils.tools import handle_bye_weeks
 
@@ -207,25 +209,21 @@ def aggregate_team_stats_from_games(season, week):
         print(f"Error aggregating team stats for {season} Week {week}: {e}")
         return None
 
-def process_nfl_weekly_data(config, season, week):
+def process_nfl_weekly_data(config, season, week, allow_sample=True):
     """
     Process NFL data for a specific season and week.
     Uses aggregated team statistics from the team_scores table.
+    Falls back to sample data when the week has no games, unless allow_sample is False.
     """
     try:
         team_stats_list = aggregate_team_stats_from_games(season, week)
         
         if not team_stats_list:
+            if not allow_sample:
+                print(f"No game data found for {season} Week {week}")
+                return None
             print(f"No game data found for {season} Week {week}. Creating sample data for testing...")
-            sample_teams = create_sample_nfl_data(season, week)
-            processed_teams = []
-            for team_stats in sample_teams:
-                team_features = create_nfl_features(team_stats)
-                team_features['Season'] = season
-                team_features['Week'] = week
-                team_features['Date'] = f"{season}-W{week:02d}"
-                processed_teams.append(team_features)
-            return processed_teams
+            return process_sample_weekly_data(season, week)
         
         processed_teams = []
         for team_stats in team_stats_list:
@@ -242,10 +240,33 @@ def process_nfl_weekly_data(config, season, week):
         print(f"Error processing {season} Week {week}: {e}")
         return None
 
-def create_nfl_games_dataset():
+def process_sample_weekly_data(season, week):
+    """
+    Sample team features for a week without game data, so a full rebuild still covers every configured week.
+    """
+    processed_teams = []
+    for team_stats in create_sample_nfl_data(season, week):
+        team_features = create_nfl_features(team_stats)
+        team_features['Season'] = season
+        team_features['Week'] = week
+        team_features['Date'] = f"{season}-W{week:02d}"
+        processed_teams.append(team_features)
+    return processed_teams
+
+def create_nfl_games_dataset(incremental=False):
     """
     Main function to create NFL games dataset with 40+ features.
     Processes configured NFL seasons with weekly structure.
+
+    With incremental, only weeks after each season's high-water mark are processed and appended,
+    stopping a season at its first week without game data, and the rest of the table is left untouched.
+    A full rebuild fills weeks without game data with sample rows, but only advances a season's mark through
+    its last week of real games before the first sample week, so the next incremental run replaces the
+    sample rows once the real games are in.
+
+    Returns:
+        DataFrame of the games written to the dataset table (the whole table when rebuilt, the appended
+        games when incremental), empty when there were none
     """
     config = toml.load('../../config.toml')
     nfl_config = config.get('create-nfl-games', {})
@@ -264,7 +285,13 @@ def create_nfl_games_dataset():
         print(f"Warning: Could not connect to OddsData.sqlite: {e}")
         odds_conn = None
     
+    dataset_conn = sqlite3.connect('../../Data/NFLDataset.sqlite')
+    min_season = min(seasons) if seasons else '2019'
+    max_season = max(seasons) if seasons else '2024'
+    table_name = f'nfl_dataset_{min_season}-{max_season}'
+    
     all_games = []
+    last_weeks = {}
     
     for season in seasons:
         print(f"\nProcessing NFL {season} season...")
@@ -273,12 +300,23 @@ def create_nfl_games_dataset():
         start_week = season_config.get('start_week', 1)
         end_week = season_config.get('end_week', 18)
         
+        if incremental:
+            high_water = get_high_water(dataset_conn, table_name, season)
+            if high_water is not None:
+                start_week = max(start_week, int(high_water) + 1)
+            season_games = []
+        
+        sampled = False
         for week in range(start_week, end_week + 1):
             print(f"Processing Week {week}...")
             
-            weekly_teams = process_nfl_weekly_data(config, season, week)
+            weekly_teams = process_nfl_weekly_data(config, season, week, allow_sample=False)
             if not weekly_teams:
-                continue
+                if incremental:
+                    break
+                print(f"Creating sample data for {season} Week {week} for testing...")
+                weekly_teams = process_sample_weekly_data(season, week)
+                sampled = True
                 
             active_teams = weekly_teams
             
@@ -286,24 +324,35 @@ def create_nfl_games_dataset():
             
             if games_this_week:
                 all_games.extend(games_this_week)
+                if not sampled:
+                    last_weeks[season] = week
                 print(f"Added {len(games_this_week)} games from Week {week}")
+                if incremental:
+                    season_games.extend(games_this_week)
+        
+        if incremental and season_games:
+            appended = append_since_high_water(dataset_conn, table_name, season, pd.DataFrame(season_games),
+                                               'Week', season_column='Season')
+            print(f"Appended {appended} games to {table_name} for {season}")
     
     if odds_conn:
         odds_conn.close()
     
     if not all_games:
-        print("No games data created. Check NFL data availability.")
-        return
+        dataset_conn.close()
+        print("No new games to add." if incremental else "No games data created. Check NFL data availability.")
+        return pd.DataFrame()
     
-    print(f"\nCreating dataset with {len(all_games)} total games...")
     df = pd.DataFrame(all_games)
+    if incremental:
+        dataset_conn.close()
+        return df
     
-    dataset_conn = sqlite3.connect('../../Data/NFLDataset.sqlite')
-    min_season = min(seasons) if seasons else '2019'
-    max_season = max(seasons) if seasons else '2024'
-    table_name = f'nfl_dataset_{min_season}-{max_season}'
-    
+    print(f"\nCreating dataset with {len(all_games)} total games...")
     df.to_sql(table_name, dataset_conn, if_exists='replace', index=False)
+    clear_high_water(dataset_conn, table_name)
+    for season, week in last_weeks.items():
+        set_high_water(dataset_conn, table_name, season, week)
     dataset_conn.close()
     
     print(f"NFL Dataset created successfully!")
@@ -455,4 +504,8 @@ def create_sample_nfl_data(season, week):
     return sample_teams
 
 if __name__ == "__main__":
-    create_nfl_games_dataset()
+    parser = argparse.ArgumentParser(description='Build the NFL games dataset')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Append only weeks after each season\'s high-water mark instead of rebuilding every season')
+    args = parser.parse_args()
+    create_nfl_games_dataset(incremental=args.incremental)
@@ -0,0 +1,38 @@
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Backtest import default_results_db, default_strategies, run_backtest
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Backtest the registered model over past seasons')
+    parser.add_argument('sport', choices=['NBA', 'NFL'], type=str.upper)
+    parser.add_argument('market', choices=['ML', 'UO'], type=str.upper)
+    parser.add_argument('--framework', default='xgboost', choices=['xgboost', 'dense', 'keras'])
+    parser.add_argument('--seasons', nargs='+', help='Only bet these seasons, defaults to the model\'s holdout seasons')
+    parser.add_argument('--in-sample', action='store_true',
+                        help='Without --seasons, bet every season, including those the model was trained on')
+    parser.add_argument('--table', help='Dataset table to backtest instead of the market\'s training table')
+    parser.add_argument('--bankroll', type=float, default=100.0)
+    parser.add_argument('--flat-stake', type=float, default=1.0, help='% of the starting bankroll per flat bet')
+    parser.add_argument('--fraction', type=float, default=0.25, help='Share of the Kelly stake for fractional Kelly')
+    parser.add_argument('--cap', type=float, help='Largest % of the bankroll on one Kelly bet')
+    parser.add_argument('--min-ev', type=float, default=0.0, help='Only bet sides with a higher EV per 100 staked')
+    parser.add_argument('--raw', action='store_true', help='Bet on raw model probabilities, skipping calibration')
+    parser.add_argument('--results-db', default=str(default_results_db), help='sqlite file of the results table')
+    args = parser.parse_args()
+
+    strategies = {name: dict(strategy) for name, strategy in default_strategies.items()}
+    strategies['flat']['stake'] = args.flat_stake
+    strategies['fractional-kelly']['fraction'] = args.fraction
+    results = run_backtest(args.sport, args.market, framework=args.framework, strategies=strategies,
+                           seasons=args.seasons, bankroll=args.bankroll, min_ev=args.min_ev, cap=args.cap,
+                           table=args.table, calibrated=not args.raw, results_db=args.results_db,
+                           in_sample=args.in_sample)
+    if (results['evaluated_on'] == 'in-sample').any():
+        print("In-sample backtest: some bet seasons are not holdout seasons of the model, so ROI is optimistic")
+    with pd.option_context('display.max_rows', None, 'display.width', 200):
+        print(results.drop(columns=['run_id', 'sport', 'market']).to_string(index=False))
@@ -0,0 +1,18 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Calibration import fit_model_calibrator, methods
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fit a probability calibrator for the active model on a holdout season')
+    parser.add_argument('sport', choices=['NBA', 'NFL'], type=str.upper)
+    parser.add_argument('market', choices=['ML', 'UO'], type=str.upper)
+    parser.add_argument('--framework', default='xgboost', choices=['xgboost', 'dense', 'keras'])
+    parser.add_argument('--season', help="Holdout season, defaults to the model's registered holdout season, else the latest in the dataset")
+    parser.add_argument('--method', default='isotonic', choices=methods)
+    args = parser.parse_args()
+
+    calibrator, path = fit_model_calibrator(args.framework, args.sport, args.market, args.season, args.method)
+    print(f"Saved {calibrator.method} calibrator for {calibrator.model_id} fitted on {calibrator.season} to {path}")
@@ -0,0 +1,23 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Dense_Network import export_checkpoint
+from src.Utils.Model_Registry import active_entry, project_root
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Export the active Keras models for the NumPy / onnxruntime runners')
+    parser.add_argument('--sport', choices=['NBA', 'NFL'], type=str.upper, nargs='+', default=['NBA', 'NFL'])
+    parser.add_argument('--market', choices=['ML', 'UO'], type=str.upper, nargs='+', default=['ML', 'UO'])
+    args = parser.parse_args()
+
+    for sport in args.sport:
+        for market in args.market:
+            try:
+                entry = active_entry('keras', sport, market)
+            except LookupError as e:
+                print(e)
+                continue
+            exported = export_checkpoint(project_root / entry['path'], sport, market, metrics=entry['metrics'])
+            print(f"Exported {entry['path']} to {exported['path']}")
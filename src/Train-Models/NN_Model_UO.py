@@ -1,4 +1,6 @@
+import os
 import sqlite3
+import sys
 import time
 
 import numpy as np
@@ -6,6 +8,10 @@ import pandas as pd
 import tensorflow as tf
 from keras.callbacks import TensorBoard, EarlyStopping, ModelCheckpoint
 
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Dense_Network import export_checkpoint
+from src.Utils.Model_Registry import register_model
+
 current_time = str(time.time())
 
 tensorboard = TensorBoard(log_dir='../../Logs/{}'.format(current_time))
@@ -36,6 +42,12 @@ model.add(tf.keras.layers.Dense(128, activation=tf.nn.relu6))
 model.add(tf.keras.layers.Dense(3, activation=tf.nn.softmax))
 
 model.compile(optimizer='adam', loss='sparse_categorical_crossentropy', metrics=['accuracy'])
-model.fit(x_train, y_train, epochs=50, validation_split=0.1, batch_size=32, callbacks=[tensorboard, earlyStopping, mcp_save])
+history = model.fit(x_train, y_train, epochs=50, validation_split=0.1, batch_size=32, callbacks=[tensorboard, earlyStopping, mcp_save])
+
+# The checkpoint holds the best epoch by validation loss
+metrics = {'val_loss': min(history.history['val_loss'])}
+register_model('keras', 'NBA', 'UO', mcp_save.filepath, num_features=x_train.shape[1], metrics=metrics)
+# Its weights as plain arrays, for the NN runners to score without TensorFlow
+export_checkpoint(mcp_save.filepath, 'NBA', 'UO', metrics=metrics)
 
 print('Done')
@@ -0,0 +1,28 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Training_Sweep import default_models_dir, default_results_db, run_sweep, sweep_space
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Parallel XGBoost seed / hyperparameter sweep')
+    parser.add_argument('sport', choices=['NBA', 'NFL'], type=str.upper)
+    parser.add_argument('market', choices=['ML', 'UO'], type=str.upper)
+    parser.add_argument('--trials', type=int, help='Seeds per combination, overrides config.toml')
+    parser.add_argument('--max-depth', type=int, nargs='+', help='max_depth values to try')
+    parser.add_argument('--eta', type=float, nargs='+', help='eta values to try')
+    parser.add_argument('--rounds', type=int, nargs='+', help='Boosting rounds to try')
+    parser.add_argument('--workers', type=int, help='Worker processes, defaults to cores / nthread')
+    parser.add_argument('--nthread', type=int, help='XGBoost threads per worker')
+    parser.add_argument('--results-db', default=str(default_results_db), help='sqlite file of the results table')
+    parser.add_argument('--models-dir', default=str(default_models_dir), help='Where the best models are saved')
+    parser.add_argument('--no-save', action='store_true', help='Only record results, do not save models')
+    args = parser.parse_args()
+
+    space = sweep_space(args.sport, args.market)
+    for key, value in [('trials', args.trials), ('max_depth', args.max_depth), ('eta', args.eta), ('rounds', args.rounds)]:
+        if value is not None:
+            space[key] = value
+    run_sweep(args.sport, args.market, space, workers=args.workers, nthread=args.nthread,
+              results_db=args.results_db, models_dir=args.models_dir, save_best=not args.no_save)
@@ -0,0 +1,28 @@
+import argparse
+import os
+import sys
+
+sys.path.insert(1, os.path.join(sys.path[0], '../..'))
+from src.Utils.Training_Sweep import sweep_space
+from src.Utils.Walk_Forward import default_results_db, run_walk_forward
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Walk-forward evaluation: train on seasons up to N, predict N+1')
+    parser.add_argument('sport', choices=['NBA', 'NFL'], type=str.upper)
+    parser.add_argument('market', choices=['ML', 'UO'], type=str.upper)
+    parser.add_argument('--min-train-seasons', type=int, default=1, help='Seasons in the first fold\'s training set')
+    parser.add_argument('--max-depth', type=int, help='Overrides config.toml')
+    parser.add_argument('--eta', type=float, help='Overrides config.toml')
+    parser.add_argument('--rounds', type=int, help='Overrides config.toml')
+    parser.add_argument('--workers', type=int, help='Worker processes, defaults to cores / nthread')
+    parser.add_argument('--nthread', type=int, help='XGBoost threads per worker')
+    parser.add_argument('--results-db', default=str(default_results_db), help='sqlite file of the results store')
+    args = parser.parse_args()
+
+    space = sweep_space(args.sport, args.market)
+    for key, value in [('max_depth', args.max_depth), ('eta', args.eta), ('rounds', args.rounds)]:
+        if value is not None:
+            space[key] = [value]
+    folds = run_walk_forward(args.sport, args.market, space, min_train_seasons=args.min_train_seasons,
+                             workers=args.workers, nthread=args.nthread, results_db=args.results_db)
+    print(folds[['fold', 'test_season', 'train_rows', 'test_rows', 'accuracy', 'logloss']].to_string(index=False))
@@ -0,0 +1,259 @@
+import re
+import sqlite3
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from src.Utils.Calibration import calibrate
+from src.Utils.Expected_Value import expected_value_array, payout_array
+from src.Utils.Kelly_Criterion import kelly_criterion_array
+from src.Utils.Model_Registry import load_model, predict_probabilities
+from src.Utils.Training_Data import connect_read_only, load_training_frame, project_root, to_training_matrix
+
+results_table = "backtest_results"
+default_results_db = project_root / "Data" / "Backtests.sqlite"
+
+# Where each sport's historical lines live: one table per season (named by the tables pattern),
+# joined to the dataset on the dataset -> odds column mapping. Games on the same slate are bet together.
+odds_sources = {
+    'NBA': {'database': 'Data/OddsData.sqlite', 'tables': r'odds_\d{4}-\d{2}_new',
+            'join': {'Date': 'Date', 'TEAM_NAME': 'Home', 'TEAM_NAME.1': 'Away'}, 'slate': ['Date']},
+    'NFL': {'database': 'Data/NFLOddsData.sqlite', 'tables': r'\d{4}',
+            'join': {'Season': 'Season', 'Week': 'Week', 'TEAM_NAME': 'Home', 'TEAM_NAME.1': 'Away'},
+            'slate': ['Season', 'Week']},
+}
+
+# Totals are only stored as a line, so both sides are priced at the standard -110
+ou_odds = -110
+
+# Flat bets stake a fixed % of the starting bankroll; Kelly bets stake a share of the Kelly % of the current one
+default_strategies = {
+    'flat': {'kelly': False, 'stake': 1.0, 'compound': False},
+    'kelly': {'kelly': True, 'fraction': 1.0, 'compound': True},
+    'fractional-kelly': {'kelly': True, 'fraction': 0.25, 'compound': True},
+}
+
+
+def load_odds(sport):
+    """Every season table of a sport's odds database, stacked, with the join keys as strings"""
+    source = odds_sources[sport.upper()]
+    con = connect_read_only(project_root / source['database'])
+    try:
+        tables = [name for (name,) in con.execute("select name from sqlite_master where type = 'table'")
+                  if re.fullmatch(source['tables'], name)]
+        keys = list(source['join'].values())
+        frames = [pd.read_sql_query(f"select {', '.join(keys)}, ML_Home, ML_Away, OU as OU_Line from \"{table}\"", con)
+                  for table in sorted(tables)]
+    finally:
+        con.close()
+    if not frames:
+        raise ValueError(f"No {sport} odds tables in {source['database']}")
+    odds = pd.concat(frames, ignore_index=True)
+    odds[keys] = odds[keys].astype(str)
+    return odds.drop_duplicates(keys, keep='last')
+
+
+def join_odds(frame, odds, sport):
+    """The dataset frame with ML_Home, ML_Away and OU_Line of each game, NaN where the game has no line"""
+    join = odds_sources[sport.upper()]['join']
+    keys = frame[list(join)].astype(str).rename(columns=join)
+    lines = keys.merge(odds, on=list(join.values()), how='left', validate='many_to_one')
+    frame = frame.copy()
+    for column in ['ML_Home', 'ML_Away', 'OU_Line']:
+        frame[column] = pd.to_numeric(lines[column], errors='coerce').to_numpy()
+    return frame
+
+
+def predict_games(frame, sport, market, framework='xgboost', calibrated=True):
+    """
+    Class probabilities of every game in one batched call of the registered model, through its calibrator
+    unless calibrated is False. Returns (probabilities, manifest entry).
+    """
+    features, _, _, _ = to_training_matrix(frame, sport, market)
+    model, entry = load_model(framework, sport, market)
+    probabilities = predict_probabilities(model, entry, features)
+    return calibrate(probabilities, entry) if calibrated else probabilities, entry
+
+
+def place_bets(frame, probabilities, market, min_ev=0.0):
+    """
+    The side of each game with the best expected value, when it beats min_ev (per 100 staked) and the game has a line.
+
+    Returns:
+        DataFrame with the game's row position, side, odds, probability, ev and profit per unit staked
+    """
+    if market.upper() == 'ML':
+        odds = frame[['ML_Away', 'ML_Home']].to_numpy(dtype=float)
+        outcome = frame['Home-Team-Win'].to_numpy().astype(int)
+        sides = np.array(['away', 'home'])
+        probs = probabilities[:, :2]
+    else:
+        odds = np.full((len(frame.index), 2), float(ou_odds))
+        odds[frame['OU_Line'].isna().to_numpy()] = np.nan
+        outcome = frame['OU-Cover'].to_numpy().astype(int)
+        sides = np.array(['under', 'over'])
+        probs = probabilities[:, :2]
+    valid = np.isfinite(odds) & (odds != 0)
+    ev = np.where(valid, expected_value_array(probs, np.where(valid, odds, 100)), -np.inf)
+    side = np.argmax(ev, axis=1)
+    rows = np.arange(len(frame.index))
+    best_ev = ev[rows, side]
+    bet = best_ev > min_ev
+
+    rows, side = rows[bet], side[bet]
+    bet_odds = odds[rows, side]
+    won = outcome[rows] == side
+    push = outcome[rows] == 2
+    profit = np.where(won, payout_array(bet_odds) / 100, np.where(push, 0.0, -1.0))
+    return pd.DataFrame({'row': rows, 'side': sides[side], 'odds': bet_odds, 'prob': probs[rows, side],
+                         'ev': best_ev[bet], 'won': won, 'profit': profit})
+
+
+def simulate_bankroll(slates, stake_percent, profit, bankroll=100.0, compound=True):
+    """
+    Bets slate by slate, staking stake_percent of the bankroll at the start of each slate on each of its bets
+    (of the starting bankroll when compound is False). A slate never stakes more than the whole bankroll.
+
+    Args:
+        slates: slate number of each bet, non-decreasing
+    Returns:
+        (stake of each bet, bankroll after each bet's slate)
+    """
+    slates = np.asarray(slates)
+    stake_percent = np.asarray(stake_percent, dtype=float) / 100
+    profit = np.asarray(profit, dtype=float)
+    stakes = np.zeros(len(slates))
+    after = np.zeros(len(slates))
+    initial = bankroll
+    starts = np.flatnonzero(np.r_[True, slates[1:] != slates[:-1]])
+    for start, end in zip(starts, np.r_[starts[1:], len(slates)]):
+        slate_stakes = (bankroll if compound else initial) * stake_percent[start:end]
+        if slate_stakes.sum() > bankroll:
+            slate_stakes *= bankroll / slate_stakes.sum()
+        stakes[start:end] = slate_stakes
+        bankroll = max(bankroll + stakes[start:end] @ profit[start:end], 0.0)
+        after[start:end] = bankroll
+    return stakes, after
+
+
+def _max_drawdown(start, path):
+    path = np.r_[start, path]
+    peaks = np.maximum.accumulate(path)
+    return float(np.max(1 - np.divide(path, peaks, out=np.ones_like(path), where=peaks > 0)) * 100)
+
+
+def summarize(bets, stakes, after, seasons, bankroll):
+    """One row per season and one for the whole run: bets, wins, staked, profit, ROI, bankroll and max drawdown"""
+    profits, wins = bets['profit'].to_numpy(), bets['won'].to_numpy()
+
+    def row(season, index, start):
+        staked = float(stakes[index].sum())
+        profit = float(stakes[index] @ profits[index])
+        return {'season': season, 'bets': len(index), 'wins': int(wins[index].sum()), 'staked': round(staked, 2),
+                'profit': round(profit, 2), 'roi': round(profit / staked * 100, 2) if staked else 0.0,
+                'bankroll': round(float(after[index][-1]) if len(index) else start, 2),
+                'max_drawdown': round(_max_drawdown(start, after[index]), 2)}
+
+    rows = []
+    start = bankroll
+    for season in sorted(set(seasons.tolist())):
+        index = np.flatnonzero(seasons == season)
+        rows.append(row(season, index, start))
+        start = float(after[index][-1])
+    rows.append(row('All', np.arange(len(seasons)), bankroll))
+    return rows
+
+
+def backtest_seasons(entry, seasons=None, in_sample=False):
+    """
+    Seasons to bet and how they relate to the model: (seasons, 'holdout' or 'in-sample').
+    By default these are the holdout seasons the model's sweep kept out of training and selection (its manifest
+    attributes), as betting the seasons it was fitted on overstates ROI. in_sample allows every season.
+    """
+    holdout = [str(season) for season in entry.get('attributes', {}).get('holdout') or []]
+    if seasons is None and not in_sample:
+        if not holdout:
+            raise ValueError(f"Model {entry['id']} records no holdout seasons: pass the seasons to bet, "
+                             f"or opt in to an in-sample backtest of every season")
+        seasons = holdout
+    seasons = None if seasons is None else [str(season) for season in seasons]
+    return seasons, 'holdout' if seasons is not None and set(seasons) <= set(holdout) else 'in-sample'
+
+
+def _append_results(results, results_db):
+    con = sqlite3.connect(results_db)
+    try:
+        # Stores created before a column existed
+        existing = {name for _, name, *_ in con.execute(f"pragma table_info(\"{results_table}\")")}
+        if existing:
+            for column in results.columns:
+                if column not in existing:
+                    con.execute(f"alter table \"{results_table}\" add column \"{column}\"")
+        results.to_sql(results_table, con, if_exists='append', index=False)
+    finally:
+        con.close()
+
+
+def run_backtest(sport, market, framework='xgboost', strategies=None, seasons=None, bankroll=100.0, min_ev=0.0,
+                 cap=None, table=None, calibrated=True, results_db=default_results_db, in_sample=False):
+    """
+    Backtests the registered model of a sport and market over its dataset table: scores every game in one pass,
+    joins the historical lines, bets the best-EV side and simulates each strategy's bankroll.
+
+    Args:
+        strategies: {name: {'kelly': bool, 'stake': % per flat bet, 'fraction': share of Kelly, 'compound': bool}}
+        seasons: only bet games of these seasons, by default the model's holdout seasons, see backtest_seasons
+        cap: largest % of the bankroll on one Kelly bet
+        table: dataset table to read instead of the market's training table
+        calibrated: bet on the model's calibrated probabilities, when it has a calibrator
+        results_db: sqlite file the results rows are appended to, None to skip writing
+        in_sample: bet every season when seasons is None, including those the model was trained on
+    Returns:
+        DataFrame with one row per strategy and season, evaluated_on labelling it holdout or in-sample
+    """
+    sport, market = sport.upper(), market.upper()
+    strategies = default_strategies if strategies is None else strategies
+    _, entry = load_model(framework, sport, market)
+    seasons, evaluated_on = backtest_seasons(entry, seasons, in_sample)
+    frame = load_training_frame(sport, market, table=table)
+    _, _, _, game_seasons = to_training_matrix(frame, sport, market)
+    if seasons is not None:
+        keep = np.isin(game_seasons, seasons)
+        frame, game_seasons = frame[keep].reset_index(drop=True), game_seasons[keep]
+    if frame.empty:
+        raise ValueError(f"No {sport} games to backtest for seasons {seasons}")
+
+    # Slates in chronological order, so bankrolls compound in the order games were played
+    slate_keys = odds_sources[sport]['slate']
+    order = np.lexsort([frame[key].astype(str).to_numpy() if key == 'Date' else frame[key].astype(int).to_numpy()
+                        for key in reversed(slate_keys)])
+    frame, game_seasons = frame.iloc[order].reset_index(drop=True), game_seasons[order]
+    slate_number = frame.groupby(slate_keys, sort=False).ngroup().to_numpy()
+
+    probabilities, entry = predict_games(frame, sport, market, framework, calibrated)
+    frame = join_odds(frame, load_odds(sport), sport)
+    bets = place_bets(frame, probabilities, market, min_ev)
+    bet_rows = bets['row'].to_numpy()
+
+    run_id = f"{sport}-{market}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    results = []
+    for name, strategy in strategies.items():
+        if strategy.get('kelly'):
+            stake_percent = kelly_criterion_array(bets['odds'], bets['prob'], strategy.get('fraction', 1.0), cap)
+        else:
+            stake_percent = np.full(len(bets.index), strategy.get('stake', 1.0))
+        stakes, after = simulate_bankroll(slate_number[bet_rows], stake_percent, bets['profit'], bankroll,
+                                          strategy.get('compound', True))
+        for row in summarize(bets, stakes, after, game_seasons[bet_rows], bankroll):
+            row.update({'run_id': run_id, 'sport': sport, 'market': market, 'model_id': entry['id'], 'strategy': name,
+                        'games': len(frame.index) if row['season'] == 'All'
+                        else int(np.sum(game_seasons == row['season'])), 'evaluated_on': evaluated_on})
+            results.append(row)
+
+    columns = ['run_id', 'sport', 'market', 'model_id', 'strategy', 'season', 'games', 'bets', 'wins', 'staked',
+               'profit', 'roi', 'bankroll', 'max_drawdown', 'evaluated_on']
+    results = pd.DataFrame(results, columns=columns)
+    if results_db is not None:
+        _append_results(results.assign(created_at=datetime.now().isoformat(timespec='seconds')), results_db)
+    return results
@@ -0,0 +1,135 @@
+import json
+import threading
+
+import numpy as np
+
+from src.Utils.Model_Registry import load_model, predict_probabilities, project_root
+from src.Utils.Training_Data import load_training_matrix
+
+methods = ('isotonic', 'platt')
+
+_calibrators = {}
+_lock = threading.Lock()
+
+
+def calibration_path(model_path):
+    """Where a model's calibrator is stored: next to the model, e.g. XGBoost_68.7%_ML-4.calibration.json"""
+    model_path = str(model_path)
+    for suffix in ('.json', '.npz', '.keras'):
+        if model_path.endswith(suffix):
+            model_path = model_path[:-len(suffix)]
+            break
+    return model_path.rstrip('/') + '.calibration.json'
+
+
+def _logit(probabilities):
+    probabilities = np.clip(probabilities, 1e-6, 1 - 1e-6)
+    return np.log(probabilities / (1 - probabilities))
+
+
+class Calibrator:
+    """
+    Maps each class's raw probability to a calibrated one (one-vs-rest), then renormalizes every row.
+    Isotonic maps are stored as interpolation points, Platt maps as a sigmoid over the raw logit, so
+    applying either is a few NumPy operations per class.
+    """
+
+    def __init__(self, method, classes, model_id=None, season=None):
+        if method not in methods:
+            raise ValueError(f"Unknown calibration method {method}, expected one of {methods}")
+        self.method = method
+        self.classes = classes
+        self.model_id = model_id
+        self.season = season
+
+    @classmethod
+    def fit(cls, probabilities, labels, method='isotonic', model_id=None, season=None):
+        probabilities = np.asarray(probabilities, dtype=float)
+        labels = np.asarray(labels)
+        classes = []
+        for label in range(probabilities.shape[1]):
+            raw, target = probabilities[:, label], (labels == label).astype(float)
+            if method == 'isotonic':
+                from sklearn.isotonic import IsotonicRegression
+                isotonic = IsotonicRegression(y_min=0, y_max=1, out_of_bounds='clip').fit(raw, target)
+                classes.append({'x': isotonic.X_thresholds_.tolist(), 'y': isotonic.y_thresholds_.tolist()})
+            else:
+                from sklearn.linear_model import LogisticRegression
+                if target.min() == target.max():
+                    # A class never (or always) seen in the holdout keeps its raw probability
+                    classes.append({'a': 1.0, 'b': 0.0})
+                    continue
+                platt = LogisticRegression(C=1e6).fit(_logit(raw)[:, None], target)
+                classes.append({'a': float(platt.coef_[0, 0]), 'b': float(platt.intercept_[0])})
+        return cls(method, classes, model_id, season)
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as calibration_file:
+            stored = json.load(calibration_file)
+        return cls(stored['method'], stored['classes'], stored.get('model_id'), stored.get('season'))
+
+    def save(self, path):
+        with open(path, 'w') as calibration_file:
+            json.dump({'method': self.method, 'model_id': self.model_id, 'season': self.season,
+                       'classes': self.classes}, calibration_file, indent=2)
+
+    def __call__(self, probabilities):
+        probabilities = np.asarray(probabilities, dtype=float)
+        calibrated = np.empty_like(probabilities)
+        for label, mapping in enumerate(self.classes):
+            if self.method == 'isotonic':
+                calibrated[:, label] = np.interp(probabilities[:, label], mapping['x'], mapping['y'])
+            else:
+                calibrated[:, label] = 1 / (1 + np.exp(-(mapping['a'] * _logit(probabilities[:, label]) + mapping['b'])))
+        totals = calibrated.sum(axis=1, keepdims=True)
+        return np.divide(calibrated, totals, out=probabilities.copy(), where=totals > 0).astype(np.float32)
+
+
+def load_calibrator(entry):
+    """
+    The calibrator stored next to a registered model, loaded once per process, or None when the model has none
+    (or it was fitted for a different model since saved at the same path).
+    """
+    with _lock:
+        if entry['id'] not in _calibrators:
+            calibrator = None
+            path = project_root / calibration_path(entry['path'])
+            if path.exists():
+                calibrator = Calibrator.load(path)
+                if calibrator.model_id not in (None, entry['id']):
+                    print(f"Ignoring {path}: fitted for model {calibrator.model_id}, not {entry['id']}")
+                    calibrator = None
+            _calibrators[entry['id']] = calibrator
+        return _calibrators[entry['id']]
+
+
+def calibrate(probabilities, entry):
+    """Probabilities through the model's calibrator, unchanged when it has none"""
+    calibrator = load_calibrator(entry)
+    return probabilities if calibrator is None else calibrator(probabilities)
+
+
+def fit_model_calibrator(framework, sport, market, season=None, method='isotonic'):
+    """
+    Fits a calibrator for the active model of a sport and market on one holdout season of its dataset and saves it
+    next to the model. The season defaults to the model's registered holdout season, which the season-split sweep
+    kept out of training, early stopping and model selection, and otherwise to the latest season.
+    Returns (calibrator, path).
+    """
+    features, labels, _, seasons = load_training_matrix(sport, market)
+    model, entry = load_model(framework, sport, market)
+    if season is None:
+        holdout = entry.get('attributes', {}).get('holdout') or sorted(set(seasons.tolist()))[-1:]
+        season = holdout[-1]
+    season = str(season)
+    holdout = seasons == season
+    if not holdout.any():
+        raise ValueError(f"No {sport} {market} games in season {season}")
+    probabilities = predict_probabilities(model, entry, features[holdout])
+    calibrator = Calibrator.fit(probabilities, labels[holdout], method, model_id=entry['id'], season=season)
+    path = project_root / calibration_path(entry['path'])
+    calibrator.save(path)
+    with _lock:
+        _calibrators[entry['id']] = calibrator
+    return calibrator, path
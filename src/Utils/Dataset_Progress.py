@@ -0,0 +1,84 @@
+from datetime import datetime
+
+# High-water marks of incrementally built dataset tables, kept in the same sqlite file as the
+# dataset so a table and its marks always travel together.
+progress_table = "dataset_progress"
+
+
+def _ensure_progress_table(con):
+    con.execute(f"create table if not exists \"{progress_table}\" "
+                f"(dataset text not null, season text not null, high_water, updated_at text, "
+                f"primary key (dataset, season))")
+
+
+def _plain(value):
+    return value.item() if hasattr(value, 'item') else value
+
+
+def _table_exists(con, table):
+    return con.execute("select 1 from sqlite_master where type = 'table' and name = ?", [table]).fetchone() is not None
+
+
+def get_high_water(con, dataset, season):
+    """Last processed Date/Week of a season in a dataset table, or None if never processed"""
+    _ensure_progress_table(con)
+    row = con.execute(f"select high_water from \"{progress_table}\" where dataset = ? and season = ?",
+                      [dataset, str(season)]).fetchone()
+    return None if row is None else row[0]
+
+
+def set_high_water(con, dataset, season, high_water):
+    _ensure_progress_table(con)
+    con.execute(f"insert or replace into \"{progress_table}\" (dataset, season, high_water, updated_at) values (?, ?, ?, ?)",
+                [dataset, str(season), _plain(high_water), datetime.now().isoformat(timespec='seconds')])
+    con.commit()
+
+
+def clear_high_water(con, dataset):
+    """Forgets every season's mark of a dataset table, as when the table is rebuilt"""
+    _ensure_progress_table(con)
+    con.execute(f"delete from \"{progress_table}\" where dataset = ?", [dataset])
+    con.commit()
+
+
+def append_since_high_water(con, dataset, season, frame, mark_column, season_column=None, index_label=None):
+    """
+    Appends the rows of frame past the season's high-water mark to the dataset table, then advances the mark.
+    Rows already written past the mark by an interrupted run are deleted first, so re-running is idempotent.
+
+    Args:
+        mark_column: column the mark tracks (e.g. 'Date' or 'Week'), compared with > and <=
+        season_column: column identifying the season in the table, when the mark alone does not
+        index_label: write a running integer index under this name, as DataFrame.to_sql(index=True) would
+    Returns:
+        number of rows appended
+    """
+    high_water = get_high_water(con, dataset, season)
+    if high_water is not None:
+        frame = frame[frame[mark_column] > high_water]
+    if frame.empty:
+        return 0
+
+    new_high_water = _plain(frame[mark_column].max())
+    if _table_exists(con, dataset):
+        conditions = [f"\"{mark_column}\" <= ?"]
+        params = [new_high_water]
+        if high_water is None:
+            conditions.append(f"\"{mark_column}\" >= ?")
+            params.append(_plain(frame[mark_column].min()))
+        else:
+            conditions.append(f"\"{mark_column}\" > ?")
+            params.append(high_water)
+        if season_column is not None:
+            conditions.append(f"\"{season_column}\" = ?")
+            params.append(str(season))
+        con.execute(f"delete from \"{dataset}\" where {' and '.join(conditions)}", params)
+        if index_label is not None:
+            next_index = con.execute(f"select coalesce(max(\"{index_label}\") + 1, 0) from \"{dataset}\"").fetchone()[0]
+            frame = frame.set_axis(range(next_index, next_index + len(frame.index)))
+    elif index_label is not None:
+        frame = frame.reset_index(drop=True)
+
+    frame.to_sql(dataset, con, if_exists="append", index=index_label is not None, index_label=index_label)
+    set_high_water(con, dataset, season, new_high_water)
+    return len(frame.index)
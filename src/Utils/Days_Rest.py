@@ -0,0 +1,42 @@
+import numpy as np
+import pandas as pd
+
+
+def season_dates(date_strings):
+    """
+    Vectorized form of the odds tables' date parsing: 'YYYY-YY-MMDD' style strings
+    (season start year, then month and day) to datetimes, rolling months before September into the next year.
+    """
+    parts = pd.Series(date_strings).astype(str).str.extract(r'(\d+)-\d+-(\d\d)(\d\d)').astype(int)
+    year = parts[0] + (parts[1] <= 8)
+    return pd.to_datetime(pd.DataFrame({'year': year, 'month': parts[1], 'day': parts[2]}))
+
+
+def team_days_rest(dates, home_teams, away_teams, first_game=10, max_rest=9):
+    """
+    Days since each team's previous appearance, for every game in the order given.
+
+    Home and away appearances are stacked into one long team-date frame and differenced per team,
+    so a game is compared with the team's previous row, not its previous date.
+
+    Args:
+        dates: game dates, anything pd.to_datetime accepts
+        first_game: rest assigned to a team's first appearance
+        max_rest: rest of at least this many days (or not positive) is reported as max_rest; None leaves rest uncapped
+    Returns:
+        (home_rest, away_rest) integer arrays aligned with the input games
+    """
+    dates = pd.to_datetime(pd.Series(dates)).dt.normalize().to_numpy()
+    games = len(dates)
+    # Interleave home then away per game, matching the order the per-row loops visited teams in
+    appearances = pd.DataFrame({
+        'team': np.column_stack([np.asarray(home_teams, dtype=object), np.asarray(away_teams, dtype=object)]).ravel(),
+        'date': np.repeat(dates, 2),
+    })
+    rest = appearances.groupby('team', sort=False)['date'].diff().dt.days.to_numpy()
+    first = np.isnan(rest)
+    if max_rest is not None:
+        rest = np.where((rest > 0) & (rest < max_rest), rest, max_rest)
+    rest = np.where(first, first_game, rest).astype(int).reshape(games, 2)
+    return rest[:, 0], rest[:, 1]
+
@@ -0,0 +1,171 @@
+import os
+
+import numpy as np
+
+# The NN models are plain stacks of Dense layers; Flatten and Dropout do nothing at inference
+passthrough_layers = {'Flatten', 'Dropout', 'InputLayer'}
+
+
+def _softmax(x):
+    exp = np.exp(x - x.max(axis=-1, keepdims=True))
+    return exp / exp.sum(axis=-1, keepdims=True)
+
+
+activations = {
+    'linear': lambda x: x,
+    'relu': lambda x: np.maximum(x, 0),
+    'relu6': lambda x: np.clip(x, 0, 6),
+    'sigmoid': lambda x: 1 / (1 + np.exp(-x)),
+    'tanh': np.tanh,
+    'softmax': _softmax,
+}
+
+
+def _activation_name(activation):
+    # Keras activations and their tf.nn counterparts, e.g. tf.nn.softmax is named softmax_v2
+    name = getattr(activation, '__name__', str(activation))
+    name = name[:-len('_v2')] if name.endswith('_v2') else name
+    if name not in activations:
+        raise ValueError(f"Unsupported activation {name}, expected one of {sorted(activations)}")
+    return name
+
+
+class DenseNetwork:
+    """
+    Forward pass of a stack of Dense layers with NumPy matmuls.
+
+    Args:
+        layers: list of (kernel, bias or None, activation name)
+    """
+
+    def __init__(self, layers):
+        self.layers = [(np.asarray(kernel, dtype=np.float32), None if bias is None else np.asarray(bias, dtype=np.float32),
+                        activation) for kernel, bias, activation in layers]
+
+    @property
+    def num_features(self):
+        return self.layers[0][0].shape[0]
+
+    @classmethod
+    def from_keras(cls, model):
+        layers = []
+        for layer in model.layers:
+            kind = type(layer).__name__
+            if kind in passthrough_layers:
+                continue
+            if kind != 'Dense':
+                raise ValueError(f"Cannot export {kind} layer {layer.name}, only Dense networks are supported")
+            weights = layer.get_weights()
+            layers.append((weights[0], weights[1] if len(weights) > 1 else None, _activation_name(layer.activation)))
+        return cls(layers)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as archive:
+            return cls([(archive[f'kernel_{i}'], archive[f'bias_{i}'] if f'bias_{i}' in archive else None, str(activation))
+                        for i, activation in enumerate(archive['activations'])])
+
+    def save(self, path):
+        arrays = {'activations': np.array([activation for _, _, activation in self.layers])}
+        for i, (kernel, bias, _) in enumerate(self.layers):
+            arrays[f'kernel_{i}'] = kernel
+            if bias is not None:
+                arrays[f'bias_{i}'] = bias
+        with open(path, 'wb') as network_file:
+            np.savez(network_file, **arrays)
+
+    def save_onnx(self, path):
+        """Writes the network as an ONNX graph; needs the optional onnx package"""
+        from onnx import TensorProto, helper, numpy_helper, save_model
+
+        nodes, initializers = [], []
+        output = 'input'
+        for i, (kernel, bias, activation) in enumerate(self.layers):
+            initializers.append(numpy_helper.from_array(kernel, f'kernel_{i}'))
+            nodes.append(helper.make_node('MatMul', [output, f'kernel_{i}'], [f'matmul_{i}']))
+            output = f'matmul_{i}'
+            if bias is not None:
+                initializers.append(numpy_helper.from_array(bias, f'bias_{i}'))
+                nodes.append(helper.make_node('Add', [output, f'bias_{i}'], [f'dense_{i}']))
+                output = f'dense_{i}'
+            if activation == 'relu6':
+                initializers += [numpy_helper.from_array(np.float32(0), f'min_{i}'),
+                                 numpy_helper.from_array(np.float32(6), f'max_{i}')]
+                nodes.append(helper.make_node('Clip', [output, f'min_{i}', f'max_{i}'], [f'activation_{i}']))
+            elif activation != 'linear':
+                operator = {'relu': 'Relu', 'sigmoid': 'Sigmoid', 'tanh': 'Tanh', 'softmax': 'Softmax'}[activation]
+                nodes.append(helper.make_node(operator, [output], [f'activation_{i}']))
+            else:
+                continue
+            output = f'activation_{i}'
+        graph = helper.make_graph(
+            nodes, 'dense_network',
+            [helper.make_tensor_value_info('input', TensorProto.FLOAT, [None, self.num_features])],
+            [helper.make_tensor_value_info(output, TensorProto.FLOAT, [None, self.layers[-1][0].shape[1]])],
+            initializers)
+        save_model(helper.make_model(graph, opset_imports=[helper.make_opsetid('', 13)]), path)
+
+    def __call__(self, x):
+        x = np.asarray(x, dtype=np.float32)
+        for kernel, bias, activation in self.layers:
+            x = x @ kernel
+            if bias is not None:
+                x += bias
+            x = activations[activation](x)
+        return x
+
+
+class OnnxNetwork:
+    """An exported network evaluated by onnxruntime"""
+
+    def __init__(self, path):
+        import onnxruntime
+
+        self.session = onnxruntime.InferenceSession(str(path), providers=['CPUExecutionProvider'])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def __call__(self, x):
+        return self.session.run(None, {self.input_name: np.asarray(x, dtype=np.float32)})[0]
+
+
+def export_keras_model(model, path, onnx=True):
+    """
+    Writes a trained Keras Dense network's weights to path (.npz), plus an .onnx graph next to it when
+    onnx is installed. Returns the exported DenseNetwork.
+    """
+    network = DenseNetwork.from_keras(model)
+    network.save(path)
+    if onnx:
+        try:
+            network.save_onnx(os.path.splitext(path)[0] + '.onnx')
+        except ImportError:
+            pass
+    return network
+
+
+def load_network(path):
+    """
+    A callable scoring a float matrix with an exported network: onnxruntime when it is installed and
+    an .onnx graph was exported next to the weights, NumPy otherwise.
+    """
+    onnx_path = os.path.splitext(path)[0] + '.onnx'
+    if os.path.exists(onnx_path):
+        try:
+            return OnnxNetwork(onnx_path)
+        except ImportError:
+            pass
+    return DenseNetwork.load(path)
+
+
+def export_checkpoint(checkpoint_path, sport, market, metrics=None):
+    """
+    Exports a saved Keras checkpoint next to itself (same name, .npz) and registers the export as the
+    'dense' model of its sport and market, which the NN runners prefer over the Keras model.
+    """
+    from keras.models import load_model
+
+    from src.Utils.Model_Registry import register_model
+
+    network_path = str(checkpoint_path).removesuffix('.keras') + '.npz'
+    network = export_keras_model(load_model(str(checkpoint_path)), network_path)
+    return register_model('dense', sport, market, network_path, num_features=network.num_features, metrics=metrics)
@@ -1,11 +1,36 @@
+import numpy as np
+
+
+def python_round(values, decimals=2):
+    """
+    np.round, but matching Python's round() where they differ: np.round scales by 10**decimals first,
+    so a value stored just below a half (22.055 is 22.05499...) can round up after scaling.
+    """
+    values = np.asarray(values, dtype=float)
+    flat = np.atleast_1d(values)
+    rounded = np.round(flat, decimals)
+    scaled = flat * 10 ** decimals
+    for i in np.flatnonzero(np.abs(scaled - np.trunc(scaled)) == 0.5):
+        rounded[i] = round(float(flat[i]), decimals)
+    return rounded.reshape(values.shape)
+
+
+def payout_array(odds):
+    """Profit of a winning 100 unit bet, for an array of American odds"""
+    odds = np.asarray(odds, dtype=float)
+    negative = odds < 0
+    return np.where(negative, 100 / np.where(negative, -odds, 1) * 100, odds)
+
+
+def expected_value_array(Pwin, odds):
+    """Expected profit of a 100 unit bet, for arrays of win probabilities and American odds"""
+    Pwin = np.asarray(Pwin, dtype=float)
+    return python_round(Pwin * payout_array(odds) - (1 - Pwin) * 100, 2)
+
+
 def expected_value(Pwin, odds):
-    Ploss = 1 - Pwin
-    Mwin = payout(odds)
-    return round((Pwin * Mwin) - (Ploss * 100), 2)
+    return float(expected_value_array(Pwin, odds))
 
 
 def payout(odds):
-    if odds > 0:
-        return odds
-    else:
-        return (100 / (-1 * odds)) * 100
+    return float(payout_array(odds))
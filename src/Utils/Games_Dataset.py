@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from src.Utils.Dictionaries import team_index_07, team_index_08, team_index_12, team_index_13, team_index_14, \
+    team_index_current
+
+label_columns = ['Score', 'Home-Team-Win', 'OU', 'OU-Cover', 'Days-Rest-Home', 'Days-Rest-Away']
+
+
+def season_team_index(season):
+    """Team name to row position in that season's daily team stats tables"""
+    if season == '2007-08':
+        return team_index_07
+    if season in ('2008-09', '2009-10', '2010-11', '2011-12'):
+        return team_index_08
+    if season == '2012-13':
+        return team_index_12
+    if season == '2013-14':
+        return team_index_13
+    if season in ('2022-23', '2023-24'):
+        return team_index_current
+    return team_index_14
+
+
+def build_season_games(odds_df, season_stats, season):
+    """
+    Joins a season's odds rows to the home and away team stats of the same date.
+
+    Args:
+        odds_df: odds_<season>_new table (Date, Home, Away, OU, ..., Points, Win_Margin, Days_Rest_Home, Days_Rest_Away)
+        season_stats: Team_Data_Store.load_season output for the season
+    Returns:
+        DataFrame with home stats, away stats suffixed '.1' and the label columns, one row per game
+        on a date with a full 30-team stats table, in odds order
+    """
+    team_columns = [col for col in season_stats.columns if col not in ('Season', 'TEAM_INDEX')]
+    teams_per_date = season_stats.groupby('Date')['TEAM_INDEX'].transform('size')
+    stats = season_stats[teams_per_date == 30]
+
+    odds = odds_df[odds_df['Date'].isin(stats['Date'])].reset_index(drop=True)
+    team_index = season_team_index(season)
+    home_index = odds['Home'].map(team_index)
+    away_index = odds['Away'].map(team_index)
+    unknown = odds.loc[home_index.isna(), 'Home'].tolist() + odds.loc[away_index.isna(), 'Away'].tolist()
+    if unknown:
+        raise KeyError(f"Teams missing from the {season} team index: {sorted(set(unknown))}")
+
+    home = pd.DataFrame({'Date': odds['Date'], 'TEAM_INDEX': home_index.astype(int)}).merge(
+        stats, on=['Date', 'TEAM_INDEX'], how='left', validate='many_to_one')
+    away = pd.DataFrame({'Date': odds['Date'], 'TEAM_INDEX': away_index.astype(int)}).merge(
+        stats, on=['Date', 'TEAM_INDEX'], how='left', validate='many_to_one')
+
+    frame = pd.concat([home[team_columns],
+                       away[team_columns].rename(columns={col: f"{col}.1" for col in team_columns})], axis=1)
+
+    points = odds['Points'].to_numpy()
+    total = odds['OU'].to_numpy()
+    frame['Score'] = points
+    frame['Home-Team-Win'] = (odds['Win_Margin'].to_numpy() > 0).astype(int)
+    frame['OU'] = total
+    frame['OU-Cover'] = np.select([points < total, points > total], [0, 1], default=2)
+    frame['Days-Rest-Home'] = odds['Days_Rest_Home'].to_numpy()
+    frame['Days-Rest-Away'] = odds['Days_Rest_Away'].to_numpy()
+    return frame
+
+
+def finalize_games(frame):
+    """Drops team ids and casts every stats and label column to float, as the dataset table expects"""
+    frame = frame.drop(columns=['TEAM_ID', 'TEAM_ID.1'])
+    for field in frame.columns.values:
+        if 'TEAM_' in field or 'Date' in field:
+            continue
+        frame[field] = frame[field].astype(float)
+    return frame
@@ -0,0 +1,129 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Seconds a cached response is served without touching the network, by URL prefix (scheme stripped).
+# Past its TTL an entry is revalidated with ETag / If-Modified-Since when the server provided them.
+endpoint_ttls = {
+    'stats.nba.com/stats/leaguedashteamstats': 6 * 60 * 60,
+    'data.nba.com/data/10s/v2015/json/mobile_teams/nba/': 5 * 60,
+    'www.thesportsdb.com/api/v1/json/': 12 * 60 * 60,
+}
+default_ttl = 0
+
+default_cache_dir = Path(__file__).parent.parent.parent / "Data" / "http-cache"
+
+
+def ttl_for(url):
+    """TTL of the longest endpoint prefix matching the URL, or default_ttl"""
+    address = url.split('://', 1)[-1]
+    matches = [prefix for prefix in endpoint_ttls if address.startswith(prefix)]
+    return endpoint_ttls[max(matches, key=len)] if matches else default_ttl
+
+
+def _retrying_session(retries, backoff_factor, pool_size):
+    retry = Retry(total=retries, backoff_factor=backoff_factor, status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=frozenset(['GET']), respect_retry_after_header=True)
+    adapter = HTTPAdapter(max_retries=retry, pool_connections=pool_size, pool_maxsize=pool_size)
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+class CachedFetcher:
+    """
+    GETs through a keep-alive requests.Session per thread (retrying with backoff) and an on-disk cache.
+
+    Bodies are stored once under the sha256 of their content (objects/), and each URL + headers
+    request has a small entry (entries/) pointing at its current body with the validators to revalidate it.
+    """
+
+    def __init__(self, cache_dir=default_cache_dir, retries=3, backoff_factor=0.5, pool_size=8):
+        self.cache_dir = Path(cache_dir)
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.pool_size = pool_size
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = self._local.session = _retrying_session(self.retries, self.backoff_factor, self.pool_size)
+        return session
+
+    def _entry_path(self, url, headers):
+        key = hashlib.sha256(json.dumps([url, sorted((headers or {}).items())]).encode()).hexdigest()
+        return self.cache_dir / "entries" / f"{key}.json"
+
+    def _object_path(self, digest):
+        return self.cache_dir / "objects" / digest[:2] / digest
+
+    def _write_atomic(self, path, content):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        descriptor, temp_path = tempfile.mkstemp(dir=path.parent)
+        with os.fdopen(descriptor, 'wb') as temp_file:
+            temp_file.write(content)
+        os.replace(temp_path, path)
+
+    def _read_entry(self, entry_path):
+        try:
+            entry = json.loads(entry_path.read_text())
+            return entry, self._object_path(entry['sha256']).read_bytes()
+        except (OSError, ValueError, KeyError):
+            return None, None
+
+    def _store(self, entry_path, url, response):
+        digest = hashlib.sha256(response.content).hexdigest()
+        object_path = self._object_path(digest)
+        if not object_path.exists():
+            self._write_atomic(object_path, response.content)
+        entry = {'url': url, 'sha256': digest, 'fetched_at': time.time(),
+                 'etag': response.headers.get('ETag'), 'last_modified': response.headers.get('Last-Modified')}
+        self._write_atomic(entry_path, json.dumps(entry).encode())
+
+    def get(self, url, headers=None, timeout=10, ttl=None):
+        """
+        Response body of a GET, from the cache while fresh (no network I/O at all), revalidated once stale.
+        Raises the requests exceptions of a failed fetch, and HTTPError for non-2xx statuses.
+        """
+        ttl = ttl_for(url) if ttl is None else ttl
+        entry_path = self._entry_path(url, headers)
+        entry, body = self._read_entry(entry_path)
+        if entry is not None and time.time() - entry['fetched_at'] < ttl:
+            return body
+
+        request_headers = dict(headers or {})
+        if entry is not None:
+            if entry.get('etag'):
+                request_headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                request_headers['If-Modified-Since'] = entry['last_modified']
+        response = self.session.get(url, headers=request_headers, timeout=timeout)
+        if response.status_code == 304 and entry is not None:
+            entry['fetched_at'] = time.time()
+            self._write_atomic(entry_path, json.dumps(entry).encode())
+            return body
+        response.raise_for_status()
+        self._store(entry_path, url, response)
+        return response.content
+
+    def get_json(self, url, headers=None, timeout=10, ttl=None):
+        return json.loads(self.get(url, headers=headers, timeout=timeout, ttl=ttl))
+
+
+fetcher = CachedFetcher()
+
+
+def get_json(url, headers=None, timeout=10, ttl=None):
+    """Parsed JSON of a GET through the shared session pool and response cache"""
+    return fetcher.get_json(url, headers=headers, timeout=timeout, ttl=ttl)
@@ -1,17 +1,41 @@
+import numpy as np
+
+from src.Utils.Expected_Value import python_round
+
+
+def american_to_decimal_array(american_odds):
+    """
+    Converts arrays of American odds to decimal odds (European odds), as profit per unit staked.
+    """
+    american_odds = np.asarray(american_odds, dtype=float)
+    positive = american_odds >= 100
+    decimal_odds = np.where(positive, american_odds / 100, 100 / np.abs(np.where(positive, 1, american_odds)))
+    return python_round(decimal_odds, 2)
+
+
+def kelly_criterion_array(american_odds, model_prob, fraction=1.0, cap=None):
+    """
+    Percentage of the bankroll to wager on each bet, for arrays of American odds and win probabilities.
+
+    Args:
+        fraction: share of the full Kelly stake to bet, e.g. 0.5 for half Kelly
+        cap: largest percentage of the bankroll to put on a single bet
+    """
+    decimal_odds = american_to_decimal_array(american_odds)
+    model_prob = np.asarray(model_prob, dtype=float)
+    bankroll_fraction = fraction * 100 * (decimal_odds * model_prob - (1 - model_prob)) / decimal_odds
+    return python_round(np.clip(bankroll_fraction, 0, cap), 2)
+
+
 def american_to_decimal(american_odds):
     """
     Converts American odds to decimal odds (European odds).
     """
-    if american_odds >= 100:
-        decimal_odds = (american_odds / 100)
-    else:
-        decimal_odds = (100 / abs(american_odds))
-    return round(decimal_odds, 2)
+    return float(american_to_decimal_array(american_odds))
 
-def calculate_kelly_criterion(american_odds, model_prob):
+def calculate_kelly_criterion(american_odds, model_prob, fraction=1.0, cap=None):
     """
     Calculates the fraction of the bankroll to be wagered on each bet
     """
-    decimal_odds = american_to_decimal(american_odds)
-    bankroll_fraction = round((100 * (decimal_odds * model_prob - (1 - model_prob))) / decimal_odds, 2)
-    return bankroll_fraction if bankroll_fraction > 0 else 0
\ No newline at end of file
+    bankroll_fraction = float(kelly_criterion_array(american_odds, model_prob, fraction, cap))
+    return bankroll_fraction if bankroll_fraction > 0 else 0
@@ -0,0 +1,138 @@
+import json
+import os
+import tempfile
+import threading
+from datetime import datetime
+
+import numpy as np
+
+from src.Utils.Normalize import normalize
+from src.Utils.Training_Data import project_root
+
+# Models/manifest.json lists every trained model with what it was trained on and how it scored.
+# One entry per (framework, sport, market) is active; runners load that one, never by globbing filenames.
+manifest_path = project_root / "Models" / "manifest.json"
+
+_loaded = {}
+_lock = threading.Lock()
+
+
+def read_manifest(path=manifest_path):
+    try:
+        with open(path) as manifest_file:
+            return json.load(manifest_file)
+    except FileNotFoundError:
+        return {'models': []}
+
+
+def _write_manifest(manifest, path):
+    descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.json')
+    with os.fdopen(descriptor, 'w') as temp_file:
+        json.dump(manifest, temp_file, indent=2)
+        temp_file.write('\n')
+    os.replace(temp_path, path)
+
+
+def _key(framework, sport, market):
+    return framework.lower(), sport.upper(), market.upper()
+
+
+def register_model(framework, sport, market, path, features=None, num_features=None, dataset=None, metrics=None,
+                   attributes=None, activate=True, manifest=manifest_path):
+    """
+    Adds a trained model to the manifest and, by default, makes it the active one of its framework, sport and market.
+
+    Args:
+        framework: 'xgboost', 'keras', or 'dense' (a Keras network exported by Dense_Network)
+        path: model file or directory, stored relative to the project root
+        features: feature column names, in training order
+        dataset: dataset fingerprint the model was trained on (Training_Data.dataset_fingerprint)
+        metrics: e.g. {'accuracy': 68.7, 'logloss': 0.61}
+    Returns:
+        the new manifest entry
+    """
+    framework, sport, market = _key(framework, sport, market)
+    path = os.path.relpath(os.path.abspath(path), project_root)
+    entry = {
+        'id': f"{framework}-{sport}-{market}-{datetime.now().strftime('%Y%m%d%H%M%S%f')}".lower(),
+        'framework': framework,
+        'sport': sport,
+        'market': market,
+        'path': path,
+        'features': features,
+        'num_features': num_features if num_features is not None or features is None else len(features),
+        'dataset': dataset,
+        'metrics': metrics or {},
+        'attributes': attributes or {},
+        'created_at': datetime.now().isoformat(timespec='seconds'),
+        'active': activate,
+    }
+    with _lock:
+        data = read_manifest(manifest)
+        for other in data['models']:
+            if activate and _key(other['framework'], other['sport'], other['market']) == (framework, sport, market):
+                other['active'] = False
+        data['models'].append(entry)
+        _write_manifest(data, manifest)
+    return entry
+
+
+def active_entry(framework, sport, market, manifest=manifest_path):
+    """Manifest entry of the active model; raises LookupError if there is none"""
+    key = _key(framework, sport, market)
+    for entry in read_manifest(manifest)['models']:
+        if entry.get('active') and _key(entry['framework'], entry['sport'], entry['market']) == key:
+            return entry
+    raise LookupError(f"No active {key[0]} {key[1]} {key[2]} model in {manifest}, train and register one first")
+
+
+def _load(entry):
+    path = project_root / entry['path']
+    if not path.exists():
+        raise FileNotFoundError(f"Model {entry['id']} is registered at {entry['path']} but that path does not exist")
+    if entry['framework'] == 'xgboost':
+        import xgboost as xgb
+        booster = xgb.Booster()
+        booster.load_model(str(path))
+        if entry.get('num_features') is not None and booster.num_features() != entry['num_features']:
+            raise ValueError(f"Model {entry['id']} has {booster.num_features()} features, "
+                             f"the manifest says {entry['num_features']}")
+        return booster
+    if entry['framework'] == 'keras':
+        from keras.models import load_model as load_keras_model
+        return load_keras_model(str(path))
+    if entry['framework'] == 'dense':
+        from src.Utils.Dense_Network import load_network
+        return load_network(str(path))
+    raise ValueError(f"Unknown model framework {entry['framework']} for {entry['id']}")
+
+
+def load_model(framework, sport, market, manifest=manifest_path):
+    """
+    The active model of a framework, sport and market, resolved and loaded once per process.
+    Returns (model, manifest entry).
+    """
+    key = (str(manifest),) + _key(framework, sport, market)
+    with _lock:
+        if key not in _loaded:
+            entry = active_entry(framework, sport, market, manifest)
+            _loaded[key] = (_load(entry), entry)
+        return _loaded[key]
+
+
+def check_features(entry, data):
+    """Raises ValueError when a feature matrix does not have the width the model was trained on"""
+    if entry.get('num_features') is not None and data.shape[1] != entry['num_features']:
+        raise ValueError(f"Model {entry['id']} expects {entry['num_features']} features, got {data.shape[1]}")
+
+
+def predict_probabilities(model, entry, features):
+    """Class probabilities of a dataset feature matrix in one batched call, whatever the model's framework"""
+    check_features(entry, features)
+    if entry['framework'] == 'xgboost':
+        return model.inplace_predict(np.ascontiguousarray(features, dtype=np.float32))
+    # The NN models were trained on row-normalized features
+    features = normalize(features, axis=1)
+    if entry['framework'] == 'keras':
+        return model.predict(features, batch_size=len(features), verbose=0)
+    return model(features)
@@ -0,0 +1,12 @@
+import numpy as np
+
+
+def normalize(x, axis=-1, order=2):
+    """
+    Scales each slice of x along axis to unit norm, as tf.keras.utils.normalize does, in NumPy so callers
+    don't need TensorFlow. Zero-norm slices are left unchanged.
+    """
+    x = np.asarray(x, dtype=float)
+    norm = np.atleast_1d(np.linalg.norm(x, order, axis))
+    norm[norm == 0] = 1
+    return x / np.expand_dims(norm, axis)
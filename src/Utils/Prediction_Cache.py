@@ -0,0 +1,131 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+import numpy as np
+
+from src.Utils.Training_Data import project_root
+
+default_cache_db = project_root / "Data" / "PredictionCache.sqlite"
+
+
+def row_digests(data):
+    """
+    Hash of each feature row. A row holds both teams' stats and days rest, plus the total line for UO models,
+    so equal digests mean the model would see exactly the same input.
+    """
+    rows = np.ascontiguousarray(data, dtype=np.float64)
+    return [hashlib.blake2b(row.tobytes(), digest_size=16).hexdigest() for row in rows]
+
+
+class PredictionCache(ABC):
+    """
+    The probability stage of a slate, cached per (model version, feature row). Only rows missing from the
+    cache are scored, so an odds refresh that keeps stats, rest and totals unchanged runs no inference.
+    Subclasses store the probabilities.
+    """
+
+    @abstractmethod
+    def get_many(self, model_id, digests):
+        """{digest: probabilities} of the digests stored for model_id"""
+
+    @abstractmethod
+    def put_many(self, model_id, probabilities_by_digest):
+        """Stores {digest: probabilities} for model_id"""
+
+    def probabilities(self, model_id, data, predict):
+        """
+        Probabilities of every row of data, from the cache where present and from predict (called once, on the
+        missing rows only) otherwise.
+        """
+        digests = row_digests(data)
+        cached = self.get_many(model_id, digests)
+        missing = [position for position, digest in enumerate(digests) if digest not in cached]
+        if missing:
+            predicted = np.asarray(predict(np.asarray(data)[missing]))
+            fresh = {digests[position]: row for position, row in zip(missing, predicted)}
+            self.put_many(model_id, fresh)
+            cached.update(fresh)
+        return np.stack([cached[digest] for digest in digests])
+
+
+class MemoryPredictionCache(PredictionCache):
+    """In-process cache for long-running servers, evicting the least recently used rows past max_entries"""
+
+    def __init__(self, max_entries=10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_many(self, model_id, digests):
+        found = {}
+        with self._lock:
+            for digest in digests:
+                key = (model_id, digest)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    found[digest] = self._entries[key]
+        return found
+
+    def put_many(self, model_id, probabilities_by_digest):
+        with self._lock:
+            for digest, probabilities in probabilities_by_digest.items():
+                self._entries[(model_id, digest)] = probabilities
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class SqlitePredictionCache(PredictionCache):
+    """On-disk cache shared by CLI runs, dropping rows older than max_age_days when opened"""
+
+    table = "prediction_cache"
+
+    def __init__(self, path=default_cache_db, max_age_days=7):
+        self.path = path
+        con = self._connect()
+        try:
+            with con:
+                con.execute(f"create table if not exists {self.table} (model_id text not null, row_hash text not null, "
+                            f"probabilities blob not null, created_at real not null, primary key (model_id, row_hash))")
+                con.execute(f"delete from {self.table} where created_at < ?", [time.time() - max_age_days * 86400])
+        finally:
+            con.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def get_many(self, model_id, digests):
+        con = self._connect()
+        try:
+            rows = con.execute(f"select row_hash, probabilities from {self.table} where model_id = ? "
+                               f"and row_hash in ({', '.join('?' * len(digests))})", [model_id, *digests]).fetchall()
+        finally:
+            con.close()
+        return {digest: np.frombuffer(blob, dtype=np.float32) for digest, blob in rows}
+
+    def put_many(self, model_id, probabilities_by_digest):
+        con = self._connect()
+        try:
+            with con:
+                con.executemany(f"insert or replace into {self.table} values (?, ?, ?, ?)",
+                                [(model_id, digest, np.asarray(probabilities, dtype=np.float32).tobytes(), time.time())
+                                 for digest, probabilities in probabilities_by_digest.items()])
+        finally:
+            con.close()
+
+
+# Servers keep the in-memory default; the CLI switches to sqlite so separate runs share it
+prediction_cache = MemoryPredictionCache()
+
+
+def set_prediction_cache(cache):
+    global prediction_cache
+    prediction_cache = cache
+
+
+def cached_probabilities(model_id, data, predict):
+    """Probabilities of data's rows through the process's prediction cache"""
+    return prediction_cache.probabilities(model_id, data, predict)
@@ -0,0 +1,107 @@
+import os
+from bisect import bisect_left
+
+import numpy as np
+import pandas as pd
+
+# Per-team sorted game days of a season schedule CSV, built once per process and cached on disk
+# next to the CSV, keyed by its modification time. Days are held as plain ints (days since the epoch)
+# so a lookup is a bisect over a Python list.
+_mtime_key = '__mtime_ns__'
+_version_key = '__version__'
+_version = 2
+_indexes = {}
+
+# The schedule CSVs are dated in UTC, where most evening tip-offs fall on the next day. Game days are the
+# US Eastern date instead, the calendar the odds tables (and so the training data's days rest) use.
+schedule_timezone = 'America/New_York'
+
+
+def _cache_path(csv_path):
+    directory, name = os.path.split(csv_path)
+    return os.path.join(directory, f".{os.path.splitext(name)[0]}.schedule.npz")
+
+
+def _local_days(timestamps):
+    """Days since the epoch of the US Eastern date of each timestamp, naive timestamps being UTC"""
+    timestamps = pd.to_datetime(pd.Series(timestamps))
+    if timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize('UTC')
+    return timestamps.dt.tz_convert(schedule_timezone).dt.tz_localize(None).to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+
+def build_schedule_index(schedule_df):
+    """Team name to sorted unique int64 array of the US Eastern days (since the epoch) it plays, home or away"""
+    days = _local_days(schedule_df['Date'])
+    appearances = pd.DataFrame({
+        'team': np.concatenate([schedule_df['Home Team'].to_numpy(dtype=object), schedule_df['Away Team'].to_numpy(dtype=object)]),
+        'day': np.concatenate([days, days]),
+    })
+    return {team: np.unique(group.to_numpy(dtype=np.int64)) for team, group in appearances.groupby('team')['day']}
+
+
+def load_schedule_index(csv_path):
+    """
+    Schedule index of a 'Date', 'Home Team', 'Away Team' schedule CSV (UTC dates as %d/%m/%Y %H:%M),
+    as team name to sorted list of US Eastern game days since the epoch.
+    Memoized per process and reused from the on-disk cache until the CSV changes.
+    Raises FileNotFoundError if the CSV does not exist.
+    """
+    mtime = os.stat(csv_path).st_mtime_ns
+    memo = _indexes.get(csv_path)
+    if memo is not None and memo[0] == mtime:
+        return memo[1]
+
+    cache_path = _cache_path(csv_path)
+    index = None
+    try:
+        with np.load(cache_path, allow_pickle=False) as cached:
+            if int(cached[_mtime_key]) == mtime and _version_key in cached.files and int(cached[_version_key]) == _version:
+                index = {team: cached[team] for team in cached.files if team not in (_mtime_key, _version_key)}
+    except (OSError, KeyError, ValueError):
+        pass
+
+    if index is None:
+        schedule_df = pd.read_csv(csv_path, parse_dates=['Date'], date_format='%d/%m/%Y %H:%M')
+        index = build_schedule_index(schedule_df)
+        try:
+            with open(cache_path, 'wb') as cache_file:
+                np.savez(cache_file, **{_mtime_key: np.int64(mtime), _version_key: np.int64(_version)}, **index)
+        except OSError:
+            pass
+
+    index = {team: days.tolist() for team, days in index.items()}
+    _indexes[csv_path] = (mtime, index)
+    return index
+
+
+def _day(as_of):
+    """Days since the epoch of as_of's date, in US Eastern time when as_of carries a timezone"""
+    as_of = pd.Timestamp(as_of)
+    if as_of.tzinfo is not None:
+        as_of = as_of.tz_convert(schedule_timezone)
+    return int(np.datetime64(as_of.date(), 'D').astype(np.int64))
+
+
+def last_game_day(index, team, day):
+    """Day of the team's last game strictly before day (both in days since the epoch), or None"""
+    days = index.get(team)
+    if not days:
+        return None
+    position = bisect_left(days, day)
+    return days[position - 1] if position > 0 else None
+
+
+def schedule_days_rest(index, home_teams, away_teams, as_of, no_game=7):
+    """
+    Calendar days between as_of and each team's last game before that day, or no_game if it has none.
+    Days are US Eastern dates, so a team that played last night has 1 day of rest, as in the training data.
+    Returns (home_rest, away_rest) lists aligned with the matchups.
+    """
+    today = _day(as_of)
+
+    def rest(team):
+        last_day = last_game_day(index, team, today)
+        return no_game if last_day is None else today - last_day
+
+    return [rest(team) for team in home_teams], [rest(team) for team in away_teams]
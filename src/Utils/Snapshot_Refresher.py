@@ -0,0 +1,120 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, wait
+
+
+class SnapshotRefresher:
+    """
+    Keeps the latest good result of each loader and reloads it on a background thread before it expires,
+    so readers get the last snapshot immediately instead of waiting on a reload (stale-while-revalidate).
+    Memory is bounded: only one snapshot per loader is kept, and snapshots past max_stale are dropped.
+    A failed reload keeps serving the previous snapshot until it is max_stale.
+    Loaders run concurrently, so a cold start takes as long as the slowest loader rather than all of them.
+
+    Args:
+        loaders: {key: callable returning the snapshot}
+        interval: seconds a snapshot is fresh for
+        refresh_ahead: seconds before expiry the background thread reloads it
+        max_stale: seconds after which a snapshot is no longer served, and readers wait for a reload
+        timeout: seconds a reader without a snapshot waits for it, and the background thread waits for a round
+            of reloads, before going on without the slow ones (which finish, and are stored, in the background)
+    """
+
+    def __init__(self, loaders, interval=600, refresh_ahead=60, max_stale=6 * 3600, timeout=None):
+        self.loaders = dict(loaders)
+        self.interval = interval
+        self.refresh_ahead = min(refresh_ahead, interval)
+        self.max_stale = max_stale
+        self.timeout = timeout
+        self._pool = ThreadPoolExecutor(max_workers=max(len(self.loaders), 1), thread_name_prefix="snapshot-loader")
+        self._snapshots = {}
+        self._key_locks = {key: threading.Lock() for key in self.loaders}
+        self._loading = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _snapshot(self, key):
+        with self._lock:
+            snapshot = self._snapshots.get(key)
+            if snapshot is not None and time.monotonic() - snapshot[1] > self.max_stale:
+                del self._snapshots[key]
+                snapshot = None
+            return snapshot
+
+    def refresh(self, key):
+        """Reloads one snapshot, unless another thread just did; returns whether a good snapshot is held"""
+        with self._key_locks[key]:
+            snapshot = self._snapshot(key)
+            if snapshot is not None and time.monotonic() - snapshot[1] < self.interval - self.refresh_ahead:
+                return True
+            try:
+                value = self.loaders[key]()
+            except Exception as e:
+                print(f"Failed to refresh {key}: {e}")
+                return snapshot is not None
+            with self._lock:
+                self._snapshots[key] = (value, time.monotonic())
+            return True
+
+    def _submit(self, key):
+        """The reload of key already running, or a new one: a hung loader never queues a second reload"""
+        with self._lock:
+            future = self._loading.get(key)
+            if future is None or future.done():
+                future = self._loading[key] = self._pool.submit(self.refresh, key)
+            return future
+
+    def refresh_all(self):
+        """
+        Reloads every snapshot concurrently, waiting up to timeout.
+        Returns the keys still loading when it gave up, which go on to replace their snapshots once done.
+        """
+        futures = {self._submit(key): key for key in self.loaders}
+        _, pending = wait(futures, timeout=self.timeout)
+        slow = sorted(futures[future] for future in pending)
+        if slow:
+            print(f"Still refreshing {', '.join(map(str, slow))} after {self.timeout}s, serving previous snapshots")
+        return slow
+
+    def get(self, key, default=None):
+        """
+        The latest snapshot of key, however old (up to max_stale). Only when there is none yet, the caller
+        waits for it to load, up to timeout, then gets default.
+        """
+        snapshot = self._snapshot(key)
+        if snapshot is None:
+            try:
+                self._submit(key).result(timeout=self.timeout)
+            except TimeoutError:
+                return default
+            snapshot = self._snapshot(key)
+        return default if snapshot is None else snapshot[0]
+
+    def age(self, key):
+        """Seconds since key's snapshot was loaded, None when there is none"""
+        snapshot = self._snapshot(key)
+        return None if snapshot is None else time.monotonic() - snapshot[1]
+
+    def _run(self):
+        while not self._stop.is_set():
+            self.refresh_all()
+            # Wake when the oldest snapshot is due again, or retry failures within a refresh_ahead window
+            ages = [self.age(key) for key in self.loaders]
+            due = [self.interval - self.refresh_ahead - age for age in ages if age is not None]
+            delay = min(due) if due and len(due) == len(ages) else self.refresh_ahead
+            self._stop.wait(max(delay, 1))
+
+    def start(self):
+        """Starts the background thread, which loads every snapshot right away; does nothing when it is running"""
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="snapshot-refresher", daemon=True)
+                self._thread.start()
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
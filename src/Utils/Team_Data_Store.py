@@ -0,0 +1,63 @@
+import re
+from datetime import datetime
+
+import pandas as pd
+
+# Consolidated NBA team stats: one row per (Date, TEAM_NAME) across every season,
+# replacing the one-table-per-date layout of TeamData.sqlite.
+team_stats_table = "team_stats"
+
+_date_table = re.compile(r'^\d{4}-\d{2}-\d{2}$')
+
+
+def nba_season_for_date(date_string):
+    """Season label (e.g. '2012-13') for a game date in YYYY-MM-DD format"""
+    date = datetime.strptime(date_string[:10], '%Y-%m-%d')
+    # The 2019-20 season finished in the bubble in October 2020
+    if date.month >= 10 and not (date.year == 2020 and date.month == 10 and date.day < 15):
+        start_year = date.year
+    else:
+        start_year = date.year - 1
+    return f"{start_year}-{str(start_year + 1)[2:]}"
+
+
+def migrate_per_date_tables(con, show_progress=True):
+    """
+    Copies every per-date table of a TeamData.sqlite connection into the team_stats table.
+    Each row keeps its position within its date's table as TEAM_INDEX, which is what the
+    team_index_* dictionaries refer to. Re-running replaces the consolidated table.
+    Returns the number of rows written.
+    """
+    tables = sorted(name for (name,) in con.execute("select name from sqlite_master where type = 'table'")
+                    if _date_table.match(name))
+    frames = []
+    for count, table in enumerate(tables):
+        team_df = pd.read_sql_query(f"select * from \"{table}\"", con, index_col="index")
+        team_df = team_df.reset_index(drop=True)
+        team_df['Date'] = table
+        team_df['Season'] = nba_season_for_date(table)
+        team_df['TEAM_INDEX'] = range(len(team_df.index))
+        frames.append(team_df)
+        if show_progress and count % 500 == 0:
+            print(f"Read {count}/{len(tables)} tables")
+    if not frames:
+        return 0
+
+    stats = pd.concat(frames, ignore_index=True)
+    stats.to_sql(team_stats_table, con, if_exists="replace", index=False)
+    con.execute(f"create index if not exists \"{team_stats_table}_season\" on \"{team_stats_table}\" (Season)")
+    con.execute(f"create unique index if not exists \"{team_stats_table}_date_team\" on \"{team_stats_table}\" (Date, TEAM_INDEX)")
+    con.commit()
+    return len(stats.index)
+
+
+def load_season(con, season, since=None):
+    """All team stats rows of a season (after the since date, if given) in one query, ordered by Date then TEAM_INDEX"""
+    if since is None:
+        stats = pd.read_sql_query(f"select * from \"{team_stats_table}\" where Season = ? order by Date, TEAM_INDEX",
+                                  con, params=[season])
+    else:
+        stats = pd.read_sql_query(f"select * from \"{team_stats_table}\" where Season = ? and Date > ? "
+                                  f"order by Date, TEAM_INDEX", con, params=[season, since])
+    # Columns introduced by the stats API in later seasons are NULL for earlier ones
+    return stats.dropna(axis=1, how='all')
@@ -0,0 +1,159 @@
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from src.Utils.Team_Data_Store import nba_season_for_date
+
+project_root = Path(__file__).resolve().parent.parent.parent
+# Prepared feature matrices, keyed by dataset fingerprint, so repeated training sessions skip sqlite
+default_cache_dir = project_root / "Data" / "training-cache"
+
+# Dataset table, label and dropped columns of each training market, as the XGBoost/NN training scripts read them.
+# UO markets move the OU line to the last feature column. Each row's season comes from a season column, or is
+# derived from a game date column.
+training_sets = {
+    ('NBA', 'ML'): {
+        'database': 'Data/dataset.sqlite', 'table': 'dataset_2012-24_new', 'index_col': 'index',
+        'label': 'Home-Team-Win', 'num_class': 2, 'season_date': 'Date',
+        'drop': ['Score', 'Home-Team-Win', 'TEAM_NAME', 'Date', 'TEAM_NAME.1', 'Date.1', 'OU-Cover', 'OU'],
+    },
+    ('NBA', 'UO'): {
+        'database': 'Data/dataset.sqlite', 'table': 'dataset_2012-24_new', 'index_col': 'index',
+        'label': 'OU-Cover', 'num_class': 3, 'ou_feature': True, 'season_date': 'Date',
+        'drop': ['Score', 'Home-Team-Win', 'TEAM_NAME', 'Date', 'TEAM_NAME.1', 'Date.1', 'OU-Cover', 'OU'],
+    },
+    ('NFL', 'ML'): {
+        'database': 'Data/NFLDataset.sqlite', 'table': 'nfl_dataset_2019-2025', 'index_col': None,
+        'label': 'Home-Team-Win', 'num_class': 2, 'season_column': 'Season',
+        'drop': ['Score', 'Home-Team-Win', 'TEAM_NAME', 'TEAM_NAME.1', 'Season', 'OU-Cover', 'OU', 'Date'],
+    },
+    ('NFL', 'UO'): {
+        'database': 'Data/NFLDataset.sqlite', 'table': 'nfl_dataset_2019-2025', 'index_col': None,
+        'label': 'OU-Cover', 'num_class': 3, 'ou_feature': True, 'season_column': 'Season',
+        'drop': ['Score', 'Home-Team-Win', 'TEAM_NAME', 'TEAM_NAME.1', 'Season', 'OU-Cover', 'OU', 'Date'],
+    },
+}
+
+
+def training_set(sport, market):
+    try:
+        return training_sets[(sport.upper(), market.upper())]
+    except KeyError:
+        raise ValueError(f"No training set for {sport} {market}, expected one of {sorted(training_sets)}")
+
+
+def connect_read_only(database):
+    """
+    Read-only connection to an existing sqlite file. Raises FileNotFoundError when it is missing, where
+    sqlite3.connect would create an empty database and fail later on a missing table.
+    """
+    database = Path(database)
+    if not database.is_file():
+        raise FileNotFoundError(f"No sqlite database at {database}")
+    return sqlite3.connect(f"{database.as_uri()}?mode=ro", uri=True)
+
+
+def load_training_frame(sport, market, table=None):
+    """The dataset table of a market as stored, or another table of the same layout in its database"""
+    spec = training_set(sport, market)
+    con = connect_read_only(project_root / spec['database'])
+    try:
+        return pd.read_sql_query(f"select * from \"{table or spec['table']}\"", con, index_col=spec['index_col'])
+    finally:
+        con.close()
+
+
+def to_training_matrix(frame, sport, market):
+    """
+    Features and labels of a dataset frame.
+
+    Returns:
+        (features float ndarray, labels int ndarray, feature column names, season label str ndarray)
+    """
+    spec = training_set(sport, market)
+    labels = frame[spec['label']].to_numpy().astype(int)
+    if 'season_column' in spec:
+        seasons = frame[spec['season_column']].astype(str).to_numpy(dtype=str)
+    elif 'season_date' in spec:
+        seasons = frame[spec['season_date']].astype(str).map(nba_season_for_date).to_numpy(dtype=str)
+    else:
+        seasons = np.full(len(frame.index), '')
+    features = frame.drop(columns=[col for col in spec['drop'] if col in frame.columns])
+    if spec.get('ou_feature'):
+        features['OU'] = frame['OU'].to_numpy()
+    return features.to_numpy().astype(float), labels, list(features.columns), seasons
+
+
+def _table_digest(con, table, batch_size=4096):
+    """blake2b of every row of a table in rowid order, so any edited, added, removed or moved value changes it"""
+    digest = hashlib.blake2b(digest_size=16)
+    cursor = con.execute(f"select * from \"{table}\" order by rowid")
+    while rows := cursor.fetchmany(batch_size):
+        # repr round-trips floats exactly and keeps text, numbers, blobs and NULLs apart
+        digest.update(repr(rows).encode())
+    return digest.hexdigest()
+
+
+def dataset_fingerprint(sport, market):
+    """
+    Short hash identifying the current contents of a market's dataset table without building a DataFrame:
+    the market spec, the table schema and a hash of every row.
+    Other tables of the same database, and the file's mtime, do not affect it.
+    """
+    spec = training_set(sport, market)
+    database = project_root / spec['database']
+    con = connect_read_only(database)
+    try:
+        schema = con.execute("select sql from sqlite_master where type = 'table' and name = ?", [spec['table']]).fetchone()
+        if schema is None:
+            raise ValueError(f"No table {spec['table']} in {database}")
+        content = _table_digest(con, spec['table'])
+    finally:
+        con.close()
+    key = json.dumps([sport.upper(), market.upper(), spec, schema[0], content])
+    return hashlib.sha256(key.encode()).hexdigest()[:16]
+
+
+def _save_atomic(path, array):
+    descriptor, temp_path = tempfile.mkstemp(dir=path.parent, suffix='.npy')
+    with os.fdopen(descriptor, 'wb') as temp_file:
+        np.save(temp_file, array)
+    os.replace(temp_path, path)
+
+
+def load_training_matrix(sport, market, cache_dir=default_cache_dir, mmap_mode=None):
+    """
+    Features (float32), labels, feature names and row seasons of a market, from the on-disk cache when the
+    dataset is unchanged. Pass cache_dir=None to always read the dataset; mmap_mode is passed to np.load for
+    cached features.
+    """
+    if cache_dir is None:
+        features, labels, columns, seasons = to_training_matrix(load_training_frame(sport, market), sport, market)
+        return features.astype(np.float32), labels, columns, seasons
+
+    cache_dir = Path(cache_dir)
+    stem = f"{sport.upper()}-{market.upper()}-{dataset_fingerprint(sport, market)}"
+    features_path = cache_dir / f"{stem}.features.npy"
+    labels_path = cache_dir / f"{stem}.labels.npy"
+    seasons_path = cache_dir / f"{stem}.seasons.npy"
+    columns_path = cache_dir / f"{stem}.columns.json"
+    try:
+        columns = json.loads(columns_path.read_text())
+        return np.load(features_path, mmap_mode=mmap_mode), np.load(labels_path), columns, np.load(seasons_path)
+    except (OSError, ValueError):
+        pass
+
+    features, labels, columns, seasons = to_training_matrix(load_training_frame(sport, market), sport, market)
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    _save_atomic(features_path, features.astype(np.float32))
+    _save_atomic(labels_path, labels)
+    _save_atomic(seasons_path, seasons)
+    # Written last: its presence marks a complete entry
+    columns_path.write_text(json.dumps(columns))
+    return np.load(features_path, mmap_mode=mmap_mode), labels, columns, seasons
@@ -0,0 +1,291 @@
+import os
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from itertools import product
+
+import numpy as np
+import toml
+import xgboost as xgb
+from sklearn.metrics import accuracy_score, log_loss
+from sklearn.model_selection import train_test_split
+
+from src.Utils.Model_Registry import manifest_path, register_model
+from src.Utils.Training_Data import dataset_fingerprint, default_cache_dir, load_training_matrix, project_root, \
+    training_set
+
+results_table = "xgboost_sweep"
+default_results_db = project_root / "Data" / "ModelSweeps.sqlite"
+default_models_dir = project_root / "Models" / "XGBoost_Models"
+
+# XGBoost stops scaling on these few-thousand-row datasets past a handful of threads,
+# so cores are spent on concurrent trials first.
+max_threads_per_trial = 4
+
+
+def sweep_space(sport, market, config=None):
+    """The [xgboost-sweep.<SPORT>-<MARKET>] search space of config.toml"""
+    config = toml.load(project_root / "config.toml") if config is None else config
+    key = f"{sport.upper()}-{market.upper()}"
+    try:
+        return dict(config['xgboost-sweep'][key])
+    except KeyError:
+        raise ValueError(f"No [xgboost-sweep.{key}] section in config.toml")
+
+
+def split_cores(jobs, cores=None, workers=None, nthread=None):
+    """(worker processes, XGBoost nthread per worker) sharing the cores without oversubscribing them"""
+    cores = cores or os.cpu_count() or 1
+    if nthread is None:
+        nthread = max(1, min(max_threads_per_trial, cores // workers if workers else cores))
+    if workers is None:
+        workers = max(1, min(jobs, cores // nthread))
+    return workers, nthread
+
+
+def sweep_trials(space):
+    """One trial per seed and (max_depth, eta, rounds) combination, grouped by seed so workers can reuse splits"""
+    seeds = range(space.get('seed', 0), space.get('seed', 0) + space.get('trials', 1))
+    return [{'trial': trial, 'seed': seed, 'max_depth': max_depth, 'eta': eta, 'rounds': rounds}
+            for trial, (seed, max_depth, eta, rounds) in enumerate(
+                product(seeds, space['max_depth'], space['eta'], space['rounds']))]
+
+
+_worker = {}
+# Splits (and their quantized training matrices) kept per worker, so trials sharing a seed reuse them
+_cached_splits = 4
+
+
+def _init_worker(sport, market, space, nthread, cache_dir=default_cache_dir):
+    """
+    Loads the prepared training matrix once per worker and sketches its feature quantiles once,
+    as the reference every trial's QuantileDMatrix reuses instead of sketching its own split.
+    """
+    features, labels, _, seasons = load_training_matrix(sport, market, cache_dir=cache_dir)
+    if space.get('split') == 'season':
+        # Rows grouped by season once, so each part of a season split is a slice (a view) rather than a copy
+        order = np.argsort(seasons, kind='stable')
+        if np.any(order != np.arange(len(order))):
+            features, labels, seasons = features[order], labels[order], seasons[order]
+    reference = xgb.QuantileDMatrix(features, label=labels, max_bin=space.get('max_bin', 256), nthread=nthread)
+    _worker.update(sport=sport, market=market, space=space, nthread=nthread, features=features, labels=labels,
+                   seasons=seasons, reference=reference, splits={})
+
+
+def split_indices(rows, test_size, seed):
+    """Row indices of a shuffled train/test split, the same split train_test_split(..., random_state=seed) makes"""
+    return train_test_split(np.arange(rows), test_size=test_size, random_state=seed)
+
+
+def season_split_indices(seasons, validation_seasons=1):
+    """
+    Row indices of a chronological split: the last validation_seasons seasons validate, every earlier one trains.
+    Returns (train_index, validation_index, validation season labels).
+    """
+    ordered = sorted(set(seasons.tolist()))
+    if len(ordered) <= validation_seasons:
+        raise ValueError(f"Need more than {validation_seasons} seasons for a chronological split, got {ordered}")
+    validation = ordered[-validation_seasons:]
+    in_validation = np.isin(seasons, validation)
+    return np.flatnonzero(~in_validation), np.flatnonzero(in_validation), validation
+
+
+def _as_slice(index):
+    """A run of consecutive row indices as the equivalent slice, any other index array unchanged"""
+    if len(index) and index[-1] - index[0] == len(index) - 1:
+        return slice(int(index[0]), int(index[-1]) + 1)
+    return index
+
+
+def _split(seed):
+    """
+    Quantized train/test matrices of a trial: by season when the space sets split = "season", else shuffled by seed.
+    A season split also keeps its last holdout_seasons out of training, early stopping and selection, to score
+    the chosen model on (and fit its calibrator on) games no decision was made with.
+    """
+    space = _worker['space']
+    by_season = space.get('split') == 'season'
+    key = 'season' if by_season else seed
+    splits = _worker['splits']
+    if key not in splits:
+        if len(splits) >= _cached_splits:
+            splits.pop(next(iter(splits)))
+        features, labels = _worker['features'], _worker['labels']
+        holdout_index, holdout = None, []
+        if by_season:
+            seasons = _worker['seasons']
+            selection_index = np.arange(len(seasons))
+            if space.get('holdout_seasons', 0):
+                selection_index, holdout_index, holdout = season_split_indices(seasons, space['holdout_seasons'])
+            train_index, test_index, validation = season_split_indices(seasons[selection_index],
+                                                                       space.get('validation_seasons', 1))
+            train_index, test_index = selection_index[train_index], selection_index[test_index]
+            # Contiguous, since _init_worker grouped the rows by season
+            train_index, test_index = _as_slice(train_index), _as_slice(test_index)
+            holdout_index = None if holdout_index is None else _as_slice(holdout_index)
+            description = f"seasons {', '.join(validation)}"
+        else:
+            train_index, test_index = split_indices(len(labels), space.get('test_size', 0.1), seed)
+            description = f"random {space.get('test_size', 0.1)} seed {seed}"
+        train = xgb.QuantileDMatrix(features[train_index], label=labels[train_index], ref=_worker['reference'],
+                                    nthread=_worker['nthread'])
+        # Same cuts as the reference, but XGBoost wants evaluation sets to name the training matrix
+        test = xgb.QuantileDMatrix(features[test_index], label=labels[test_index], ref=train, nthread=_worker['nthread'])
+        splits[key] = {'train': train, 'test': test, 'test_index': test_index, 'validation': description,
+                       'holdout': None if holdout_index is None else features[holdout_index],
+                       'holdout_index': holdout_index, 'holdout_seasons': holdout}
+    return splits[key]
+
+
+def run_trial(trial):
+    """Trains and scores one trial in a worker initialized by _init_worker; returns (result row, model JSON)"""
+    space = _worker['space']
+    num_class = training_set(_worker['sport'], _worker['market'])['num_class']
+    started = time.perf_counter()
+
+    split = _split(trial['seed'])
+    train, test = split['train'], split['test']
+    y_test = _worker['labels'][split['test_index']]
+    param = {
+        'max_depth': trial['max_depth'],
+        'eta': trial['eta'],
+        'objective': 'multi:softprob',
+        'num_class': num_class,
+        'nthread': _worker['nthread'],
+        'seed': trial['seed'],
+        'max_bin': space.get('max_bin', 256),
+        **space.get('params', {}),
+    }
+    early_stopping_rounds = space.get('early_stopping_rounds')
+    if early_stopping_rounds:
+        model = xgb.train(param, train, trial['rounds'], evals=[(train, 'train'), (test, 'eval')],
+                          early_stopping_rounds=early_stopping_rounds, verbose_eval=False)
+        best_iteration, best_score = model.best_iteration, model.best_score
+        # Keep only the trees up to the best iteration: smaller files and faster inference
+        model = model[:best_iteration + 1]
+    else:
+        model = xgb.train(param, train, trial['rounds'])
+        best_iteration, best_score = trial['rounds'] - 1, None
+    model.set_attr(best_iteration=str(best_iteration), best_score=None if best_score is None else str(best_score),
+                   validation=split['validation'], sport=_worker['sport'], market=_worker['market'])
+    predictions = model.predict(test)
+
+    result = dict(trial)
+    result.update({
+        'best_iteration': best_iteration,
+        'validation': split['validation'],
+        'accuracy': round(accuracy_score(y_test, np.argmax(predictions, axis=1)) * 100, 1),
+        'logloss': float(log_loss(y_test, predictions, labels=list(range(num_class)))),
+        'holdout_seasons': split['holdout_seasons'],
+        'holdout_accuracy': None,
+        'holdout_logloss': None,
+    })
+    if split['holdout'] is not None:
+        y_holdout = _worker['labels'][split['holdout_index']]
+        holdout_predictions = model.inplace_predict(split['holdout'])
+        result['holdout_accuracy'] = round(accuracy_score(y_holdout, np.argmax(holdout_predictions, axis=1)) * 100, 1)
+        result['holdout_logloss'] = float(log_loss(y_holdout, holdout_predictions, labels=list(range(num_class))))
+    result['seconds'] = time.perf_counter() - started
+    return result, bytes(model.save_raw(raw_format='json'))
+
+
+results_columns = ['sweep_id', 'sport', 'market', 'trial', 'seed', 'max_depth', 'eta', 'rounds', 'best_iteration',
+                   'accuracy', 'logloss', 'seconds', 'nthread', 'model_path', 'created_at', 'holdout_accuracy',
+                   'holdout_logloss']
+
+
+def _create_results_table(con):
+    con.execute(f"create table if not exists \"{results_table}\" (sweep_id text, sport text, market text, "
+                f"trial integer, seed integer, max_depth integer, eta real, rounds integer, best_iteration integer, "
+                f"accuracy real, logloss real, seconds real, nthread integer, model_path text, created_at text, "
+                f"holdout_accuracy real, holdout_logloss real)")
+    # Stores created before the holdout columns existed
+    existing = {column for _, column, *_ in con.execute(f"pragma table_info(\"{results_table}\")")}
+    for column in ('holdout_accuracy', 'holdout_logloss'):
+        if column not in existing:
+            con.execute(f"alter table \"{results_table}\" add column {column} real")
+    con.commit()
+
+
+def registry_metrics(result):
+    """
+    Metrics of the chosen trial for the registry. The validation season picked the trial (and stopped its
+    training early), so its scores are optimistic: accuracy and logloss are the holdout seasons' when the
+    split has any, and otherwise the validation scores, flagged as in-sample for selection.
+    """
+    metrics = {'selection_accuracy': result['accuracy'], 'selection_logloss': result['logloss']}
+    if result['holdout_accuracy'] is not None:
+        metrics.update(accuracy=result['holdout_accuracy'], logloss=result['holdout_logloss'],
+                       evaluated_on='holdout')
+    else:
+        metrics.update(accuracy=result['accuracy'], logloss=result['logloss'], evaluated_on='selection (in-sample)')
+    return metrics
+
+
+def run_sweep(sport, market, space=None, workers=None, nthread=None, results_db=default_results_db,
+              models_dir=default_models_dir, save_best=True, manifest=manifest_path, cache_dir=default_cache_dir):
+    """
+    Runs every trial of the search space on a process pool, writing each result row as it completes.
+    Whenever a trial matches or beats the best accuracy so far, its model is saved as
+    XGBoost_{accuracy}%_{model_tag}.json in models_dir (its validation accuracy). The final best model is
+    registered as the active model of its sport and market in the manifest, see registry_metrics.
+
+    Returns:
+        list of result dicts in completion order
+    """
+    sport, market = sport.upper(), market.upper()
+    space = sweep_space(sport, market) if space is None else space
+    trials = sweep_trials(space)
+    workers, nthread = split_cores(len(trials), workers=workers, nthread=nthread)
+    sweep_id = f"{sport}-{market}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    print(f"{sweep_id}: {len(trials)} trials on {workers} workers x {nthread} threads")
+    # Prepares the cached matrix before the workers start, so they only read it
+    _, _, columns, _ = load_training_matrix(sport, market, cache_dir=cache_dir, mmap_mode='r')
+
+    con = sqlite3.connect(results_db)
+    _create_results_table(con)
+    results = []
+    best = None
+
+    def record(result, model_json):
+        nonlocal best
+        model_path = None
+        if save_best and (best is None or result['accuracy'] >= best[0]['accuracy']):
+            model_path = os.path.join(models_dir, f"XGBoost_{result['accuracy']}%_{space['model_tag']}.json")
+            with open(model_path, 'wb') as model_file:
+                model_file.write(model_json)
+            best = result, model_path
+        con.execute(f"insert into \"{results_table}\" ({', '.join(results_columns)}) "
+                    f"values ({', '.join('?' * len(results_columns))})",
+                    [sweep_id, sport, market, result['trial'], result['seed'], result['max_depth'], result['eta'],
+                     result['rounds'], result['best_iteration'], result['accuracy'], result['logloss'],
+                     result['seconds'], nthread, model_path, datetime.now().isoformat(timespec='seconds'),
+                     result['holdout_accuracy'], result['holdout_logloss']])
+        con.commit()
+        results.append(result)
+        print(f"Trial {result['trial']}: {result['accuracy']}% logloss {result['logloss']:.4f} "
+              f"({result['seconds']:.1f}s)")
+
+    try:
+        if workers == 1:
+            _init_worker(sport, market, space, nthread, cache_dir)
+            for trial in trials:
+                record(*run_trial(trial))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(sport, market, space, nthread, cache_dir)) as executor:
+                for future in as_completed([executor.submit(run_trial, trial) for trial in trials]):
+                    record(*future.result())
+    finally:
+        con.close()
+
+    if best is not None:
+        result, model_path = best
+        register_model('xgboost', sport, market, model_path, features=columns,
+                       dataset=dataset_fingerprint(sport, market), metrics=registry_metrics(result),
+                       attributes={'best_iteration': result['best_iteration'], 'validation': result['validation'],
+                                   'holdout': result['holdout_seasons'], 'sweep_id': sweep_id,
+                                   'trial': result['trial']},
+                       manifest=manifest)
+    return results
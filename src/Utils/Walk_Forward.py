@@ -0,0 +1,135 @@
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+from sklearn.metrics import accuracy_score, log_loss
+
+from src.Utils.Training_Data import default_cache_dir, load_training_matrix, project_root, training_set
+from src.Utils.Training_Sweep import split_cores, sweep_space
+
+folds_table = "walk_forward_folds"
+predictions_table = "walk_forward_predictions"
+default_results_db = project_root / "Data" / "WalkForward.sqlite"
+
+
+def walk_forward_folds(seasons, min_train_seasons=1):
+    """(training seasons, test season) of every fold: each season after the first min_train_seasons is
+    predicted by a model trained on all seasons before it"""
+    ordered = sorted(set(np.asarray(seasons).tolist()))
+    return [(ordered[:position], ordered[position]) for position in range(min_train_seasons, len(ordered))]
+
+
+def fold_params(space):
+    """XGBoost parameters and rounds of a fold: the first value of each swept setting in the search space"""
+    param = {
+        'max_depth': space['max_depth'][0],
+        'eta': space['eta'][0],
+        'objective': 'multi:softprob',
+        'seed': space.get('seed', 0),
+        'max_bin': space.get('max_bin', 256),
+        **space.get('params', {}),
+    }
+    return param, space['rounds'][0]
+
+
+_worker = {}
+
+
+def _init_worker(sport, market, space, nthread, cache_dir):
+    """Maps the prepared training matrix read-only: every worker shares the same pages instead of its own copy"""
+    features, labels, _, seasons = load_training_matrix(sport, market, cache_dir=cache_dir, mmap_mode='r')
+    _worker.update(sport=sport, market=market, space=space, nthread=nthread, features=features, labels=labels,
+                   seasons=seasons)
+
+
+def run_fold(fold):
+    """Trains on a fold's training seasons and predicts its test season; returns (metrics row, predictions)"""
+    number, train_seasons, test_season = fold
+    started = time.perf_counter()
+    num_class = training_set(_worker['sport'], _worker['market'])['num_class']
+    features, labels, seasons = _worker['features'], _worker['labels'], _worker['seasons']
+    train_index = np.flatnonzero(np.isin(seasons, train_seasons))
+    test_index = np.flatnonzero(seasons == test_season)
+
+    param, rounds = fold_params(_worker['space'])
+    param.update(num_class=num_class, nthread=_worker['nthread'])
+    train = xgb.QuantileDMatrix(features[train_index], label=labels[train_index], max_bin=param['max_bin'],
+                                nthread=_worker['nthread'])
+    model = xgb.train(param, train, rounds)
+    probabilities = model.inplace_predict(np.ascontiguousarray(features[test_index]))
+
+    y_test = labels[test_index]
+    metrics = {
+        'fold': number,
+        'train_seasons': ','.join(train_seasons),
+        'test_season': test_season,
+        'train_rows': len(train_index),
+        'test_rows': len(test_index),
+        'accuracy': round(accuracy_score(y_test, np.argmax(probabilities, axis=1)) * 100, 1),
+        'logloss': float(log_loss(y_test, probabilities, labels=list(range(num_class)))),
+        'seconds': time.perf_counter() - started,
+    }
+    predictions = pd.DataFrame(probabilities, columns=[f'prob_{label}' for label in range(num_class)])
+    predictions.insert(0, 'label', y_test)
+    predictions.insert(0, 'season', test_season)
+    predictions.insert(0, 'row', test_index)
+    predictions.insert(0, 'fold', number)
+    return metrics, predictions
+
+
+def run_walk_forward(sport, market, space=None, min_train_seasons=1, workers=None, nthread=None,
+                     results_db=default_results_db, cache_dir=default_cache_dir):
+    """
+    Runs every walk-forward fold of a market on a process pool. The parent writes each fold's metrics and
+    test-season predictions (by row of the training matrix) to the results store as the fold completes.
+
+    Args:
+        space: XGBoost settings as in config.toml's [xgboost-sweep.<SPORT>-<MARKET>], of which fold_params uses
+            the first value of each list
+    Returns:
+        DataFrame of fold metrics, ordered by fold
+    """
+    sport, market = sport.upper(), market.upper()
+    space = sweep_space(sport, market) if space is None else space
+    # Builds the cached matrix once, before any worker maps it
+    _, _, _, seasons = load_training_matrix(sport, market, cache_dir=cache_dir, mmap_mode='r')
+    folds = [(number, train_seasons, test_season) for number, (train_seasons, test_season)
+             in enumerate(walk_forward_folds(seasons, min_train_seasons))]
+    if not folds:
+        raise ValueError(f"{sport} {market} has seasons {sorted(set(seasons.tolist()))}, "
+                         f"need more than {min_train_seasons} for a walk-forward fold")
+    workers, nthread = split_cores(len(folds), workers=workers, nthread=nthread)
+    run_id = f"{sport}-{market}-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    print(f"{run_id}: {len(folds)} folds on {workers} workers x {nthread} threads")
+
+    con = sqlite3.connect(results_db)
+    rows = []
+
+    def record(metrics, predictions):
+        metrics = {'run_id': run_id, 'sport': sport, 'market': market, **metrics,
+                   'created_at': datetime.now().isoformat(timespec='seconds')}
+        with con:
+            pd.DataFrame([metrics]).to_sql(folds_table, con, if_exists='append', index=False)
+            predictions.insert(0, 'run_id', run_id)
+            predictions.to_sql(predictions_table, con, if_exists='append', index=False)
+        rows.append(metrics)
+        print(f"Fold {metrics['fold']}: {metrics['test_season']} {metrics['accuracy']}% "
+              f"logloss {metrics['logloss']:.4f} ({metrics['seconds']:.1f}s)")
+
+    try:
+        if workers == 1:
+            _init_worker(sport, market, space, nthread, cache_dir)
+            for fold in folds:
+                record(*run_fold(fold))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(sport, market, space, nthread, cache_dir)) as executor:
+                for future in as_completed([executor.submit(run_fold, fold) for fold in folds]):
+                    record(*future.result())
+    finally:
+        con.close()
+    return pd.DataFrame(rows).sort_values('fold').reset_index(drop=True)
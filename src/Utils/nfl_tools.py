@@ -1,12 +1,11 @@
-import requests
 from datetime import datetime
 
+from src.Utils.Http_Cache import get_json
+
 def get_nfl_json_data(url):
     """Get NFL team stats data from API"""
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.json()
+        return get_json(url)
     except Exception as e:
         print(f"Error fetching NFL data: {e}")
         return []
@@ -51,9 +50,10 @@ def load_nfl_team_stats_from_sqlite():
     import sqlite3
     import pandas as pd
     import numpy as np
+    from src.Utils.Training_Data import project_root
     
     try:
-        con = sqlite3.connect('Data/NFLDataset.sqlite')
+        con = sqlite3.connect(project_root / 'Data' / 'NFLDataset.sqlite')
         
         table_names = ['nfl_dataset_2019-2025', 'nfl_dataset_2019-24', 'nfl_dataset_2019-2024']
         data = pd.DataFrame()
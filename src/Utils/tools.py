@@ -4,7 +4,165 @@ from datetime import datetime
 import pandas as pd
 import requests
 
-from src.Utils.Dictionaries import nfl_team_index_current
+from src.Utils import nfl_tools
+from src.Utils.Dictionaries import team_index_current, nfl_team_index_current
+from src.Utils.Http_Cache import get_json
+from src.Utils.Schedule_Index import load_schedule_index, schedule_days_rest, schedule_timezone
+from src.Utils.Training_Data import project_root
+
+
+def get_current_nba_season():
+    """Get current NBA season in format YYYY for API URLs and YYYY-YY for stats API"""
+    now = datetime.now()
+    if now.month >= 10:
+        current_year = now.year
+        next_year = now.year + 1
+    else:
+        current_year = now.year - 1
+        next_year = now.year
+    return str(current_year), f"{current_year}-{str(next_year)[2:]}"
+
+season_year, season_range = get_current_nba_season()
+
+todays_games_url = f'https://data.nba.com/data/10s/v2015/json/mobile_teams/nba/{season_year}/scores/00_todays_scores.json'
+data_url = f'https://stats.nba.com/stats/leaguedashteamstats?' \
+           f'Conference=&DateFrom=&DateTo=&Division=&GameScope=&' \
+           f'GameSegment=&LastNGames=0&LeagueID=00&Location=&' \
+           f'MeasureType=Base&Month=0&OpponentTeamID=0&Outcome=&' \
+           f'PORound=0&PaceAdjust=N&PerMode=PerGame&Period=0&' \
+           f'PlayerExperience=&PlayerPosition=&PlusMinus=N&Rank=N&' \
+           f'Season={season_range}&SeasonSegment=&SeasonType=Regular+Season&ShotClockRange=&' \
+           f'StarterBench=&TeamID=0&TwoWay=0&VsConference=&VsDivision='
+
+# nfl_data_url = 'https://api.sportsdata.io/v3/nfl/stats/json/TeamSeasonStats/2024'  # Deprecated
+
+
+def slate_games(games):
+    """The NBA games createTodaysGames builds rows for: both teams are in the current stats table"""
+    return [(game[0], game[1]) for game in games if game[0] in team_index_current and game[1] in team_index_current]
+
+
+def nfl_slate_games(games, df):
+    """The NFL games createTodaysNFLGames builds rows for: both teams are known and have team stats"""
+    teams = set(df['TEAM_NAME']) if 'TEAM_NAME' in df.columns else set()
+    return [(game[0], game[1]) for game in games
+            if game[0] in nfl_team_index_current and game[1] in nfl_team_index_current
+            and game[0] in teams and game[1] in teams]
+
+
+def createTodaysGames(games, df, odds):
+    match_data = []
+    todays_games_uo = []
+    home_team_odds = []
+    away_team_odds = []
+
+    games = slate_games(games)
+    for home_team, away_team in games:
+        if odds is not None:
+            game_odds = odds[home_team + ':' + away_team]
+            todays_games_uo.append(game_odds['under_over_odds'])
+
+            home_team_odds.append(game_odds[home_team]['money_line_odds'])
+            away_team_odds.append(game_odds[away_team]['money_line_odds'])
+
+        else:
+            todays_games_uo.append(input(home_team + ' vs ' + away_team + ': '))
+
+            home_team_odds.append(input(home_team + ' odds: '))
+            away_team_odds.append(input(away_team + ' odds: '))
+
+    # calculate days rest for both teams
+    home_teams = [game[0] for game in games]
+    away_teams = [game[1] for game in games]
+    try:
+        schedule_index = load_schedule_index(str(project_root / 'Data' / f'nba-{season_year}-UTC.csv'))
+        home_team_days_rest, away_team_days_rest = schedule_days_rest(schedule_index, home_teams, away_teams,
+                                                                        pd.Timestamp.now(tz=schedule_timezone))
+    except FileNotFoundError:
+        print(f"Warning: Schedule file Data/nba-{season_year}-UTC.csv not found. Using default rest days.")
+        home_team_days_rest = [2] * len(games)
+        away_team_days_rest = [2] * len(games)
+
+    for (home_team, away_team), home_days_off, away_days_off in zip(games, home_team_days_rest, away_team_days_rest):
+        home_team_series = df.iloc[team_index_current.get(home_team)]
+        away_team_series = df.iloc[team_index_current.get(away_team)]
+        stats = pd.concat([home_team_series, away_team_series])
+        stats['Days-Rest-Home'] = int(home_days_off)
+        stats['Days-Rest-Away'] = int(away_days_off)
+        match_data.append(stats)
+
+    games_data_frame = pd.concat(match_data, ignore_index=True, axis=1)
+    games_data_frame = games_data_frame.T
+
+    frame_ml = games_data_frame.drop(columns=['TEAM_ID', 'TEAM_NAME'])
+    data = frame_ml.values
+    data = data.astype(float)
+
+    return data, todays_games_uo, frame_ml, home_team_odds, away_team_odds
+
+def createTodaysNFLGames(games, df, odds):
+    if df.empty:
+        print("Error: No NFL team data available. Cannot create predictions.")
+        return None, [], None, [], []
+    
+    match_data = []
+    todays_games_uo = []
+    home_team_odds = []
+    away_team_odds = []
+
+    for game in games:
+        home_team = game[0]
+        away_team = game[1]
+        if home_team not in nfl_team_index_current or away_team not in nfl_team_index_current:
+            continue
+
+        home_team_data = df[df['TEAM_NAME'] == home_team]
+        away_team_data = df[df['TEAM_NAME'] == away_team]
+
+        if home_team_data.empty or away_team_data.empty:
+            print(f"Warning: Missing data for {home_team} vs {away_team}")
+            print(f"Available teams in database: {sorted(df['TEAM_NAME'].unique().tolist())}")
+            continue
+
+        # Lines are only collected for games that get a row, so they stay aligned with data
+        if odds is not None:
+            game_odds = odds[home_team + ':' + away_team]
+            todays_games_uo.append(game_odds['under_over_odds'])
+
+            home_team_odds.append(game_odds[home_team]['money_line_odds'])
+            away_team_odds.append(game_odds[away_team]['money_line_odds'])
+
+        else:
+            todays_games_uo.append(input(home_team + ' vs ' + away_team + ': '))
+
+            home_team_odds.append(input(home_team + ' odds: '))
+            away_team_odds.append(input(away_team + ' odds: '))
+
+        home_team_series = home_team_data.iloc[0]
+        away_team_series = away_team_data.iloc[0]
+        stats = pd.concat([home_team_series, away_team_series])
+        
+        current_week = nfl_tools.get_nfl_current_week()
+        stats['Current-Week'] = current_week
+        match_data.append(stats)
+
+    if not match_data:
+        print("Error: No valid games could be created with available team data.")
+        print("Please check that all required teams are present in the database.")
+        return None, [], None, [], []
+    
+    games_data_frame = pd.concat(match_data, ignore_index=True, axis=1)
+    games_data_frame = games_data_frame.T
+
+    columns_to_drop = ['TEAM_ID', 'TEAM_NAME', 'Season', 'Week', 'Date']
+    existing_columns = [col for col in columns_to_drop if col in games_data_frame.columns]
+    frame_ml = games_data_frame.drop(columns=existing_columns)
+    
+    data = frame_ml.values
+    data = data.astype(float)
+
+    return data, todays_games_uo, frame_ml, home_team_odds, away_team_odds
+
 
 nfl_api_headers = {
     'Accept': 'application/json',
@@ -36,9 +194,7 @@ def get_nfl_json_data_thesportsdb(season, week=None):
     url = f"{base_url}/eventsseason.php?id=4391&s={season}"
     
     try:
-        response = requests.get(url)
-        response.raise_for_status()
-        data = response.json()
+        data = get_json(url)
         
         events = data.get('events', [])
         if not events:
@@ -63,18 +219,14 @@ def get_nfl_json_data(url, api_key=None):
         headers['Ocp-Apim-Subscription-Key'] = api_key
     
     try:
-        response = requests.get(url, headers=headers)
-        response.raise_for_status()
-        return response.json()
+        return get_json(url, headers=headers)
     except Exception as e:
         print(f"Error fetching NFL data: {e}")
         return {}
 
 def get_json_data(url):
     try:
-        raw_data = requests.get(url, headers=nfl_api_headers, timeout=10)
-        raw_data.raise_for_status()
-        json = raw_data.json()
+        json = get_json(url, headers=nfl_api_headers, timeout=10)
     except requests.exceptions.Timeout:
         print(f"Timeout error: NBA API took too long to respond")
         return {}
@@ -89,9 +241,7 @@ def get_json_data(url):
 
 def get_todays_games_json(url):
     try:
-        raw_data = requests.get(url, headers=games_header, timeout=10)
-        raw_data.raise_for_status()
-        json = raw_data.json()
+        json = get_json(url, headers=games_header, timeout=10)
         return json.get('gs', {}).get('g', [])
     except requests.exceptions.Timeout:
         print(f"Timeout error: NBA games API took too long to respond")